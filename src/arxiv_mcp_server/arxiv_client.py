@@ -0,0 +1,386 @@
+"""Asynchronous access layer for the arXiv API.
+
+The ``arxiv`` package is synchronous: ``Client.results()`` performs blocking
+HTTP requests (and sleeps between pages) and ``Result.download_pdf()`` blocks
+for the whole transfer. Every tool and ``PaperManager`` goes through this
+module instead, which runs that work on a dedicated thread pool so the event
+loop keeps serving other requests while network I/O is pending, and shares a
+single rate-limited client so concurrent calls stay within arXiv's limits.
+"""
+
+import asyncio
+import functools
+import logging
+import re
+import threading
+import time
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import arxiv
+
+from .config import get_settings
+from .singleflight import SingleFlight
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Create the arXiv I/O thread pool on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=get_settings().ARXIV_IO_WORKERS,
+            thread_name_prefix="arxiv-io",
+        )
+    return _executor
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking arXiv call on the I/O pool without blocking the loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_executor(), functools.partial(func, *args, **kwargs)
+    )
+
+
+class RateLimiter:
+    """Token bucket that hands out arXiv request slots in arrival order.
+
+    Waiters queue on an ``asyncio.Lock`` (which wakes waiters FIFO), so
+    concurrent tool calls are served fairly while the sustained rate never
+    exceeds one request per ``interval`` seconds, with bursts of up to
+    ``burst`` requests after an idle period.
+    """
+
+    def __init__(self, interval: float, burst: int = 1):
+        self.interval = interval
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waiting = 0
+        self.requests = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if self.interval <= 0:
+            self._tokens = float(self.capacity)
+        else:
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed / self.interval)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """Wait for a request slot and return how long the caller waited."""
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            async with self._lock:
+                self._refill()
+                if self._tokens < 1:
+                    await asyncio.sleep((1 - self._tokens) * self.interval)
+                    self._refill()
+                self._tokens -= 1
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - started
+        self.requests += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        if waited > 0.01:
+            logger.debug(
+                f"arXiv request waited {waited:.2f}s for a slot "
+                f"({self.waiting} still queued)"
+            )
+        return waited
+
+    def stats(self) -> Dict[str, Any]:
+        """Report queue depth and wait times."""
+        return {
+            "queue_depth": self.waiting,
+            "requests": self.requests,
+            "avg_wait_seconds": (
+                self.total_wait / self.requests if self.requests else 0.0
+            ),
+            "max_wait_seconds": self.max_wait,
+        }
+
+
+def _transient(error: Exception) -> bool:
+    """Whether a failed arXiv request is worth retrying."""
+    if isinstance(error, arxiv.HTTPError):
+        # 429/503为限流，其余5xx为服务端临时错误；4xx重试也不会成功
+        return error.status == 429 or error.status >= 500
+    if isinstance(error, urllib.error.HTTPError):
+        # PDF下载使用urllib，其HTTPError是OSError的子类，需按状态码判断
+        return error.code == 429 or error.code >= 500
+    return isinstance(error, (arxiv.UnexpectedEmptyPageError, OSError))
+
+
+def base_id(paper_id: str) -> str:
+    """Strip the version suffix from an arXiv ID (2103.12345v2 -> 2103.12345)."""
+    return re.sub(r"v\d+$", "", paper_id)
+
+
+class MetadataBatcher:
+    """Resolve metadata lookups from concurrent calls with shared ``id_list`` queries.
+
+    IDs requested within ``window`` seconds of each other are collected and
+    fetched together, ``batch_size`` IDs per API request, so N lookups cost
+    ceil(N / batch_size) round trips (and politeness delays) instead of N.
+    A batch is dispatched early once it reaches ``batch_size`` IDs.
+    """
+
+    def __init__(self, service: "ArxivService", window: float, batch_size: int):
+        self.service = service
+        self.window = window
+        self.batch_size = max(1, batch_size)
+        self.batches = 0
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def get(self, paper_id: str) -> Optional[arxiv.Result]:
+        """Queue a lookup and wait for the batch that resolves it."""
+        future = self._pending.get(paper_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[paper_id] = loop.create_future()
+            if len(self._pending) >= self.batch_size:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._dispatch)
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        """Send everything collected so far as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.ensure_future(self._resolve(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, batch: Dict[str, asyncio.Future]) -> None:
+        paper_ids = list(batch)
+        for start in range(0, len(paper_ids), self.batch_size):
+            await self._resolve_chunk(batch, paper_ids[start : start + self.batch_size])
+
+    async def _resolve_chunk(
+        self, batch: Dict[str, asyncio.Future], chunk: List[str]
+    ) -> None:
+        """Look up one ``id_list`` chunk and settle its callers' futures.
+
+        A malformed or unknown ID can make arXiv reject the whole request;
+        the chunk is then split in half and retried, so only the caller of
+        the offending ID sees the error. Transient failures (already retried
+        by the service) are reported to every caller in the chunk.
+        """
+        try:
+            results = await self.service.search(arxiv.Search(id_list=chunk))
+            self.batches += 1
+        except Exception as e:
+            if len(chunk) > 1 and not _transient(e):
+                logger.debug(f"Metadata batch of {len(chunk)} IDs failed, splitting")
+                middle = len(chunk) // 2
+                await self._resolve_chunk(batch, chunk[:middle])
+                await self._resolve_chunk(batch, chunk[middle:])
+                return
+            for paper_id in chunk:
+                if not batch[paper_id].done():
+                    batch[paper_id].set_exception(e)
+            return
+
+        by_id: Dict[str, arxiv.Result] = {}
+        for result in results:
+            short_id = result.get_short_id()
+            if isinstance(short_id, str):
+                by_id[short_id] = result
+                by_id.setdefault(base_id(short_id), result)
+        if not by_id and len(results) == len(chunk):
+            # arXiv返回顺序与id_list一致，无法按ID匹配时按位置对应
+            by_id = dict(zip(chunk, results))
+
+        logger.debug(f"Resolved metadata batch of {len(chunk)} IDs")
+        for paper_id in chunk:
+            if not batch[paper_id].done():
+                batch[paper_id].set_result(by_id.get(paper_id))
+
+
+class ArxivService:
+    """Process-wide arXiv client shared by all tools and ``PaperManager``.
+
+    One long-lived ``arxiv.Client`` keeps its HTTP session (and connection
+    pool) across calls, and every upstream request, API page or PDF download,
+    first takes a slot from the shared ``RateLimiter``. The client's own
+    per-instance delay and retries are disabled because the limiter now
+    enforces arXiv's politeness interval globally: retries happen here, and
+    each attempt waits for its own slot.
+    """
+
+    def __init__(self):
+        settings = get_settings()
+        self.page_size = settings.ARXIV_PAGE_SIZE
+        self.retries = max(0, settings.ARXIV_RETRIES)
+        self.limiter = RateLimiter(
+            settings.ARXIV_REQUEST_INTERVAL, settings.ARXIV_RATE_BURST
+        )
+        self._client: Optional[arxiv.Client] = None
+        self.batcher = MetadataBatcher(self, settings.BATCH_WINDOW, settings.BATCH_SIZE)
+        # 合并并发的相同元数据查询与PDF下载
+        self._metadata_flight = SingleFlight("metadata")
+        self._download_flight = SingleFlight("download")
+        # arxiv.Client不是线程安全的，分页请求需要串行执行
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self) -> arxiv.Client:
+        """Create the shared arXiv client on first use."""
+        if self._client is None:
+            self._client = arxiv.Client(
+                page_size=self.page_size, delay_seconds=0, num_retries=0
+            )
+        return self._client
+
+    async def _request(
+        self, func: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Any:
+        """Run one upstream request on the I/O pool, retrying transient failures."""
+        for attempt in range(self.retries + 1):
+            await self.limiter.acquire()
+            try:
+                return await run_blocking(func, *args, **kwargs)
+            except Exception as e:
+                if attempt == self.retries or not _transient(e):
+                    raise
+                logger.warning(
+                    f"arXiv request failed ({e}); retry {attempt + 1} of {self.retries}"
+                )
+
+    def _collect(self, query: arxiv.Search, offset: int = 0) -> List[arxiv.Result]:
+        """Drain a search's result generator (runs on the I/O pool)."""
+        with self._client_lock:
+            try:
+                return list(self.client.results(query, offset=offset))
+            except StopIteration:
+                # 生成器在首页之前就结束时按无结果处理
+                return []
+
+    async def search(self, query: arxiv.Search) -> List[arxiv.Result]:
+        """Execute an arXiv search and return all of its results."""
+        return await self._request(self._collect, query)
+
+    async def search_page(
+        self, query: arxiv.Search, offset: int = 0
+    ) -> List[arxiv.Result]:
+        """Fetch the single API page of results starting at ``offset``."""
+        page = arxiv.Search(
+            query=query.query,
+            id_list=query.id_list,
+            max_results=offset + self.page_size,
+            sort_by=query.sort_by,
+            sort_order=query.sort_order,
+        )
+        return await self._request(self._collect, page, offset)
+
+    async def fetch_papers(self, paper_ids: List[str]) -> List[arxiv.Result]:
+        """Fetch metadata for the given arXiv IDs through the batcher."""
+        results = await asyncio.gather(*(self.fetch_paper(pid) for pid in paper_ids))
+        return [result for result in results if result is not None]
+
+    async def fetch_paper(self, paper_id: str) -> Optional[arxiv.Result]:
+        """Fetch one paper's metadata, sharing concurrent lookups of the same ID."""
+        return await self._metadata_flight.do(
+            paper_id, functools.partial(self.batcher.get, paper_id)
+        )
+
+    async def download_pdf(self, paper: arxiv.Result, pdf_path: Path) -> Path:
+        """Download a paper's PDF to ``pdf_path``, once per concurrent target."""
+
+        async def download() -> Path:
+            await self._request(
+                paper.download_pdf,
+                dirpath=str(pdf_path.parent),
+                filename=pdf_path.name,
+            )
+            return pdf_path
+
+        return await self._download_flight.do(str(pdf_path), download)
+
+    def stats(self) -> Dict[str, Any]:
+        """Report rate limiter queue depth, wait times and coalesced calls."""
+        return {
+            **self.limiter.stats(),
+            "metadata": self._metadata_flight.stats(),
+            "download": self._download_flight.stats(),
+        }
+
+
+_service: Optional[ArxivService] = None
+
+
+def get_arxiv_service() -> ArxivService:
+    """Get the process-wide arXiv service."""
+    global _service
+    if _service is None:
+        _service = ArxivService()
+    return _service
+
+
+def reset_arxiv_service() -> None:
+    """Drop the shared arXiv service, used by tests."""
+    global _service
+    _service = None
+
+
+async def search(query: arxiv.Search) -> List[arxiv.Result]:
+    """Execute an arXiv search through the shared service."""
+    return await get_arxiv_service().search(query)
+
+
+async def search_page(query: arxiv.Search, offset: int = 0) -> List[arxiv.Result]:
+    """Fetch one API page of search results through the shared service."""
+    return await get_arxiv_service().search_page(query, offset)
+
+
+async def fetch_papers(paper_ids: List[str]) -> List[arxiv.Result]:
+    """Fetch metadata for the given arXiv IDs."""
+    if not paper_ids:
+        return []
+    return await get_arxiv_service().fetch_papers(paper_ids)
+
+
+async def fetch_paper(paper_id: str) -> Optional[arxiv.Result]:
+    """Fetch metadata for a single paper, or ``None`` if arXiv has no such ID."""
+    return await get_arxiv_service().fetch_paper(paper_id)
+
+
+async def download_pdf(paper: arxiv.Result, pdf_path: Path) -> Path:
+    """Download a paper's PDF through the shared service."""
+    return await get_arxiv_service().download_pdf(paper, pdf_path)
+
+
+__all__ = [
+    "base_id",
+    "RateLimiter",
+    "MetadataBatcher",
+    "ArxivService",
+    "get_arxiv_service",
+    "reset_arxiv_service",
+    "run_blocking",
+    "search",
+    "search_page",
+    "fetch_papers",
+    "fetch_paper",
+    "download_pdf",
+]
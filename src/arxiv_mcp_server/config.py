@@ -53,7 +53,55 @@ class Settings(BaseSettings):
     APP_VERSION: str = "0.3.1"
     MAX_RESULTS: int = 50
     BATCH_SIZE: int = 20
+    # 合并并发元数据查询的时间窗口（秒），每批最多BATCH_SIZE个ID
+    BATCH_WINDOW: float = 0.05
     REQUEST_TIMEOUT: int = 60
+    # 同时处理的JSON-RPC请求上限
+    MAX_CONCURRENT_REQUESTS: int = 8
+    # arXiv网络I/O线程池大小
+    ARXIV_IO_WORKERS: int = 4
+    # 下载/转换工作池大小与排队上限（下载队列满时拒绝新请求）
+    DOWNLOAD_WORKERS: int = 2
+    CONVERT_WORKERS: int = 2
+    DOWNLOAD_QUEUE_SIZE: int = 100
+    CONVERT_QUEUE_SIZE: int = 10
+    # PDF转换进程数（0表示在线程中转换）及每个进程处理多少篇后重启以释放内存
+    CONVERT_PROCESSES: int = 2
+    CONVERT_MAX_TASKS_PER_CHILD: int = 20
+    # 页数不少于此值的PDF按页拆分并行转换（0表示不拆分）
+    CONVERT_SPLIT_PAGES: int = 100
+    # read_paper分块读取时的默认块大小（字节）
+    READ_CHUNK_SIZE: int = 65536
+    # 内存中论文内容缓存上限（字节），0表示不缓存
+    CONTENT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # 段落检索：转换后按字节切分的重叠段落大小与重叠长度
+    PASSAGE_CHUNK_SIZE: int = 1500
+    PASSAGE_CHUNK_OVERLAP: int = 300
+    # 相似论文：文档向量维度、TF-IDF词表上限、拟合模型时最多使用的论文数
+    VECTOR_DIMENSIONS: int = 128
+    VECTOR_MAX_FEATURES: int = 30000
+    VECTOR_FIT_SAMPLE: int = 2000
+    # 近重复检测：MinHash哈希函数个数、LSH分段数、判定为重复的相似度阈值
+    MINHASH_PERMUTATIONS: int = 128
+    MINHASH_BANDS: int = 16
+    DEDUP_THRESHOLD: float = 0.8
+    # arXiv API礼貌间隔（秒/请求）与突发上限，所有工具共享
+    ARXIV_REQUEST_INTERVAL: float = 3.0
+    ARXIV_RATE_BURST: int = 1
+    ARXIV_PAGE_SIZE: int = 100
+    # 限流(429/503)、服务端错误或网络错误时的重试次数，每次重试同样受礼貌间隔限制
+    ARXIV_RETRIES: int = 3
+    # 客户端日期过滤时，单次搜索最多抓取的分页数
+    SEARCH_MAX_PAGES: int = 5
+    # 搜索结果缓存：新鲜期、过期后仍可返回并后台刷新的时长、容量上限
+    SEARCH_CACHE_ENABLED: bool = True
+    SEARCH_CACHE_TTL: int = 3600
+    SEARCH_CACHE_STALE_TTL: int = 86400
+    SEARCH_CACHE_MAX_ENTRIES: int = 1000
+    SEARCH_CACHE_MAX_BYTES: int = 50 * 1024 * 1024
+    # 离线模式下只用本地元数据目录回答搜索；远程搜索超时（秒）后回退到本地
+    SEARCH_OFFLINE: bool = False
+    SEARCH_REMOTE_TIMEOUT: float = 30.0
     model_config = SettingsConfigDict(extra="allow")
 
     @property
@@ -72,4 +120,11 @@ class Settings(BaseSettings):
         path.mkdir(parents=True, exist_ok=True)
         return path
 
+    @property
+    def INDEX_PATH(self) -> Path:
+        """Get the directory for caches and indexes kept next to the papers."""
+        path = self.STORAGE_PATH / ".index"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
 __all__ = ["Settings", "get_settings", "reset_settings"]
\ No newline at end of file
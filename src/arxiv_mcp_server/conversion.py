@@ -0,0 +1,201 @@
+"""PDF to markdown conversion in a pool of worker processes."""
+
+import asyncio
+import itertools
+import logging
+import os
+import shutil
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
+
+import pymupdf
+import pymupdf4llm
+from pymupdf4llm.helpers.pymupdf_rag import IdentifyHeaders
+
+from .config import get_settings
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+
+def _iter_pages(doc: pymupdf.Document, pages: Sequence[int]) -> Iterator[str]:
+    """Yield the markdown of each requested page in turn."""
+    headers = IdentifyHeaders(doc)
+    for page in pages:
+        yield pymupdf4llm.to_markdown(
+            doc, pages=[page], hdr_info=headers, show_progress=False
+        )
+
+
+def convert_pages(
+    pdf_path: str, out_path: str, pages: Optional[Sequence[int]] = None
+) -> List[int]:
+    """Convert pages of a PDF one at a time, writing markdown to ``out_path``.
+
+    Runs inside a worker process. Each page is written as soon as it is
+    converted, so memory use does not grow with the document. Heading levels
+    are derived from the font sizes of the whole document, so the output of
+    consecutive page ranges concatenates to that of the full document.
+    Returns the size in bytes of each page's markdown.
+    """
+    sizes = []
+    with pymupdf.open(pdf_path) as doc, open(out_path, "wb") as out:
+        if pages is None:
+            pages = range(doc.page_count)
+        for markdown in _iter_pages(doc, pages):
+            data = markdown.encode("utf-8")
+            out.write(data)
+            sizes.append(len(data))
+    return sizes
+
+
+def pages_to_markdown(pdf_path: str, pages: Sequence[int]) -> List[str]:
+    """Convert selected pages of a PDF, returning each page's markdown."""
+    with pymupdf.open(pdf_path) as doc:
+        return list(_iter_pages(doc, pages))
+
+
+def page_count(pdf_path: str) -> int:
+    """Count the pages of a PDF file."""
+    with pymupdf.open(pdf_path) as doc:
+        return doc.page_count
+
+
+def plain_text(pdf_path: str) -> str:
+    """Extract the plain text of a PDF, much faster than markdown conversion."""
+    with pymupdf.open(pdf_path) as doc:
+        return "\n".join(page.get_text() for page in doc)
+
+
+def split_pages(count: int, parts: int) -> List[List[int]]:
+    """Split ``count`` pages into at most ``parts`` contiguous, even ranges."""
+    parts = max(1, min(parts, count))
+    size, extra = divmod(count, parts)
+    ranges, start = [], 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+def _concatenate(parts: List[Path], out_path: Path) -> None:
+    """Append part files to ``out_path`` in order, streaming their contents."""
+    with open(out_path, "wb") as out:
+        for part in parts:
+            with open(part, "rb") as f:
+                shutil.copyfileobj(f, out)
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> Optional[Executor]:
+    """Get the shared conversion process pool, or ``None`` to use threads.
+
+    Workers are replaced after ``CONVERT_MAX_TASKS_PER_CHILD`` conversions so
+    memory leaked by the PDF layout analysis is returned to the system.
+    """
+    global _process_pool
+    settings = get_settings()
+    if settings.CONVERT_PROCESSES <= 0:
+        return None
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=settings.CONVERT_PROCESSES,
+            max_tasks_per_child=settings.CONVERT_MAX_TASKS_PER_CHILD or None,
+        )
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """Stop the conversion workers."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+async def count_pages(pdf_path: Path) -> int:
+    """Count the pages of a PDF without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, page_count, str(pdf_path))
+
+
+async def extract_text(pdf_path: Path) -> str:
+    """Extract the plain text of a PDF without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, plain_text, str(pdf_path))
+
+
+async def convert_page_range(pdf_path: Path, pages: Sequence[int]) -> List[str]:
+    """Convert some pages of a PDF in the conversion pool.
+
+    ``pages`` are 0-based page numbers; the markdown of each is returned in
+    the same order.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            get_process_pool(), pages_to_markdown, str(pdf_path), list(pages)
+        )
+    except BrokenProcessPool:
+        logger.error(f"Conversion worker crashed while converting {pdf_path.name}")
+        shutdown_process_pool()
+        raise
+
+
+async def convert_to_file(pdf_path: Path, md_path: Path) -> List[int]:
+    """Convert a PDF to a markdown file without blocking the event loop.
+
+    Pages are streamed to a temporary file that replaces ``md_path`` only
+    once the conversion succeeds, so readers never see a partial document.
+    Documents of at least ``CONVERT_SPLIT_PAGES`` pages are split into page
+    ranges converted in parallel across the process pool and stitched back
+    together in order. Returns the byte offset at which each page starts,
+    followed by the total size of the file.
+    """
+    settings = get_settings()
+    pool = get_process_pool()
+    loop = asyncio.get_running_loop()
+    tmp_path = md_path.with_name(md_path.name + ".tmp")
+
+    ranges: List[Optional[List[int]]] = [None]
+    if pool is not None and settings.CONVERT_PROCESSES > 1:
+        threshold = settings.CONVERT_SPLIT_PAGES
+        count = await count_pages(pdf_path)
+        if 0 < threshold <= count:
+            ranges = split_pages(count, settings.CONVERT_PROCESSES)
+            logger.info(
+                f"Converting {pdf_path.name} ({count} pages) in {len(ranges)} parts"
+            )
+    if len(ranges) == 1:
+        part_paths = [tmp_path]
+    else:
+        part_paths = [
+            md_path.with_name(f"{md_path.name}.part{i}") for i in range(len(ranges))
+        ]
+
+    try:
+        sizes = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    pool, convert_pages, str(pdf_path), str(part), pages
+                )
+                for part, pages in zip(part_paths, ranges)
+            )
+        )
+        if len(part_paths) > 1:
+            await loop.run_in_executor(None, _concatenate, part_paths, tmp_path)
+        os.replace(tmp_path, md_path)
+    except BrokenProcessPool:
+        # 工作进程崩溃（如损坏的PDF导致段错误）后重建进程池
+        logger.error(f"Conversion worker crashed while converting {pdf_path.name}")
+        shutdown_process_pool()
+        raise
+    finally:
+        for path in {tmp_path, *part_paths}:
+            path.unlink(missing_ok=True)
+
+    return [0, *itertools.accumulate(itertools.chain.from_iterable(sizes))]
@@ -0,0 +1,119 @@
+"""Bounded priority work queues served by fixed pools of async workers."""
+
+import asyncio
+import itertools
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted to a queue that is at capacity."""
+
+
+class WorkQueue:
+    """Priority queue of jobs processed by ``workers`` concurrent workers.
+
+    Jobs with a lower priority value run first; equal priorities run in
+    submission order. ``submit`` rejects jobs with ``QueueFullError`` once
+    ``maxsize`` jobs are waiting, while ``put`` waits for room, which lets one
+    stage of a pipeline apply backpressure to the stage feeding it. Workers
+    are started on first use and keep running for the life of the process.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[None]],
+        workers: int,
+        maxsize: int = 0,
+    ):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.maxsize = maxsize
+        self.active = 0
+        self._seq = itertools.count()
+        self._waiting: Dict[Hashable, Tuple[int, int]] = {}
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def _ensure_started(self) -> asyncio.PriorityQueue:
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue(self.maxsize)
+            self._tasks = [
+                asyncio.create_task(self._worker(), name=f"{self.name}-worker-{i}")
+                for i in range(self.workers)
+            ]
+        return self._queue
+
+    def full(self) -> bool:
+        """Whether the queue is at capacity."""
+        return 0 < self.maxsize <= len(self._waiting)
+
+    def submit(self, key: Hashable, item: Any, priority: int = 1) -> int:
+        """Queue a job without waiting and return its 1-based queue position."""
+        queue = self._ensure_started()
+        entry = (priority, next(self._seq))
+        try:
+            queue.put_nowait((*entry, key, item))
+        except asyncio.QueueFull:
+            raise QueueFullError(
+                f"{self.name} queue is full ({self.maxsize} jobs waiting)"
+            )
+        self._waiting[key] = entry
+        return self.position(key)
+
+    async def put(self, key: Hashable, item: Any, priority: int = 1) -> None:
+        """Queue a job, waiting for room if the queue is at capacity."""
+        queue = self._ensure_started()
+        entry = (priority, next(self._seq))
+        self._waiting[key] = entry
+        try:
+            await queue.put((*entry, key, item))
+        except BaseException:
+            self._waiting.pop(key, None)
+            raise
+
+    def position(self, key: Hashable) -> Optional[int]:
+        """1-based position of a waiting job, or ``None`` if it is not waiting."""
+        entry = self._waiting.get(key)
+        if entry is None:
+            return None
+        return 1 + sum(1 for other in self._waiting.values() if other < entry)
+
+    async def _worker(self) -> None:
+        queue = self._queue
+        while True:
+            _, _, key, item = await queue.get()
+            self._waiting.pop(key, None)
+            self.active += 1
+            try:
+                await self.handler(item)
+            except Exception:
+                logger.exception(f"{self.name} job {key!r} failed")
+            finally:
+                self.active -= 1
+                queue.task_done()
+
+    def close(self) -> None:
+        """Cancel the workers and drop any jobs still waiting."""
+        for task in self._tasks:
+            if not task.get_loop().is_closed():
+                task.cancel()
+        self._tasks = []
+        self._queue = None
+        self._waiting.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Report queue depth and worker utilisation."""
+        return {
+            "waiting": len(self._waiting),
+            "active": self.active,
+            "workers": self.workers,
+            "capacity": self.maxsize,
+        }
+
+
+__all__ = ["QueueFullError", "WorkQueue"]
@@ -0,0 +1,95 @@
+"""Compile arXiv search syntax into SQLite FTS5 expressions for local search."""
+
+import re
+from typing import List
+
+# arXiv字段前缀到本地索引列的映射，all表示不限字段
+FIELDS = {"ti": "ti", "au": "au", "abs": "abs", "cat": "cat", "all": None}
+OPERATORS = {"AND": "AND", "OR": "OR", "ANDNOT": "NOT"}
+
+_TOKEN = re.compile(
+    r"""
+    \s*(?:
+        (?P<lparen>\() |
+        (?P<rparen>\)) |
+        (?P<group_field>[A-Za-z]+):(?=\() |
+        (?P<field>[A-Za-z]+):(?:"(?P<field_phrase>[^"]*)"|(?P<field_term>[^\s()"]+)) |
+        "(?P<phrase>[^"]*)" |
+        (?P<word>[^\s()"]+)
+    )
+    """,
+    re.VERBOSE,
+)
+
+
+class QuerySyntaxError(ValueError):
+    """Raised for queries the local search cannot evaluate."""
+
+
+def _column(field: str) -> str:
+    if field not in FIELDS:
+        raise QuerySyntaxError(
+            f"Unsupported field '{field}:' for local search; "
+            f"use one of {', '.join(f + ':' for f in FIELDS)}"
+        )
+    column = FIELDS[field]
+    return f"{column} : " if column else ""
+
+
+def quote_term(text: str) -> str:
+    """Quote a term or phrase; a trailing ``*`` makes it a prefix query."""
+    prefix = text.endswith("*")
+    text = text.rstrip("*")
+    if not text.strip():
+        raise QuerySyntaxError("Empty search term")
+    quoted = '"' + text.replace('"', '""') + '"'
+    return quoted + " *" if prefix else quoted
+
+
+def compile_query(query: str) -> str:
+    """Translate an arXiv query into an FTS5 ``MATCH`` expression.
+
+    Supports the ``ti:``, ``au:``, ``abs:``, ``cat:`` and ``all:`` field
+    prefixes, quoted phrases, parentheses, ``AND``, ``OR`` and ``ANDNOT``
+    (adjacent terms are combined with ``AND``, as on arXiv). Every term is
+    quoted, so the result cannot contain stray FTS5 syntax.
+    """
+    parts: List[str] = []
+    pos = 0
+    query = query.strip()
+    while pos < len(query):
+        match = _TOKEN.match(query, pos)
+        if match is None or match.end() == pos:
+            raise QuerySyntaxError(f"Cannot parse query near '{query[pos:]}'")
+        pos = match.end()
+        if match["lparen"]:
+            parts.append("(")
+        elif match["rparen"]:
+            parts.append(")")
+        elif match["group_field"]:
+            parts.append(_column(match["group_field"]).rstrip())
+        elif match["field"]:
+            field = match["field"]
+            text = match["field_phrase"]
+            if text is None:
+                text = match["field_term"]
+            if field == "au" and "_" in text:
+                # arXiv作者查询用下划线连接姓和名缩写，如 au:Hinton_G
+                surname, _, initials = text.partition("_")
+                names = [quote_term(surname)] + [
+                    quote_term(initial + "*")
+                    for initial in initials.split("_")
+                    if initial
+                ]
+                parts.append(_column(field) + "(" + " AND ".join(names) + ")")
+            else:
+                parts.append(_column(field) + quote_term(text))
+        elif match["phrase"] is not None:
+            parts.append(quote_term(match["phrase"]))
+        elif match["word"] in OPERATORS:
+            parts.append(OPERATORS[match["word"]])
+        else:
+            parts.append(quote_term(match["word"]))
+    if not parts:
+        raise QuerySyntaxError("Empty query")
+    return " ".join(parts)
@@ -1,14 +1,24 @@
 """Resource management and storage for arXiv papers."""
 
+import asyncio
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 import arxiv
-import pymupdf4llm
-import aiofiles
 import logging
 from pydantic import AnyUrl
 import mcp.types as types
+from .. import arxiv_client, conversion
 from ..config import get_settings
+from ..storage import (
+    extract_citations,
+    get_catalog,
+    get_content_cache,
+    index_paper,
+    metadata_from_result,
+    read_range,
+    resolve_metadata,
+    save_metadata,
+)
 
 logger = logging.getLogger("arxiv-mcp-server")
 
@@ -21,11 +31,10 @@ class PaperManager:
         settings = get_settings()
         self.storage_path = Path(settings.STORAGE_PATH)
         self.storage_path.mkdir(parents=True, exist_ok=True)
-        self.client = arxiv.Client()
 
     def _get_paper_path(self, paper_id: str) -> Path:
         """Get the absolute file path for a paper."""
-        return self.storage_path / f"{paper_id}.md"
+        return get_catalog().find(paper_id) or self.storage_path / f"{paper_id}.md"
 
     async def store_paper(self, paper_id: str, pdf_url: str) -> bool:
         """Download and store a paper from arXiv."""
@@ -36,16 +45,24 @@ class PaperManager:
             return True
 
         try:
-            paper = next(self.client.results(arxiv.Search(id_list=[paper_id])))
-            paper.download_pdf(dirpath=self.storage_path, filename=paper_pdf_path)
-            markdown = pymupdf4llm.to_markdown(paper_pdf_path, show_progress=False)
-
-            async with aiofiles.open(paper_md_path, "w", encoding="utf-8") as f:
-                await f.write(markdown)
+            paper = await arxiv_client.fetch_paper(paper_id)
+            if paper is None:
+                raise LookupError(paper_id)
+
+            save_metadata(paper_md_path, metadata_from_result(paper, paper_id))
+            await arxiv_client.download_pdf(paper, paper_pdf_path)
+            offsets = await conversion.convert_to_file(paper_pdf_path, paper_md_path)
+            await asyncio.to_thread(
+                index_paper, paper_id, paper_md_path, paper.title, offsets
+            )
+            try:
+                await asyncio.to_thread(extract_citations, paper_id, paper_md_path)
+            except Exception as e:
+                logger.warning(f"Reference extraction failed for {paper_id}: {e}")
 
             return True
 
-        except StopIteration:
+        except LookupError:
             raise ValueError(f"Paper with ID {paper_id} not found on arXiv.")
         except arxiv.ArxivError as e:
             raise ValueError(
@@ -58,32 +75,29 @@ class PaperManager:
 
     async def has_paper(self, paper_id: str) -> bool:
         """Check if a paper is available in storage."""
-        return self._get_paper_path(paper_id).exists()
+        return get_catalog().has(paper_id)
 
     async def list_papers(self) -> list[str]:
         """List all stored paper IDs."""
         logger.info(f"Listing papers in {self.storage_path}")
-        paper_ids = [p.stem for p in self.storage_path.glob("*.md")]
+        paper_ids = [paper_id for paper_id, _ in get_catalog().entries()]
         logger.info(f"Found {len(paper_ids)} papers")
         return paper_ids
 
-    async def list_resources(self) -> List[types.Resource]:
-        """List all papers as MCP resources with metadata."""
-        paper_ids = await self.list_papers()
+    async def list_resources(self, refresh: bool = False) -> List[types.Resource]:
+        """List all papers as MCP resources with locally stored metadata."""
+        papers = get_catalog().entries()
         resources = []
 
-        for paper_id in paper_ids:
-            search = arxiv.Search(id_list=[paper_id])
-            papers = list(self.client.results(search))
+        metadata = await resolve_metadata(papers, refresh=refresh)
 
-            if papers:
-                paper = papers[0]
-                paper_path = self._get_paper_path(paper_id)
+        for (_, paper_path), entry in zip(papers, metadata):
+            if entry is not None:
                 resources.append(
                     types.Resource(
                         uri=AnyUrl(f"file://{str(paper_path)}"),
-                        name=paper.title,
-                        description=paper.summary,
+                        name=entry["title"],
+                        description=entry["summary"],
                         mimeType="text/markdown",
                     )
                 )
@@ -91,11 +105,22 @@ class PaperManager:
         logger.info(f"Found {len(resources)} resources")
         return resources
 
-    async def get_paper_content(self, paper_id: str) -> str:
-        """Get the markdown content of a stored paper."""
-        paper_path = self._get_paper_path(paper_id)
-        if not paper_path.exists():
+    async def get_paper_content(
+        self,
+        paper_id: str,
+        offset: Optional[int] = None,
+        length: Optional[int] = None,
+    ) -> str:
+        """Get the markdown content of a stored paper, or a byte range of it."""
+        paper_path = get_catalog().find(paper_id)
+        if paper_path is None:
             raise ValueError(f"Paper {paper_id} not found in storage")
 
-        async with aiofiles.open(paper_path, "r", encoding="utf-8") as f:
-            return await f.read()
\ No newline at end of file
+        if offset is None and length is None:
+            return await asyncio.to_thread(get_content_cache().get, paper_path)
+        # 范围读取通过内存映射只访问所需的页面
+        length = length or get_settings().READ_CHUNK_SIZE
+        content, _, _, _ = await asyncio.to_thread(
+            read_range, paper_path, offset or 0, length
+        )
+        return content
\ No newline at end of file
@@ -4,16 +4,34 @@
 This module implements an MCP stdio server for interacting with arXiv.
 """
 
+import asyncio
 import logging
 import sys
 import mcp.types as types
 from typing import Dict, Any, List
 from mcp.server.stdio import stdio_server
-from mcp import ServerSession
-from mcp.types import JSONRPCRequest, JSONRPCNotification, JSONRPCResponse, JSONRPCError, JSONRPCMessage
+from mcp.shared.message import SessionMessage
+from mcp.types import (
+    INTERNAL_ERROR,
+    ErrorData,
+    JSONRPCError,
+    JSONRPCMessage,
+    JSONRPCNotification,
+    JSONRPCRequest,
+    JSONRPCResponse,
+    RequestId,
+)
 from .config import Settings
+from .conversion import shutdown_process_pool
+from .storage import get_catalog
 from .tools import handle_search, handle_download, handle_list_papers, handle_read_paper, handle_list_tools
 from .tools import search_tool, download_tool, list_tool, read_tool, list_tools_tool
+from .tools import search_library_tool, handle_search_library
+from .tools import search_passages_tool, handle_search_passages
+from .tools import similar_papers_tool, handle_similar_papers
+from .tools import get_references_tool, handle_get_references
+from .tools import get_citing_papers_tool, handle_get_citing_papers
+from .tools import find_duplicates_tool, handle_find_duplicates
 from .prompts.handlers import list_prompts as handler_list_prompts
 from .prompts.handlers import get_prompt as handler_get_prompt
 
@@ -43,7 +61,19 @@ async def get_prompt(
 
 async def list_tools() -> List[types.Tool]:
     """List available arXiv research tools."""
-    return [search_tool, download_tool, list_tool, read_tool, list_tools_tool]
+    return [
+        search_tool,
+        download_tool,
+        list_tool,
+        read_tool,
+        search_library_tool,
+        search_passages_tool,
+        similar_papers_tool,
+        get_references_tool,
+        get_citing_papers_tool,
+        find_duplicates_tool,
+        list_tools_tool,
+    ]
 
 async def call_tool(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Handle tool calls for arXiv research functionality."""
@@ -57,6 +87,18 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[types.TextCont
             return await handle_list_papers(arguments)
         elif name == "read_paper":
             return await handle_read_paper(arguments)
+        elif name == "search_library":
+            return await handle_search_library(arguments)
+        elif name == "search_passages":
+            return await handle_search_passages(arguments)
+        elif name == "similar_papers":
+            return await handle_similar_papers(arguments)
+        elif name == "get_references":
+            return await handle_get_references(arguments)
+        elif name == "get_citing_papers":
+            return await handle_get_citing_papers(arguments)
+        elif name == "find_duplicates":
+            return await handle_find_duplicates(arguments)
         elif name == "list_tools":
             return await handle_list_tools(arguments)
         elif name == "list_prompts":
@@ -101,152 +143,145 @@ Note:
 """
     print(help_text)
 
+def _error(request_id: RequestId, code: int, message: str) -> JSONRPCError:
+    """Build a JSON-RPC error object."""
+    return JSONRPCError(
+        jsonrpc="2.0",
+        id=request_id,
+        error=ErrorData(code=code, message=message),
+    )
+
+
+async def _send(write_stream, message: JSONRPCResponse | JSONRPCError) -> None:
+    """Write a response to the transport, wrapped the way the stdio transport expects."""
+    await write_stream.send(SessionMessage(JSONRPCMessage(message)))
+
+
+async def handle_request(
+    request: JSONRPCRequest, write_stream, limiter: asyncio.Semaphore
+) -> None:
+    """Run one request under the concurrency limit and write its response."""
+    msg_dict = request.model_dump()
+    try:
+        async with limiter:
+            response = await call_tool(
+                msg_dict["method"], msg_dict.get("params", {}) or {}
+            )
+
+        # 记录响应
+        logger.debug(f"Sending response for {request.id}: {response}")
+        await _send(
+            write_stream,
+            JSONRPCResponse(
+                jsonrpc="2.0", id=request.id, result={"content": response}
+            ),
+        )
+    except asyncio.CancelledError:
+        # 被取消的请求不再发送响应（MCP规范）
+        logger.info(f"Request {request.id} cancelled")
+        raise
+    except Exception as e:
+        error_msg = f"Error processing message: {str(e)}"
+        logger.exception(error_msg)
+        try:
+            await _send(write_stream, _error(request.id, INTERNAL_ERROR, error_msg))
+        except Exception as send_error:
+            logger.error(f"Error sending error response: {str(send_error)}")
+
+
+async def serve(read_stream, write_stream) -> None:
+    """Read JSON-RPC messages and dispatch each request as its own task.
+
+    Responses are written as requests complete, matched by JSON-RPC id, so a
+    slow tool call no longer blocks the calls queued behind it. At most
+    ``MAX_CONCURRENT_REQUESTS`` tool calls run at once, and
+    ``notifications/cancelled`` aborts the matching in-flight request.
+    """
+    limiter = asyncio.Semaphore(settings.MAX_CONCURRENT_REQUESTS)
+    in_flight: Dict[RequestId, asyncio.Task] = {}
+
+    async for message in read_stream:
+        if isinstance(message, Exception):
+            # 无法解析的消息没有请求ID，JSON-RPC类型不允许无ID的错误响应，只记录日志
+            logger.error(f"Invalid message format: {str(message)}")
+            continue
+
+        # stdio传输层将消息包装在SessionMessage中
+        if isinstance(message, SessionMessage):
+            message = message.message
+
+        # 检查消息类型，应该检查JSONRPCMessage
+        if not isinstance(message, JSONRPCMessage):
+            logger.error(f"Invalid message type received: {type(message)}")
+            continue
+
+        # JSONRPCMessage是一个RootModel，我们需要获取其root值
+        actual_message = message.root
+
+        if isinstance(actual_message, JSONRPCNotification):
+            if actual_message.method == "notifications/cancelled":
+                params = actual_message.params or {}
+                task = in_flight.get(params.get("requestId"))
+                if task is not None:
+                    logger.info(
+                        f"Cancelling request {params.get('requestId')}: "
+                        f"{params.get('reason')}"
+                    )
+                    task.cancel()
+            else:
+                logger.debug(f"Ignoring notification: {actual_message.method}")
+            continue
+
+        # 检查实际消息是否为请求类型
+        if not isinstance(actual_message, JSONRPCRequest):
+            logger.error(
+                "Invalid message type, expected JSONRPCRequest but got: "
+                f"{type(actual_message)}"
+            )
+            continue
+
+        logger.debug(f"Received message: {actual_message.model_dump()}")
+        request_id = actual_message.id
+        task = asyncio.create_task(
+            handle_request(actual_message, write_stream, limiter)
+        )
+        in_flight[request_id] = task
+
+        def forget(task: asyncio.Task, request_id: RequestId = request_id) -> None:
+            # ID可能已被新的请求复用，只移除自己的登记
+            if in_flight.get(request_id) is task:
+                del in_flight[request_id]
+
+        task.add_done_callback(forget)
+
+    # 输入结束后等待仍在处理的请求写回响应
+    if in_flight:
+        await asyncio.gather(*in_flight.values(), return_exceptions=True)
+
+
 async def main():
     """Run the stdio server with proper shutdown handling."""
     # Check for help argument
     if "--help" in sys.argv or "-h" in sys.argv:
         print_help()
         return
-    
+
     try:
+        # 首次使用目录会核对整个存储目录，启动时在线程中预先完成
+        await asyncio.to_thread(get_catalog)
         async with stdio_server() as (read_stream, write_stream):
             try:
-                async for message in read_stream:
-                    try:
-                        if isinstance(message, Exception):
-                            error_msg = f"Invalid message format: {str(message)}"
-                            logger.error(error_msg)
-                            # 发送错误响应给客户端
-                            await write_stream.send(
-                                JSONRPCError(
-                                    jsonrpc="2.0",
-                                    id=None,
-                                    error={
-                                        "code": -32700,
-                                        "message": error_msg
-                                    }
-                                )
-                            )
-                            continue
-                        
-                        # 检查消息类型，应该检查JSONRPCMessage
-                        if not isinstance(message, JSONRPCMessage):
-                            error_msg = f"Invalid message type received: {type(message)}"
-                            logger.error(error_msg)
-                            # 发送错误响应给客户端
-                            await write_stream.send(
-                                JSONRPCError(
-                                    jsonrpc="2.0",
-                                    id=None,
-                                    error={
-                                        "code": -32600,
-                                        "message": error_msg
-                                    }
-                                )
-                            )
-                            continue
-                        
-                        # 从JSONRPCMessage中提取实际的请求对象
-                        # JSONRPCMessage是一个RootModel，我们需要获取其root值
-                        actual_message = message.root if hasattr(message, 'root') else message
-                        
-                        # 检查实际消息是否为请求类型
-                        if not isinstance(actual_message, JSONRPCRequest):
-                            error_msg = f"Invalid message type, expected JSONRPCRequest but got: {type(actual_message)}"
-                            logger.error(error_msg)
-                            # 发送错误响应给客户端
-                            await write_stream.send(
-                                JSONRPCError(
-                                    jsonrpc="2.0",
-                                    id=None,
-                                    error={
-                                        "code": -32600,
-                                        "message": error_msg
-                                    }
-                                )
-                            )
-                            continue
-                        
-                        # Process message
-                        msg_dict = actual_message.model_dump()
-                        logger.debug(f"Received message: {msg_dict}")
-                        
-                        if 'method' not in msg_dict:
-                            error_msg = "Invalid JSON-RPC message format: missing method"
-                            logger.error(error_msg)
-                            # 发送错误响应给客户端
-                            if 'id' in msg_dict:
-                                await write_stream.send(
-                                    JSONRPCError(
-                                        jsonrpc="2.0",
-                                        id=msg_dict.get('id'),
-                                        error={
-                                            "code": -32600,
-                                            "message": error_msg
-                                        }
-                                    )
-                                )
-                            continue
-                            
-                        response = await call_tool(
-                            msg_dict['method'],
-                            msg_dict.get('params', {}) or {}
-                        )
-                        
-                        # 记录响应
-                        logger.debug(f"Sending response: {response}")
-                        
-                        await write_stream.send(
-                            JSONRPCResponse(
-                                jsonrpc="2.0",
-                                id=msg_dict.get('id'),
-                                result={"content": response}
-                            )
-                        )
-                            
-                    except KeyboardInterrupt:
-                        logger.info("Received shutdown signal")
-                        break
-                    except Exception as e:
-                        error_msg = f"Error processing message: {str(e)}"
-                        logger.exception(error_msg)  # 使用exception记录完整堆栈
-                        # 尝试发送错误响应
-                        try:
-                            if 'actual_message' in locals() and hasattr(actual_message, 'model_dump'):
-                                msg_dict = actual_message.model_dump()
-                                if 'id' in msg_dict:
-                                    await write_stream.send(
-                                        JSONRPCError(
-                                            jsonrpc="2.0",
-                                            id=msg_dict['id'],
-                                            error={
-                                                "code": -32603,
-                                                "message": error_msg
-                                            }
-                                        )
-                                    )
-                                else:
-                                    # 如果没有ID，发送通知错误
-                                    await write_stream.send(
-                                        JSONRPCError(
-                                            jsonrpc="2.0",
-                                            id=None,
-                                            error={
-                                                "code": -32603,
-                                                "message": error_msg
-                                            }
-                                        )
-                                    )
-                        except Exception as send_error:
-                            logger.error(f"Error sending error response: {str(send_error)}")
+                # 关闭写入流以便stdio传输在输入结束后退出
+                async with write_stream:
+                    await serve(read_stream, write_stream)
             except KeyboardInterrupt:
                 logger.info("Server shutdown requested")
             except Exception as e:
                 logger.exception(f"Server error: {str(e)}")
                 raise
     finally:
+        shutdown_process_pool()
         logger.info("Server shutdown complete")
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
@@ -0,0 +1,54 @@
+"""Coalescing of identical in-flight operations."""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Share one execution among concurrent callers that use the same key.
+
+    The first caller for a key starts the operation; callers arriving while
+    it is still running await the same task and receive its result or
+    exception. The shared task is shielded, so one waiter being cancelled
+    does not abort the work the other waiters depend on.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.shared = 0
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` for ``key`` unless an identical call is already in flight."""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._finished(key, t))
+        else:
+            self.shared += 1
+            logger.debug(f"Joined in-flight {self.name} call for {key!r}")
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # 所有等待者都被取消时也要取走异常，避免未检索异常的警告
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        """Number of distinct operations currently running."""
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, Any]:
+        """Report how many calls were coalesced."""
+        return {"in_flight": len(self._calls), "shared": self.shared}
+
+
+__all__ = ["SingleFlight"]
@@ -0,0 +1,66 @@
+"""Local caches and indexes kept alongside stored papers."""
+
+from .search_cache import SearchCache, get_search_cache
+from .metadata import (
+    metadata_from_result,
+    result_from_metadata,
+    save_metadata,
+    load_metadata,
+    resolve_metadata,
+)
+from .catalog import PaperCatalog, get_catalog
+from .pages import (
+    save_page_offsets,
+    load_page_offsets,
+    load_partial_page,
+    save_partial_page,
+    clear_partial_pages,
+)
+from .sections import index_sections, load_sections, find_section
+from .content_cache import ContentCache, get_content_cache
+from .mapped import read_range, search_file
+from .library_index import LibraryIndex, get_library_index
+from .passages import PassageIndex, get_passage_index
+from .vectors import VectorIndex, get_vector_index
+from .citations import CitationGraph, get_citation_graph, extract_citations
+from .minhash import MinHashIndex, get_minhash_index
+from .indexing import index_paper
+from .metadata_index import MetadataIndex, get_metadata_index
+
+__all__ = [
+    "SearchCache",
+    "get_search_cache",
+    "metadata_from_result",
+    "result_from_metadata",
+    "save_metadata",
+    "load_metadata",
+    "resolve_metadata",
+    "PaperCatalog",
+    "get_catalog",
+    "save_page_offsets",
+    "load_page_offsets",
+    "load_partial_page",
+    "save_partial_page",
+    "clear_partial_pages",
+    "index_sections",
+    "load_sections",
+    "find_section",
+    "ContentCache",
+    "get_content_cache",
+    "read_range",
+    "search_file",
+    "LibraryIndex",
+    "get_library_index",
+    "PassageIndex",
+    "get_passage_index",
+    "VectorIndex",
+    "get_vector_index",
+    "CitationGraph",
+    "get_citation_graph",
+    "extract_citations",
+    "MinHashIndex",
+    "get_minhash_index",
+    "index_paper",
+    "MetadataIndex",
+    "get_metadata_index",
+]
@@ -0,0 +1,202 @@
+"""Persistent catalog of stored papers."""
+
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..arxiv_client import base_id
+from ..config import get_settings
+from .metadata import load_metadata
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+_VERSION = re.compile(r"v(\d+)$")
+
+
+def _version(paper_id: str) -> int:
+    match = _VERSION.search(paper_id)
+    return int(match.group(1)) if match else 0
+
+
+class PaperCatalog:
+    """SQLite index mapping arXiv IDs to stored markdown files.
+
+    The download and conversion pipeline registers each paper as it is
+    written, so existence checks and path resolution are single indexed
+    lookups instead of a glob over the storage directory. Papers may be
+    stored under a sanitized title (see ``get_paper_path``); the catalog
+    still resolves them by arXiv ID, with or without a version suffix.
+    """
+
+    def __init__(self, db_path: Path, storage_path: Path):
+        self.db_path = db_path
+        self.storage_path = storage_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS papers (
+                    paper_id TEXT PRIMARY KEY,
+                    base_id TEXT NOT NULL,
+                    filename TEXT NOT NULL UNIQUE,
+                    title TEXT,
+                    added_at REAL NOT NULL
+                )
+                """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_papers_base_id ON papers (base_id)"
+            )
+
+    def add(self, paper_id: str, md_path: Path, title: Optional[str] = None) -> None:
+        """Register a stored paper, replacing any entry for the same ID or file."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO papers "
+                "(paper_id, base_id, filename, title, added_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (paper_id, base_id(paper_id), md_path.name, title, time.time()),
+            )
+
+    def remove(self, paper_id: str) -> None:
+        """Forget a paper."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM papers WHERE paper_id = ?", (paper_id,))
+
+    def find(self, paper_id: str) -> Optional[Path]:
+        """Resolve an arXiv ID (or a stored file stem) to its markdown file.
+
+        An ID without a version resolves to the newest stored version; an ID
+        with a version only resolves to that version.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT filename FROM papers WHERE paper_id = ?", (paper_id,)
+            ).fetchone()
+            if row is None and base_id(paper_id) == paper_id:
+                # 未指定版本时取已存储的最新版本；指定版本时只匹配该版本
+                versions = self._conn.execute(
+                    "SELECT paper_id, filename FROM papers WHERE base_id = ?",
+                    (paper_id,),
+                ).fetchall()
+                if versions:
+                    # 按版本号数值比较，v10排在v9之后
+                    row = max(versions, key=lambda v: _version(v[0]))[1:]
+            if row is None:
+                row = self._conn.execute(
+                    "SELECT filename FROM papers WHERE filename = ?",
+                    (f"{paper_id}.md",),
+                ).fetchone()
+
+        if row is not None:
+            path = self.storage_path / row[0]
+            if path.exists():
+                return path
+            logger.warning(f"Catalog entry for {paper_id} points to a missing file")
+            return None
+
+        # 未登记的手动放入文件：按ID命名时直接登记
+        path = self.storage_path / f"{paper_id}.md"
+        if path.exists():
+            self.add(paper_id, path)
+            return path
+        return None
+
+    def owner(self, md_path: Path) -> Optional[str]:
+        """The ID of the paper stored in a markdown file, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT paper_id FROM papers WHERE filename = ?", (md_path.name,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def stored_id(self, paper_id: str) -> str:
+        """The ID a paper is stored under, e.g. ``2101.00001v2`` for ``2101.00001``.
+
+        Indexes keyed by paper ID use the stored ID; IDs that resolve to no
+        stored paper are returned unchanged.
+        """
+        md_path = self.find(paper_id)
+        return (self.owner(md_path) if md_path else None) or paper_id
+
+    def has(self, paper_id: str) -> bool:
+        """Check whether a paper is stored."""
+        return self.find(paper_id) is not None
+
+    def entries(self) -> List[Tuple[str, Path]]:
+        """List ``(paper_id, markdown path)`` for every stored paper."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT paper_id, filename FROM papers ORDER BY added_at"
+            ).fetchall()
+        return [(paper_id, self.storage_path / filename) for paper_id, filename in rows]
+
+    def records(self) -> List[Tuple[str, Path, Optional[str]]]:
+        """List ``(paper_id, markdown path, title)`` for every stored paper."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT paper_id, filename, title FROM papers ORDER BY added_at"
+            ).fetchall()
+        return [
+            (paper_id, self.storage_path / filename, title)
+            for paper_id, filename, title in rows
+        ]
+
+    def reconcile(self) -> None:
+        """Bring the catalog in line with the files actually in storage.
+
+        Markdown files unknown to the catalog are registered under the ID
+        recorded in their metadata sidecar (falling back to the file stem),
+        and entries whose files have disappeared are dropped.
+        """
+        with self._lock:
+            known = {
+                filename: paper_id
+                for paper_id, filename in self._conn.execute(
+                    "SELECT paper_id, filename FROM papers"
+                )
+            }
+        on_disk = {path.name: path for path in self.storage_path.glob("*.md")}
+
+        added = 0
+        for filename, path in on_disk.items():
+            if filename in known:
+                continue
+            metadata = load_metadata(path) or {}
+            self.add(metadata.get("id") or path.stem, path, metadata.get("title"))
+            added += 1
+
+        removed = [
+            paper_id for filename, paper_id in known.items() if filename not in on_disk
+        ]
+        for paper_id in removed:
+            self.remove(paper_id)
+
+        if added or removed:
+            logger.info(
+                f"Catalog reconciled: {added} papers added, {len(removed)} removed"
+            )
+
+
+_catalogs: Dict[Path, PaperCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog() -> PaperCatalog:
+    """Get the paper catalog for the current storage path.
+
+    The first use in a process reconciles the catalog with the storage
+    directory, which also imports libraries created before the catalog.
+    """
+    settings = get_settings()
+    db_path = settings.INDEX_PATH / "catalog.db"
+    with _catalogs_lock:
+        if db_path not in _catalogs:
+            catalog = PaperCatalog(db_path, settings.STORAGE_PATH)
+            catalog.reconcile()
+            _catalogs[db_path] = catalog
+    return _catalogs[db_path]
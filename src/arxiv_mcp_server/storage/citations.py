@@ -0,0 +1,248 @@
+"""Citation graph over stored papers, built from their reference sections."""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..arxiv_client import base_id
+from ..config import get_settings
+from .catalog import get_catalog
+from .mapped import map_file
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+# 参考文献标题行，如 "## References"、"**7 Bibliography**"
+_REFERENCES_HEADING = re.compile(
+    rb"^[#*_ \t\d.]*(?:references|bibliography|works cited)[*_ \t:]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+_ARXIV_ID = re.compile(
+    r"(?:arxiv\s*(?:preprint\s*)?:?\s*|arxiv\.org/(?:abs|pdf)/)"
+    r"(\d{4}\.\d{4,5}|[a-z][a-z\-]+(?:\.[a-z]{2})?/\d{7})(?:v\d+)?",
+    re.IGNORECASE,
+)
+_DOI = re.compile(r"\b(10\.\d{4,9}/[^\s\"<>\[\]{}|]+)")
+_ARXIV_DOI = "10.48550/arxiv."
+
+
+def node_id(reference: str) -> str:
+    """Graph node of an arXiv ID (version dropped) or a DOI (``doi:...``)."""
+    if reference.lower().startswith(("doi:", "10.")):
+        # DOI不区分大小写
+        return "doi:" + reference.lower().removeprefix("doi:")
+    return base_id(reference)
+
+
+def references_text(md_path: Path) -> str:
+    """Text of a paper's reference section, or the whole paper if none is found."""
+    with map_file(md_path) as data:
+        start = 0
+        for match in _REFERENCES_HEADING.finditer(data):
+            start = match.start()
+        return data[start:].decode("utf-8", errors="replace")
+
+
+def extract_references(text: str) -> List[str]:
+    """Find cited arXiv IDs (without version) and DOIs (as ``doi:...``).
+
+    References are returned once each, in order of first appearance.
+    """
+    found: Dict[str, int] = {}
+    for match in _ARXIV_ID.finditer(text):
+        found.setdefault(match.group(1), match.start())
+    for match in _DOI.finditer(text):
+        doi = match.group(1).rstrip(".,;:)")
+        if doi.lower().startswith(_ARXIV_DOI):
+            # arXiv自己的DOI就是arXiv ID
+            found.setdefault(doi[len(_ARXIV_DOI) :], match.start())
+        else:
+            found.setdefault(node_id(doi), match.start())
+    return sorted(found, key=found.get)
+
+
+class CitationGraph:
+    """Citation graph of stored papers as compressed adjacency arrays.
+
+    The references of each paper are kept in SQLite; queries go to two
+    CSR arrays (``indptr``/``indices`` for outgoing and incoming edges over
+    integer node ids) that are rebuilt from the table after it changes.
+    Nodes are arXiv IDs without version, or ``doi:`` references.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS paper_references (
+                    paper_id TEXT PRIMARY KEY,
+                    node TEXT NOT NULL,
+                    refs TEXT NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL
+                )
+                """)
+        self._graph: Optional[Dict[str, Any]] = None
+
+    def add(self, paper_id: str, md_path: Path) -> List[str]:
+        """Extract (or re-extract) a stored paper's references."""
+        stat = md_path.stat()
+        node = node_id(paper_id)
+        refs = [
+            ref for ref in extract_references(references_text(md_path)) if ref != node
+        ]
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO paper_references "
+                "(paper_id, node, refs, mtime_ns, size) VALUES (?, ?, ?, ?, ?)",
+                (paper_id, node, json.dumps(refs), stat.st_mtime_ns, stat.st_size),
+            )
+            self._graph = None
+        return refs
+
+    def remove(self, paper_id: str) -> None:
+        """Drop a paper's references from the graph."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM paper_references WHERE paper_id = ?", (paper_id,)
+            )
+            self._graph = None
+
+    def sync(self, papers: List[Tuple[str, Path, Optional[str]]]) -> int:
+        """Extract references of new or changed papers and drop removed ones.
+
+        ``papers`` lists ``(paper_id, markdown path, title)`` for the whole
+        library. Returns the number of papers (re-)extracted.
+        """
+        with self._lock:
+            known = {
+                paper_id: (mtime_ns, size)
+                for paper_id, mtime_ns, size in self._conn.execute(
+                    "SELECT paper_id, mtime_ns, size FROM paper_references"
+                )
+            }
+        extracted = 0
+        for paper_id, md_path, _ in papers:
+            try:
+                stat = md_path.stat()
+            except FileNotFoundError:
+                continue
+            if known.get(paper_id) != (stat.st_mtime_ns, stat.st_size):
+                self.add(paper_id, md_path)
+                extracted += 1
+        stored = {paper_id for paper_id, _, _ in papers}
+        for paper_id in known.keys() - stored:
+            self.remove(paper_id)
+        if extracted:
+            logger.info(f"Extracted references of {extracted} papers")
+        return extracted
+
+    def _build(self) -> Dict[str, Any]:
+        """Build the CSR arrays from the stored reference lists."""
+        rows = self._conn.execute(
+            "SELECT node, refs FROM paper_references ORDER BY node"
+        ).fetchall()
+        edges = [(node, ref) for node, refs in rows for ref in json.loads(refs)]
+        nodes = sorted({node for node, _ in rows} | {ref for _, ref in edges})
+        ids = {node: i for i, node in enumerate(nodes)}
+        source = np.fromiter((ids[s] for s, _ in edges), np.int32, len(edges))
+        target = np.fromiter((ids[t] for _, t in edges), np.int32, len(edges))
+
+        def csr(keys: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            order = np.argsort(keys, kind="stable")
+            indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(keys, minlength=len(nodes)), out=indptr[1:])
+            return indptr, values[order]
+
+        return {
+            "nodes": nodes,
+            "ids": ids,
+            "stored": {node for node, _ in rows},
+            "out": csr(source, target),
+            "in": csr(target, source),
+        }
+
+    def _neighbours(self, paper_id: str, direction: str) -> Tuple[List[str], set]:
+        with self._lock:
+            if self._graph is None:
+                self._graph = self._build()
+            graph = self._graph
+        i = graph["ids"].get(node_id(paper_id))
+        if i is None:
+            return [], graph["stored"]
+        indptr, indices = graph[direction]
+        nodes = graph["nodes"]
+        return [nodes[j] for j in indices[indptr[i] : indptr[i + 1]]], graph["stored"]
+
+    def references(self, paper_id: str) -> List[Dict[str, Any]]:
+        """References of a stored paper, marking the ones in the library."""
+        refs, stored = self._neighbours(paper_id, "out")
+        return [
+            {
+                "id": ref,
+                "type": "doi" if ref.startswith("doi:") else "arxiv",
+                "in_library": ref in stored,
+            }
+            for ref in refs
+        ]
+
+    def citing(self, paper_id: str) -> List[str]:
+        """Stored papers whose references include ``paper_id``."""
+        citing, _ = self._neighbours(paper_id, "in")
+        return citing
+
+    def has(self, paper_id: str) -> bool:
+        """Whether references have been extracted for a stored paper."""
+        node = node_id(paper_id)
+        with self._lock:
+            return (
+                self._conn.execute(
+                    "SELECT 1 FROM paper_references WHERE node = ?", (node,)
+                ).fetchone()
+                is not None
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """Report the number of papers and citation edges."""
+        with self._lock:
+            if self._graph is None:
+                self._graph = self._build()
+            return {
+                "papers": len(self._graph["stored"]),
+                "nodes": len(self._graph["nodes"]),
+                "edges": len(self._graph["out"][1]),
+            }
+
+
+_graphs: Dict[Path, CitationGraph] = {}
+_graphs_lock = threading.Lock()
+
+
+def get_citation_graph() -> CitationGraph:
+    """Get the citation graph for the current storage path.
+
+    The first use in a process syncs the graph with the paper catalog.
+    """
+    db_path = get_settings().INDEX_PATH / "citations.db"
+    with _graphs_lock:
+        if db_path not in _graphs:
+            graph = CitationGraph(db_path)
+            graph.sync(get_catalog().records())
+            _graphs[db_path] = graph
+    return _graphs[db_path]
+
+
+def extract_citations(paper_id: str, md_path: Path) -> List[str]:
+    """Add a newly converted paper's references to the citation graph."""
+    graph = get_citation_graph()
+    refs = graph.add(paper_id, md_path)
+    logger.info(f"Found {len(refs)} references in {paper_id}")
+    return refs
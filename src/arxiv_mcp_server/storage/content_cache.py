@@ -0,0 +1,108 @@
+"""In-memory cache of stored paper content."""
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..config import get_settings
+
+
+class ContentCache:
+    """Size-bounded LRU cache of decoded papers and values derived from them.
+
+    Entries are keyed by file path and a variant name (``"content"`` for the
+    decoded markdown, anything else for derived values such as serialized
+    responses) and remember the file's modification time and size, so a
+    paper that is re-converted or edited is read again. Sizes are counted in
+    characters, which approximates bytes for the mostly ASCII papers.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Tuple[int, int], str]]"
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        path: Path,
+        variant: str = "content",
+        build: Optional[Callable[[str], str]] = None,
+    ) -> str:
+        """Get the content of ``path``, or ``build(content)`` for a variant.
+
+        Building a variant does not cache the decoded content as well, so
+        each lookup costs one entry and counts one miss.
+        """
+        stat = path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        key = (str(path), variant)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        if build is None:
+            value = path.read_text(encoding="utf-8")
+        else:
+            # 原文已在缓存中时直接复用，否则读文件，但不另存原文
+            content = self._peek((str(path), "content"), stamp)
+            if content is None:
+                content = path.read_text(encoding="utf-8")
+            value = build(content)
+        self._store(key, stamp, value)
+        return value
+
+    def _peek(self, key: Tuple[str, str], stamp: Tuple[int, int]) -> Optional[str]:
+        """A fresh cached value, without touching LRU order or counters."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry[1] if entry is not None and entry[0] == stamp else None
+
+    def _store(self, key: Tuple[str, str], stamp: Tuple[int, int], value: str) -> None:
+        size = len(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= len(old[1])
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (stamp, value)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= len(evicted)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Report hit/miss counters and current size."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_content_cache: Optional[ContentCache] = None
+
+
+def get_content_cache() -> ContentCache:
+    """Get the process-wide paper content cache."""
+    global _content_cache
+    if _content_cache is None:
+        _content_cache = ContentCache(get_settings().CONTENT_CACHE_MAX_BYTES)
+    return _content_cache
@@ -0,0 +1,42 @@
+"""Registration of newly converted papers with the local indexes."""
+
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+from .catalog import get_catalog
+from .library_index import get_library_index
+from .pages import clear_partial_pages, save_page_offsets
+from .passages import get_passage_index
+from .minhash import get_minhash_index
+from .sections import index_sections
+from .vectors import get_vector_index
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+
+def index_paper(
+    paper_id: str, md_path: Path, title: Optional[str], offsets: List[int]
+) -> None:
+    """Record a converted paper in the catalog and the read/search indexes.
+
+    Only registering with the catalog is required. The other indexes are
+    conveniences that can be rebuilt from the catalog, so a failure in one
+    of them is logged and the remaining ones are still updated.
+    """
+    get_catalog().add(paper_id, md_path, title)
+    stages = [
+        ("page index", lambda: save_page_offsets(md_path, offsets)),
+        ("section index", lambda: index_sections(md_path)),
+        ("library index", lambda: get_library_index().add(paper_id, md_path, title)),
+        ("passage index", lambda: get_passage_index().add(paper_id, md_path, title)),
+        ("vector index", lambda: get_vector_index().add(paper_id, md_path, title)),
+        ("MinHash index", lambda: get_minhash_index().add(paper_id, md_path)),
+        # 完整文档就绪后，按需转换的页面不再需要
+        ("partial pages", lambda: clear_partial_pages(paper_id)),
+    ]
+    for name, stage in stages:
+        try:
+            stage()
+        except Exception as e:
+            logger.warning(f"Updating the {name} failed for {paper_id}: {str(e)}")
@@ -0,0 +1,181 @@
+"""Full-text index over the papers stored in the library."""
+
+import logging
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import get_settings
+from .catalog import get_catalog
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+_TERM = re.compile(r'"([^"]*)"|(\S+)')
+_OPERATORS = {"AND", "OR", "NOT"}
+
+
+def to_fts_query(text: str) -> str:
+    """Translate a user query into an FTS5 ``MATCH`` expression.
+
+    Double-quoted text becomes a phrase and every other word a quoted term,
+    so punctuation in queries cannot break the FTS5 syntax. Upper-case
+    ``AND``, ``OR`` and ``NOT`` are kept as operators; terms are otherwise
+    all required.
+    """
+    terms = []
+    for phrase, word in _TERM.findall(text):
+        if word in _OPERATORS:
+            if terms and terms[-1] not in _OPERATORS:
+                terms.append(word)
+            continue
+        term = (phrase or word).strip()
+        if term:
+            terms.append('"' + term.replace('"', '""') + '"')
+    while terms and terms[-1] in _OPERATORS:
+        terms.pop()
+    return " ".join(terms)
+
+
+class LibraryIndex:
+    """SQLite FTS5 index of the markdown of stored papers.
+
+    Results are ranked with BM25, weighting title matches above body
+    matches, and come with a snippet around the best match. Papers are
+    added as their conversion finishes; ``sync`` catches up with papers
+    whose files changed or that were stored without being indexed.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS library_fts USING fts5(
+                    paper_id UNINDEXED,
+                    title,
+                    content,
+                    tokenize = 'porter unicode61'
+                )
+                """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS library_files (
+                    paper_id TEXT PRIMARY KEY,
+                    doc_id INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL
+                )
+                """)
+
+    def add(self, paper_id: str, md_path: Path, title: Optional[str] = None) -> None:
+        """Index (or re-index) a stored paper."""
+        stat = md_path.stat()
+        content = md_path.read_text(encoding="utf-8")
+        with self._lock, self._conn:
+            self._remove(paper_id)
+            cursor = self._conn.execute(
+                "INSERT INTO library_fts (paper_id, title, content) VALUES (?, ?, ?)",
+                (paper_id, title or "", content),
+            )
+            self._conn.execute(
+                "INSERT INTO library_files (paper_id, doc_id, mtime_ns, size) "
+                "VALUES (?, ?, ?, ?)",
+                (paper_id, cursor.lastrowid, stat.st_mtime_ns, stat.st_size),
+            )
+
+    def _remove(self, paper_id: str) -> None:
+        row = self._conn.execute(
+            "SELECT doc_id FROM library_files WHERE paper_id = ?", (paper_id,)
+        ).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM library_fts WHERE rowid = ?", row)
+            self._conn.execute(
+                "DELETE FROM library_files WHERE paper_id = ?", (paper_id,)
+            )
+
+    def remove(self, paper_id: str) -> None:
+        """Drop a paper from the index."""
+        with self._lock, self._conn:
+            self._remove(paper_id)
+
+    def sync(self, papers: List[Tuple[str, Path, Optional[str]]]) -> int:
+        """Index new or changed papers and drop ones no longer stored.
+
+        ``papers`` lists ``(paper_id, markdown path, title)`` for the whole
+        library. Returns the number of papers (re-)indexed.
+        """
+        with self._lock:
+            known = {
+                paper_id: (mtime_ns, size)
+                for paper_id, mtime_ns, size in self._conn.execute(
+                    "SELECT paper_id, mtime_ns, size FROM library_files"
+                )
+            }
+        indexed = 0
+        for paper_id, md_path, title in papers:
+            try:
+                stat = md_path.stat()
+            except FileNotFoundError:
+                continue
+            if known.get(paper_id) != (stat.st_mtime_ns, stat.st_size):
+                self.add(paper_id, md_path, title)
+                indexed += 1
+        stored = {paper_id for paper_id, _, _ in papers}
+        for paper_id in known.keys() - stored:
+            self.remove(paper_id)
+        if indexed:
+            logger.info(f"Indexed {indexed} papers for library search")
+        return indexed
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Rank stored papers against a query with BM25."""
+        expression = to_fts_query(query)
+        if not expression:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT paper_id, title, bm25(library_fts, 0.0, 10.0, 1.0), "
+                "snippet(library_fts, 2, '**', '**', ' … ', 32) "
+                "FROM library_fts WHERE library_fts MATCH ? "
+                "ORDER BY bm25(library_fts, 0.0, 10.0, 1.0) LIMIT ?",
+                (expression, limit),
+            ).fetchall()
+        return [
+            {
+                "id": paper_id,
+                "title": title or None,
+                "score": -rank,
+                "snippet": snippet,
+            }
+            for paper_id, title, rank, snippet in rows
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Report the number of indexed papers."""
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM library_files"
+            ).fetchone()
+        return {"papers": count}
+
+
+_indexes: Dict[Path, LibraryIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_library_index() -> LibraryIndex:
+    """Get the full-text index for the current storage path.
+
+    The first use in a process syncs the index with the paper catalog, which
+    also indexes libraries stored before the index existed.
+    """
+    db_path = get_settings().INDEX_PATH / "library.db"
+    with _indexes_lock:
+        if db_path not in _indexes:
+            index = LibraryIndex(db_path)
+            index.sync(get_catalog().records())
+            _indexes[db_path] = index
+    return _indexes[db_path]
@@ -0,0 +1,82 @@
+"""Memory-mapped ranged reads and searches over stored markdown files."""
+
+import mmap
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+
+@contextmanager
+def map_file(path: Path) -> Iterator[Union[mmap.mmap, bytes]]:
+    """Map a file read-only; empty files (which cannot be mapped) give ``b""``."""
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def _is_continuation(data: Union[mmap.mmap, bytes], pos: int) -> bool:
+    """Whether the byte at ``pos`` continues a multi-byte UTF-8 character."""
+    return 0 <= pos < len(data) and data[pos] & 0xC0 == 0x80
+
+
+def align(data: Union[mmap.mmap, bytes], pos: int, forward: bool = False) -> int:
+    """Move ``pos`` to the nearest UTF-8 character boundary."""
+    pos = max(0, min(pos, len(data)))
+    step = 1 if forward else -1
+    # UTF-8字符最长4个字节，最多移动3次
+    for _ in range(3):
+        if not _is_continuation(data, pos):
+            break
+        pos += step
+    return pos
+
+
+def _slice(
+    data: Union[mmap.mmap, bytes], offset: int, length: int
+) -> Tuple[str, int, int]:
+    start = align(data, offset, forward=True)
+    end = align(data, start + length)
+    if end <= start < len(data):
+        # 长度小于一个字符时至少返回一个完整字符
+        end = align(data, start + 1, forward=True)
+    return data[start:end].decode("utf-8"), start, end
+
+
+def read_range(path: Path, offset: int, length: int) -> Tuple[str, int, int, int]:
+    """Read up to ``length`` bytes of a file from ``offset`` through a mapping.
+
+    Only the pages of the file covering the range are touched. The range is
+    moved to UTF-8 character boundaries, so it always decodes and
+    consecutive ranges concatenate to the whole file. Returns the text, its
+    start and end offsets, and the file size.
+    """
+    with map_file(path) as data:
+        text, start, end = _slice(data, offset, length)
+        return text, start, end, len(data)
+
+
+def search_file(
+    path: Path, query: str, max_matches: int = 20, context: int = 200
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Find occurrences of ``query`` in a file, ignoring ASCII letter case.
+
+    The file is scanned through a mapping rather than loaded into a string.
+    Returns up to ``max_matches`` matches with their byte offset and a
+    snippet of surrounding text, and the total number of matches.
+    """
+    pattern = re.compile(re.escape(query.encode("utf-8")), re.IGNORECASE)
+    matches: List[Dict[str, Any]] = []
+    total = 0
+    with map_file(path) as data:
+        for match in pattern.finditer(data):
+            total += 1
+            if len(matches) >= max_matches:
+                continue
+            start = max(0, match.start() - context)
+            snippet, _, _ = _slice(data, start, match.end() + context - start)
+            matches.append({"offset": match.start(), "snippet": snippet})
+    return matches, total
@@ -0,0 +1,136 @@
+"""Local metadata sidecars for stored papers."""
+
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import arxiv
+
+from .. import arxiv_client
+from ..config import get_settings
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+
+def metadata_from_result(
+    paper: arxiv.Result, paper_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """Extract the metadata we keep for a paper from an arXiv result."""
+    published = getattr(paper, "published", None)
+    updated = getattr(paper, "updated", None)
+    return {
+        "id": paper_id or paper.get_short_id(),
+        "title": paper.title,
+        "authors": [author.name for author in paper.authors],
+        "summary": paper.summary,
+        "categories": list(getattr(paper, "categories", None) or []),
+        "published": published.isoformat() if published else None,
+        "updated": updated.isoformat() if updated else None,
+        "links": [link.href for link in paper.links],
+        "pdf_url": paper.pdf_url,
+    }
+
+
+def result_from_metadata(metadata: Dict[str, Any]) -> arxiv.Result:
+    """Rebuild an arXiv result from catalogued metadata.
+
+    The result carries everything ``metadata_from_result`` keeps, which is
+    enough to download the PDF without asking arXiv for metadata again.
+    """
+    paper_id = metadata["id"]
+    pdf_url = metadata.get("pdf_url")
+    result = arxiv.Result(
+        entry_id=f"http://arxiv.org/abs/{paper_id}",
+        title=metadata.get("title") or "",
+        authors=[arxiv.Result.Author(name) for name in metadata.get("authors") or []],
+        summary=metadata.get("summary") or "",
+        categories=list(metadata.get("categories") or []),
+        links=[
+            arxiv.Result.Link(href, title="pdf" if href == pdf_url else None)
+            for href in metadata.get("links") or []
+        ],
+    )
+    for field in ("published", "updated"):
+        value = metadata.get(field)
+        setattr(result, field, datetime.fromisoformat(value) if value else None)
+    # 旧的元数据可能没有记录PDF链接
+    result.pdf_url = pdf_url or f"https://arxiv.org/pdf/{paper_id}"
+    return result
+
+
+def metadata_path(md_path: Path) -> Path:
+    """Get the sidecar path for a stored paper's markdown file."""
+    directory = get_settings().INDEX_PATH / "metadata"
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / f"{md_path.stem}.json"
+
+
+def save_metadata(md_path: Path, metadata: Dict[str, Any]) -> None:
+    """Write a paper's metadata sidecar atomically and catalog it."""
+    # 延迟导入：元数据目录在初始化时需要读取本模块写入的文件
+    from .metadata_index import get_metadata_index
+
+    path = metadata_path(md_path)
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({**metadata, "file": md_path.name}, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    get_metadata_index().upsert(metadata)
+
+
+def load_metadata(md_path: Path) -> Optional[Dict[str, Any]]:
+    """Read a paper's metadata sidecar, or ``None`` if there is none."""
+    try:
+        with open(metadata_path(md_path), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable metadata for {md_path.name}: {e}")
+        return None
+
+
+async def resolve_metadata(
+    papers: List[Tuple[str, Path]], refresh: bool = False
+) -> List[Optional[Dict[str, Any]]]:
+    """Get metadata for stored ``(paper_id, markdown path)`` pairs from sidecars.
+
+    Papers without a sidecar (stored before sidecars existed) are taken from
+    the metadata catalog when it has seen them, e.g. in search results.
+    Those still missing, or every paper when ``refresh`` is set, are looked
+    up on arXiv in one batched request and their sidecars written, so later
+    calls stay local.
+    """
+    from .metadata_index import get_metadata_index
+
+    metadata = [None if refresh else load_metadata(path) for _, path in papers]
+    missing = [i for i, entry in enumerate(metadata) if entry is None]
+    if missing and not refresh:
+        index = get_metadata_index()
+        for i in missing:
+            paper_id, md_path = papers[i]
+            found = index.find(paper_id)
+            if found is not None:
+                metadata[i] = {**found, "id": paper_id}
+                save_metadata(md_path, metadata[i])
+        missing = [i for i in missing if metadata[i] is None]
+    if not missing:
+        return metadata
+
+    logger.info(f"Fetching metadata for {len(missing)} stored papers from arXiv")
+    results = await asyncio.gather(
+        *(arxiv_client.fetch_paper(papers[i][0]) for i in missing)
+    )
+    for i, paper in zip(missing, results):
+        paper_id, md_path = papers[i]
+        if paper is None:
+            # 刷新失败时保留已有的本地元数据
+            metadata[i] = load_metadata(md_path) if refresh else None
+            continue
+        metadata[i] = metadata_from_result(paper, paper_id)
+        save_metadata(md_path, metadata[i])
+    return metadata
@@ -0,0 +1,206 @@
+"""Local catalog of arXiv paper metadata, searchable offline."""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..arxiv_client import base_id
+from ..config import get_settings
+from ..query_parser import QuerySyntaxError, compile_query, quote_term
+from .catalog import get_catalog
+from .metadata import load_metadata
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+_VERSION = re.compile(r"v(\d+)$")
+
+# 相关度排序时各字段的BM25权重：标题 > 作者 > 摘要 > 分类
+_WEIGHTS = "10.0, 5.0, 1.0, 1.0"
+
+
+def _version(paper_id: str) -> int:
+    match = _VERSION.search(paper_id)
+    return int(match.group(1)) if match else 0
+
+
+class MetadataIndex:
+    """SQLite catalog of paper metadata with a per-field FTS5 index.
+
+    One row is kept per paper (by arXiv ID without version), holding the
+    newest version seen. The ``ti``, ``au``, ``abs`` and ``cat`` columns of
+    the full-text index mirror the arXiv query fields, so queries written
+    for the arXiv API can be answered locally.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS paper_metadata (
+                    base_id TEXT PRIMARY KEY,
+                    paper_id TEXT NOT NULL,
+                    version INTEGER NOT NULL,
+                    published TEXT,
+                    data TEXT NOT NULL,
+                    seen_at REAL NOT NULL
+                )
+                """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_paper_metadata_published "
+                "ON paper_metadata (published)"
+            )
+            self._conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS metadata_fts USING fts5(
+                    ti, au, abs, cat, tokenize = 'porter unicode61'
+                )
+                """)
+
+    def upsert_many(self, papers: Iterable[Dict[str, Any]]) -> None:
+        """Record metadata (as built by ``metadata_from_result``) for papers.
+
+        An entry is only replaced by the same or a newer version.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            for metadata in papers:
+                paper_id = metadata["id"]
+                row = self._conn.execute(
+                    "INSERT INTO paper_metadata "
+                    "(base_id, paper_id, version, published, data, seen_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (base_id) DO UPDATE SET "
+                    "paper_id = excluded.paper_id, version = excluded.version, "
+                    "published = excluded.published, data = excluded.data, "
+                    "seen_at = excluded.seen_at "
+                    "WHERE excluded.version >= paper_metadata.version "
+                    "RETURNING rowid",
+                    (
+                        base_id(paper_id),
+                        paper_id,
+                        _version(paper_id),
+                        metadata.get("published"),
+                        json.dumps(metadata, ensure_ascii=False),
+                        now,
+                    ),
+                ).fetchone()
+                if row is None:
+                    continue
+                self._conn.execute("DELETE FROM metadata_fts WHERE rowid = ?", row)
+                self._conn.execute(
+                    "INSERT INTO metadata_fts (rowid, ti, au, abs, cat) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        row[0],
+                        metadata.get("title") or "",
+                        "; ".join(metadata.get("authors") or []),
+                        metadata.get("summary") or "",
+                        " ".join(metadata.get("categories") or []),
+                    ),
+                )
+
+    def upsert(self, metadata: Dict[str, Any]) -> None:
+        """Record metadata for one paper."""
+        self.upsert_many([metadata])
+
+    def get(self, paper_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a paper's metadata by arXiv ID, with or without version."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM paper_metadata WHERE base_id = ?",
+                (base_id(paper_id),),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find(self, paper_id: str) -> Optional[Dict[str, Any]]:
+        """Metadata usable for ``paper_id``: any version for an unversioned ID.
+
+        A versioned ID only matches metadata recorded for that version.
+        """
+        metadata = self.get(paper_id)
+        if metadata is None:
+            return None
+        if _version(paper_id) and metadata["id"] != paper_id:
+            return None
+        return metadata
+
+    def count(self) -> int:
+        """Number of papers in the catalog."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM paper_metadata").fetchone()[
+                0
+            ]
+
+    def search(
+        self,
+        query: str,
+        categories: Optional[List[str]] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        sort_by: str = "relevance",
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Evaluate an arXiv-syntax query against the local catalog.
+
+        Raises ``QuerySyntaxError`` for queries that cannot be evaluated.
+        """
+        expression = f"({compile_query(query)})"
+        if categories:
+            expression += (
+                " AND ("
+                + " OR ".join(
+                    "cat : " + quote_term(category) for category in categories
+                )
+                + ")"
+            )
+        sql = (
+            "SELECT m.data FROM metadata_fts JOIN paper_metadata m "
+            "ON m.rowid = metadata_fts.rowid WHERE metadata_fts MATCH ?"
+        )
+        params: List[Any] = [expression]
+        if date_from:
+            sql += " AND m.published >= ?"
+            params.append(date_from.isoformat())
+        if date_to:
+            sql += " AND m.published <= ?"
+            params.append(date_to.isoformat())
+        if sort_by == "date":
+            sql += " ORDER BY m.published DESC"
+        else:
+            sql += f" ORDER BY bm25(metadata_fts, {_WEIGHTS})"
+        sql += " LIMIT ?"
+        params.append(limit)
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            raise QuerySyntaxError(f"Invalid query '{query}': {e}")
+        return [json.loads(data) for (data,) in rows]
+
+
+_indexes: Dict[Path, MetadataIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_metadata_index() -> MetadataIndex:
+    """Get the metadata catalog for the current storage path.
+
+    A new catalog is seeded with the metadata sidecars of stored papers.
+    """
+    db_path = get_settings().INDEX_PATH / "metadata.db"
+    with _indexes_lock:
+        if db_path not in _indexes:
+            index = MetadataIndex(db_path)
+            _indexes[db_path] = index
+            if index.count() == 0:
+                stored = [load_metadata(path) for _, path in get_catalog().entries()]
+                index.upsert_many(m for m in stored if m and m.get("id"))
+    return _indexes[db_path]
@@ -0,0 +1,288 @@
+"""MinHash signatures of stored papers for near-duplicate detection."""
+
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import get_settings
+from .catalog import get_catalog
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+_WORD = re.compile(r"[a-z0-9]+")
+_PRIME = np.uint64((1 << 31) - 1)
+# 每次与全部哈希函数相乘的shingle数，控制临时矩阵大小
+_BLOCK = 4096
+
+
+def shingles(text: str, size: int = 5) -> np.ndarray:
+    """Hashes of the distinct ``size``-word shingles of a text.
+
+    Only lower-cased letters and digits count as words, so markdown and
+    plain text extracted from the same PDF give mostly the same shingles.
+    """
+    words = _WORD.findall(text.lower())
+    if not words:
+        return np.zeros(0, dtype=np.uint64)
+    hashes = np.fromiter(
+        (zlib.crc32(word.encode("utf-8")) for word in words),
+        dtype=np.uint64,
+        count=len(words),
+    )
+    size = min(size, len(words))
+    count = len(words) - size + 1
+    combined = np.zeros(count, dtype=np.uint64)
+    for j in range(size):
+        # 多项式组合相邻单词的哈希，uint64溢出时自然回绕
+        combined = combined * np.uint64(1000003) + hashes[j : j + count]
+    return np.unique(combined & np.uint64(0xFFFFFFFF))
+
+
+class MinHasher:
+    """``permutations`` universal hash functions ``(a * x + b) mod p``."""
+
+    def __init__(self, permutations: int, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, _PRIME, permutations, dtype=np.uint64)
+        self.b = rng.integers(0, _PRIME, permutations, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        """Minimum of each hash function over the text's shingles."""
+        signature = np.full(len(self.a), _PRIME, dtype=np.uint64)
+        values = shingles(text)
+        for start in range(0, len(values), _BLOCK):
+            block = values[start : start + _BLOCK, None]
+            np.minimum(
+                signature, ((block * self.a + self.b) % _PRIME).min(axis=0), signature
+            )
+        return signature.astype(np.uint32)
+
+
+def similarity(first: np.ndarray, second: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(first == second))
+
+
+class MinHashIndex:
+    """MinHash signatures of stored papers with an LSH band index in SQLite.
+
+    A signature is cut into ``bands`` bands; papers sharing the hash of any
+    band are candidates, and candidates are confirmed by comparing full
+    signatures. With 128 permutations in 16 bands, pairs above about 0.7
+    similarity are almost always found.
+    """
+
+    def __init__(self, db_path: Path, permutations: int, bands: int):
+        if permutations % bands:
+            raise ValueError("permutations must be a multiple of bands")
+        self.db_path = db_path
+        self.bands = bands
+        self.hasher = MinHasher(permutations)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS minhash_signatures (
+                    paper_id TEXT PRIMARY KEY,
+                    signature BLOB NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL
+                )
+                """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS minhash_buckets (
+                    band INTEGER NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    paper_id TEXT NOT NULL
+                )
+                """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_minhash_buckets "
+                "ON minhash_buckets (band, bucket)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_minhash_buckets_paper "
+                "ON minhash_buckets (paper_id)"
+            )
+
+    def _buckets(self, signature: np.ndarray) -> List[Tuple[int, int]]:
+        return [
+            (
+                band,
+                int.from_bytes(
+                    hashlib.blake2b(rows.tobytes(), digest_size=8).digest(),
+                    "big",
+                    signed=True,
+                ),
+            )
+            for band, rows in enumerate(signature.reshape(self.bands, -1))
+        ]
+
+    def add(self, paper_id: str, md_path: Path) -> np.ndarray:
+        """Compute (or recompute) the signature of a stored paper."""
+        stat = md_path.stat()
+        signature = self.hasher.signature(md_path.read_text(encoding="utf-8"))
+        with self._lock, self._conn:
+            self._remove(paper_id)
+            self._conn.execute(
+                "INSERT INTO minhash_signatures "
+                "(paper_id, signature, mtime_ns, size) VALUES (?, ?, ?, ?)",
+                (paper_id, signature.tobytes(), stat.st_mtime_ns, stat.st_size),
+            )
+            self._conn.executemany(
+                "INSERT INTO minhash_buckets (band, bucket, paper_id) "
+                "VALUES (?, ?, ?)",
+                [(band, bucket, paper_id) for band, bucket in self._buckets(signature)],
+            )
+        return signature
+
+    def _remove(self, paper_id: str) -> None:
+        self._conn.execute(
+            "DELETE FROM minhash_signatures WHERE paper_id = ?", (paper_id,)
+        )
+        self._conn.execute(
+            "DELETE FROM minhash_buckets WHERE paper_id = ?", (paper_id,)
+        )
+
+    def remove(self, paper_id: str) -> None:
+        """Drop a paper's signature."""
+        with self._lock, self._conn:
+            self._remove(paper_id)
+
+    def sync(self, papers: List[Tuple[str, Path, Optional[str]]]) -> int:
+        """Sign new or changed papers and drop ones no longer stored.
+
+        ``papers`` lists ``(paper_id, markdown path, title)`` for the whole
+        library. Returns the number of papers (re-)signed.
+        """
+        with self._lock:
+            known = {
+                paper_id: (mtime_ns, size)
+                for paper_id, mtime_ns, size in self._conn.execute(
+                    "SELECT paper_id, mtime_ns, size FROM minhash_signatures"
+                )
+            }
+        signed = 0
+        for paper_id, md_path, _ in papers:
+            try:
+                stat = md_path.stat()
+            except FileNotFoundError:
+                continue
+            if known.get(paper_id) != (stat.st_mtime_ns, stat.st_size):
+                self.add(paper_id, md_path)
+                signed += 1
+        stored = {paper_id for paper_id, _, _ in papers}
+        for paper_id in known.keys() - stored:
+            self.remove(paper_id)
+        if signed:
+            logger.info(f"Computed MinHash signatures of {signed} papers")
+        return signed
+
+    def _signatures(self, paper_ids: List[str]) -> Dict[str, np.ndarray]:
+        signatures = {}
+        # 分批查询，避免超出SQLite的参数个数上限
+        for start in range(0, len(paper_ids), 500):
+            chunk = paper_ids[start : start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            signatures.update(
+                (paper_id, np.frombuffer(blob, dtype=np.uint32))
+                for paper_id, blob in self._conn.execute(
+                    "SELECT paper_id, signature FROM minhash_signatures "
+                    f"WHERE paper_id IN ({placeholders})",
+                    chunk,
+                )
+            )
+        return signatures
+
+    def signature(self, paper_id: str) -> Optional[np.ndarray]:
+        """The stored signature of a paper, if it has one."""
+        with self._lock:
+            return self._signatures([paper_id]).get(paper_id)
+
+    def query(
+        self, signature: np.ndarray, threshold: float, exclude: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Stored papers at least ``threshold`` similar to a signature."""
+        with self._lock:
+            candidates = set()
+            for band, bucket in self._buckets(signature):
+                candidates.update(
+                    paper_id
+                    for (paper_id,) in self._conn.execute(
+                        "SELECT paper_id FROM minhash_buckets "
+                        "WHERE band = ? AND bucket = ?",
+                        (band, bucket),
+                    )
+                )
+            candidates.discard(exclude)
+            signatures = self._signatures(sorted(candidates))
+        matches = [
+            {"id": paper_id, "similarity": similarity(signature, other)}
+            for paper_id, other in signatures.items()
+        ]
+        return sorted(
+            (m for m in matches if m["similarity"] >= threshold),
+            key=lambda m: -m["similarity"],
+        )
+
+    def duplicates(self, threshold: float) -> List[Dict[str, Any]]:
+        """All pairs of stored papers at least ``threshold`` similar."""
+        with self._lock:
+            pairs = self._conn.execute("""
+                SELECT DISTINCT a.paper_id, b.paper_id
+                FROM minhash_buckets a JOIN minhash_buckets b
+                ON a.band = b.band AND a.bucket = b.bucket
+                AND a.paper_id < b.paper_id
+                """).fetchall()
+            if not pairs:
+                return []
+            signatures = self._signatures(sorted({p for pair in pairs for p in pair}))
+        # 一次性比较所有候选对的完整签名
+        first = np.stack([signatures[a] for a, _ in pairs])
+        second = np.stack([signatures[b] for _, b in pairs])
+        scores = (first == second).mean(axis=1)
+        return sorted(
+            (
+                {"ids": [a, b], "similarity": float(score)}
+                for (a, b), score in zip(pairs, scores)
+                if score >= threshold
+            ),
+            key=lambda pair: -pair["similarity"],
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Report the number of signed papers."""
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM minhash_signatures"
+            ).fetchone()
+        return {"papers": count}
+
+
+_indexes: Dict[Path, MinHashIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_minhash_index() -> MinHashIndex:
+    """Get the MinHash index for the current storage path.
+
+    The first use in a process syncs the index with the paper catalog.
+    """
+    settings = get_settings()
+    db_path = settings.INDEX_PATH / "minhash.db"
+    with _indexes_lock:
+        if db_path not in _indexes:
+            index = MinHashIndex(
+                db_path, settings.MINHASH_PERMUTATIONS, settings.MINHASH_BANDS
+            )
+            index.sync(get_catalog().records())
+            _indexes[db_path] = index
+    return _indexes[db_path]
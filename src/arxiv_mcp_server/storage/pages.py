@@ -0,0 +1,70 @@
+"""Page offsets and partial page conversions of stored papers."""
+
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import List, Optional
+
+from ..config import get_settings
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+
+def page_index_path(md_path: Path) -> Path:
+    """Get the page offset index path for a stored paper's markdown file."""
+    directory = get_settings().INDEX_PATH / "pages"
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / f"{md_path.stem}.json"
+
+
+def save_page_offsets(md_path: Path, offsets: List[int]) -> None:
+    """Record the byte offset at which each page of a paper starts."""
+    path = page_index_path(md_path)
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"offsets": offsets, "size": offsets[-1]}, f)
+    os.replace(tmp_path, path)
+
+
+def load_page_offsets(md_path: Path) -> Optional[List[int]]:
+    """Read a paper's page offsets, or ``None`` if missing or out of date."""
+    try:
+        with open(page_index_path(md_path), encoding="utf-8") as f:
+            index = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable page index for {md_path.name}: {e}")
+        return None
+    # 文件被替换或修改后索引失效
+    if index.get("size") != md_path.stat().st_size:
+        return None
+    return index["offsets"]
+
+
+def _partial_dir(paper_id: str) -> Path:
+    return get_settings().INDEX_PATH / "partial" / paper_id.replace("/", "_")
+
+
+def load_partial_page(paper_id: str, page: int) -> Optional[str]:
+    """Read the markdown of one page converted ahead of the full paper."""
+    try:
+        return (_partial_dir(paper_id) / f"{page}.md").read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+
+def save_partial_page(paper_id: str, page: int, markdown: str) -> None:
+    """Keep the markdown of one page converted ahead of the full paper."""
+    directory = _partial_dir(paper_id)
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp_path = directory / f"{page}.md.tmp"
+    tmp_path.write_text(markdown, encoding="utf-8")
+    os.replace(tmp_path, directory / f"{page}.md")
+
+
+def clear_partial_pages(paper_id: str) -> None:
+    """Drop partial pages once the full paper has been converted."""
+    shutil.rmtree(_partial_dir(paper_id), ignore_errors=True)
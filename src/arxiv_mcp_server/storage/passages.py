@@ -0,0 +1,241 @@
+"""Passage-level index over overlapping chunks of stored papers."""
+
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ..config import get_settings
+from .catalog import get_catalog
+from .library_index import to_fts_query
+from .mapped import align, map_file
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+
+def _break_before(data: Union[bytes, Any], low: int, high: int) -> int:
+    """Last break in ``data[low:high]``, preferring line ends over spaces."""
+    for separator in (b"\n\n", b"\n", b" "):
+        pos = data.rfind(separator, low, high)
+        if pos != -1:
+            return pos + len(separator)
+    return align(data, high)
+
+
+def _break_after(data: Union[bytes, Any], low: int, high: int) -> int:
+    """First word start in ``data[low:high]``."""
+    found = [
+        pos
+        for pos in (data.find(b"\n", low, high), data.find(b" ", low, high))
+        if pos != -1
+    ]
+    if found:
+        return min(found) + 1
+    return align(data, low, forward=True)
+
+
+def chunk_spans(
+    data: Union[bytes, Any], size: int, overlap: int
+) -> List[Tuple[int, int]]:
+    """Split ``data`` into overlapping chunks of at most about ``size`` bytes.
+
+    Chunks end at a paragraph, line or word break where one exists in their
+    second half, and each chunk starts up to ``overlap`` bytes before the
+    previous one ended, at a word start. Returns ``(start, end)`` byte
+    offsets.
+    """
+    spans: List[Tuple[int, int]] = []
+    total = len(data)
+    start = 0
+    while start < total:
+        end = start + size
+        if end >= total:
+            end = total
+        else:
+            end = _break_before(data, start + size // 2, end)
+        spans.append((start, end))
+        if end >= total:
+            break
+        start = _break_after(data, max(end - overlap, start + 1), end)
+    return spans
+
+
+class PassageIndex:
+    """SQLite FTS5 index of overlapping passages of stored papers.
+
+    Every passage remembers its byte range in the paper's markdown file, so
+    results can be expanded with ``read_paper``'s ``offset``/``length``.
+    The passages of a paper occupy consecutive rowids, recorded per paper,
+    which keeps replacing a paper's passages a range delete.
+    """
+
+    def __init__(self, db_path: Path, chunk_size: int, overlap: int):
+        self.db_path = db_path
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS passage_fts USING fts5(
+                    paper_id UNINDEXED,
+                    start_byte UNINDEXED,
+                    end_byte UNINDEXED,
+                    content,
+                    tokenize = 'porter unicode61'
+                )
+                """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS passage_files (
+                    paper_id TEXT PRIMARY KEY,
+                    title TEXT,
+                    first_rowid INTEGER NOT NULL,
+                    last_rowid INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL
+                )
+                """)
+
+    def add(self, paper_id: str, md_path: Path, title: Optional[str] = None) -> int:
+        """Chunk and index (or re-index) a stored paper; returns the chunk count."""
+        stat = md_path.stat()
+        with map_file(md_path) as data:
+            passages = [
+                (paper_id, start, end, data[start:end].decode("utf-8"))
+                for start, end in chunk_spans(data, self.chunk_size, self.overlap)
+            ]
+        with self._lock, self._conn:
+            self._remove(paper_id)
+            first = last = 0
+            for passage in passages:
+                cursor = self._conn.execute(
+                    "INSERT INTO passage_fts "
+                    "(paper_id, start_byte, end_byte, content) VALUES (?, ?, ?, ?)",
+                    passage,
+                )
+                last = cursor.lastrowid
+                first = first or last
+            self._conn.execute(
+                "INSERT INTO passage_files "
+                "(paper_id, title, first_rowid, last_rowid, mtime_ns, size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (paper_id, title, first, last, stat.st_mtime_ns, stat.st_size),
+            )
+        return len(passages)
+
+    def _remove(self, paper_id: str) -> None:
+        row = self._conn.execute(
+            "SELECT first_rowid, last_rowid FROM passage_files WHERE paper_id = ?",
+            (paper_id,),
+        ).fetchone()
+        if row is not None:
+            self._conn.execute(
+                "DELETE FROM passage_fts WHERE rowid BETWEEN ? AND ?", row
+            )
+            self._conn.execute(
+                "DELETE FROM passage_files WHERE paper_id = ?", (paper_id,)
+            )
+
+    def remove(self, paper_id: str) -> None:
+        """Drop a paper's passages from the index."""
+        with self._lock, self._conn:
+            self._remove(paper_id)
+
+    def sync(self, papers: List[Tuple[str, Path, Optional[str]]]) -> int:
+        """Index new or changed papers and drop ones no longer stored.
+
+        ``papers`` lists ``(paper_id, markdown path, title)`` for the whole
+        library. Returns the number of papers (re-)indexed.
+        """
+        with self._lock:
+            known = {
+                paper_id: (mtime_ns, size)
+                for paper_id, mtime_ns, size in self._conn.execute(
+                    "SELECT paper_id, mtime_ns, size FROM passage_files"
+                )
+            }
+        indexed = 0
+        for paper_id, md_path, title in papers:
+            try:
+                stat = md_path.stat()
+            except FileNotFoundError:
+                continue
+            if known.get(paper_id) != (stat.st_mtime_ns, stat.st_size):
+                self.add(paper_id, md_path, title)
+                indexed += 1
+        stored = {paper_id for paper_id, _, _ in papers}
+        for paper_id in known.keys() - stored:
+            self.remove(paper_id)
+        if indexed:
+            logger.info(f"Indexed passages of {indexed} papers")
+        return indexed
+
+    def search(
+        self, query: str, limit: int = 5, paper_ids: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Rank passages against a query with BM25.
+
+        ``paper_ids`` restricts the search to some papers.
+        """
+        expression = to_fts_query(query)
+        if not expression:
+            return []
+        sql = (
+            "SELECT passage_fts.paper_id, f.title, start_byte, end_byte, "
+            "bm25(passage_fts), content FROM passage_fts "
+            "JOIN passage_files f ON f.paper_id = passage_fts.paper_id "
+            "WHERE passage_fts MATCH ?"
+        )
+        params: List[Any] = [expression]
+        if paper_ids:
+            sql += f" AND passage_fts.paper_id IN ({', '.join('?' for _ in paper_ids)})"
+            params.extend(paper_ids)
+        sql += " ORDER BY bm25(passage_fts) LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {
+                "id": paper_id,
+                "title": title,
+                "offset": start,
+                "length": end - start,
+                "score": -rank,
+                "text": text,
+            }
+            for paper_id, title, start, end, rank, text in rows
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Report the number of indexed papers and passages."""
+        with self._lock:
+            (papers,) = self._conn.execute(
+                "SELECT COUNT(*) FROM passage_files"
+            ).fetchone()
+            (passages,) = self._conn.execute(
+                "SELECT COUNT(*) FROM passage_fts"
+            ).fetchone()
+        return {"papers": papers, "passages": passages}
+
+
+_indexes: Dict[Path, PassageIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_passage_index() -> PassageIndex:
+    """Get the passage index for the current storage path.
+
+    The first use in a process syncs the index with the paper catalog.
+    """
+    settings = get_settings()
+    db_path = settings.INDEX_PATH / "passages.db"
+    with _indexes_lock:
+        if db_path not in _indexes:
+            index = PassageIndex(
+                db_path, settings.PASSAGE_CHUNK_SIZE, settings.PASSAGE_CHUNK_OVERLAP
+            )
+            index.sync(get_catalog().records())
+            _indexes[db_path] = index
+    return _indexes[db_path]
@@ -0,0 +1,166 @@
+"""Persistent cache of arXiv search responses."""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from ..config import get_settings
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+
+class SearchCache:
+    """SQLite-backed cache of serialized search responses.
+
+    Entries younger than ``ttl`` seconds are fresh. Older entries are still
+    returned, flagged as stale, until they reach ``stale_ttl`` seconds, so the
+    caller can answer immediately and refresh in the background
+    (stale-while-revalidate). The cache is bounded by entry count and total
+    payload size, evicting least recently used entries first.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        ttl: float,
+        stale_ttl: float,
+        max_entries: int,
+        max_bytes: int,
+    ):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_search_cache_accessed "
+                "ON search_cache (accessed_at)"
+            )
+
+    @staticmethod
+    def make_key(params: Dict[str, Any]) -> str:
+        """Hash normalized search parameters into a cache key."""
+        encoded = json.dumps(params, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, bool]]:
+        """Return ``(payload, is_stale)`` for a cached entry, or ``None``."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.stale_ttl:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE search_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+
+        payload, created_at = row
+        stale = now - created_at > self.ttl
+        if stale:
+            self.stale_hits += 1
+        else:
+            self.hits += 1
+        return payload, stale
+
+    def put(self, key: str, payload: str) -> None:
+        """Store a payload and evict entries beyond the size bounds."""
+        now = time.time()
+        size = len(payload.encode("utf-8"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache "
+                "(key, payload, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload, size, now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently used ones over the bounds."""
+        self._conn.execute(
+            "DELETE FROM search_cache WHERE created_at < ?", (now - self.stale_ttl,)
+        )
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM search_cache"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        evicted = []
+        rows = self._conn.execute(
+            "SELECT key, size FROM search_cache ORDER BY accessed_at ASC"
+        )
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            count -= 1
+            total -= size
+        self._conn.executemany("DELETE FROM search_cache WHERE key = ?", evicted)
+        logger.debug(f"Evicted {len(evicted)} search cache entries")
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM search_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        """Report hit/miss counters and current size."""
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM search_cache"
+            ).fetchone()
+        return {
+            "entries": count,
+            "bytes": total,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
+
+
+_caches: Dict[Path, SearchCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """Get the search cache for the current storage path, or ``None`` if disabled."""
+    settings = get_settings()
+    if not settings.SEARCH_CACHE_ENABLED:
+        return None
+
+    db_path = settings.INDEX_PATH / "search_cache.db"
+    with _caches_lock:
+        if db_path not in _caches:
+            _caches[db_path] = SearchCache(
+                db_path,
+                ttl=settings.SEARCH_CACHE_TTL,
+                stale_ttl=settings.SEARCH_CACHE_STALE_TTL,
+                max_entries=settings.SEARCH_CACHE_MAX_ENTRIES,
+                max_bytes=settings.SEARCH_CACHE_MAX_BYTES,
+            )
+    return _caches[db_path]
@@ -0,0 +1,117 @@
+"""Heading index of stored papers for reading them section by section."""
+
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..config import get_settings
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+_HEADING = re.compile(rb"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_EMPHASIS = re.compile(r"[*_`]+")
+
+# 粗略估算：平均每个token约4个字节
+BYTES_PER_TOKEN = 4
+
+
+def _clean_title(raw: bytes) -> str:
+    return _EMPHASIS.sub("", raw.decode("utf-8", errors="replace")).strip()
+
+
+def build_section_index(md_path: Path) -> List[Dict[str, Any]]:
+    """Scan a markdown file for headings and the byte range of each section.
+
+    A section runs from its heading to the next heading of the same or a
+    higher level, so it includes its subsections. Headings inside fenced
+    code blocks are ignored. The file is read line by line.
+    """
+    headings = []
+    offset = 0
+    in_code = False
+    with open(md_path, "rb") as f:
+        for line in f:
+            if line.startswith(b"```"):
+                in_code = not in_code
+            elif not in_code:
+                match = _HEADING.match(line.rstrip(b"\r\n"))
+                if match:
+                    title = _clean_title(match.group(2))
+                    if title:
+                        headings.append((title, len(match.group(1)), offset))
+            offset += len(line)
+    total = offset
+
+    sections = []
+    for i, (title, level, start) in enumerate(headings):
+        end = next(
+            (other for _, lvl, other in headings[i + 1 :] if lvl <= level), total
+        )
+        sections.append(
+            {
+                "title": title,
+                "level": level,
+                "offset": start,
+                "length": end - start,
+                "tokens": (end - start) // BYTES_PER_TOKEN,
+            }
+        )
+    return sections
+
+
+def section_index_path(md_path: Path) -> Path:
+    """Get the section index path for a stored paper's markdown file."""
+    directory = get_settings().INDEX_PATH / "sections"
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / f"{md_path.stem}.json"
+
+
+def index_sections(md_path: Path) -> List[Dict[str, Any]]:
+    """Build and store the section index of a paper."""
+    sections = build_section_index(md_path)
+    path = section_index_path(md_path)
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"size": md_path.stat().st_size, "sections": sections},
+            f,
+            ensure_ascii=False,
+        )
+    os.replace(tmp_path, path)
+    return sections
+
+
+def load_sections(md_path: Path) -> List[Dict[str, Any]]:
+    """Get a paper's section index, rebuilding it if missing or out of date."""
+    try:
+        with open(section_index_path(md_path), encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("size") == md_path.stat().st_size:
+            return index["sections"]
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logger.warning(f"Rebuilding unreadable section index for {md_path.name}: {e}")
+    return index_sections(md_path)
+
+
+def find_section(sections: List[Dict[str, Any]], name: str) -> Optional[Dict[str, Any]]:
+    """Find a section by title: exact match, then prefix, then substring.
+
+    Matching ignores case, so ``"4"`` finds ``"4 Experiments"`` and
+    ``"introduction"`` finds ``"1 Introduction"``.
+    """
+    needle = name.strip().lower()
+    titles = [section["title"].lower() for section in sections]
+    for matches in (
+        lambda title: title == needle,
+        lambda title: title.startswith(needle),
+        lambda title: needle in title,
+    ):
+        for section, title in zip(sections, titles):
+            if matches(title):
+                return section
+    return None
@@ -0,0 +1,479 @@
+"""Dense document vectors for finding similar papers in the library."""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import get_settings
+from .catalog import get_catalog
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+_WORD = re.compile(r"[a-z][a-z0-9]{2,}")
+
+# 相似度检索时每次从映射文件读取的行数
+_SEARCH_BLOCK = 65536
+
+Terms = Tuple[np.ndarray, np.ndarray]
+
+
+def term_counts(text: str) -> Terms:
+    """Hash the words of a text; returns sorted feature ids and their counts."""
+    counts = Counter(_WORD.findall(text.lower()))
+    hashes = np.fromiter(
+        (zlib.crc32(word.encode("utf-8")) for word in counts),
+        dtype=np.int64,
+        count=len(counts),
+    )
+    values = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+    # 不同单词哈希冲突时合并计数
+    features, inverse = np.unique(hashes, return_inverse=True)
+    return features, np.bincount(inverse, weights=values)
+
+
+class VectorModel:
+    """TF-IDF weighting over hashed words, reduced to a few dimensions.
+
+    ``components`` holds the top right singular vectors of the TF-IDF
+    matrix of the papers the model was fitted on, so projecting a paper is
+    one small sparse-dense product and new papers can be folded in without
+    refitting.
+    """
+
+    def __init__(self, features: np.ndarray, idf: np.ndarray, components: np.ndarray):
+        self.features = features
+        self.idf = idf
+        self.components = components
+
+    @property
+    def dimensions(self) -> int:
+        return self.components.shape[1]
+
+    def weights(self, terms: Terms) -> Tuple[np.ndarray, np.ndarray]:
+        """L2-normalized TF-IDF weights of a paper over the model's features."""
+        hashes, counts = terms
+        columns = np.searchsorted(self.features, hashes)
+        known = columns < len(self.features)
+        known[known] = self.features[columns[known]] == hashes[known]
+        columns = columns[known]
+        values = (1.0 + np.log(counts[known])) * self.idf[columns]
+        norm = np.linalg.norm(values)
+        return columns, (values / norm if norm else values).astype(np.float32)
+
+    def project(self, terms: Terms) -> np.ndarray:
+        """Unit-length document vector of a paper."""
+        columns, values = self.weights(terms)
+        vector = values @ self.components[columns]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @classmethod
+    def fit(
+        cls, documents: List[Terms], dimensions: int, max_features: int
+    ) -> "VectorModel":
+        """Fit TF-IDF weights and a truncated SVD with a randomized solver."""
+        count = len(documents)
+        features, df = np.unique(
+            np.concatenate([hashes for hashes, _ in documents]), return_counts=True
+        )
+        if count > 2 and np.count_nonzero(df >= 2) >= dimensions:
+            # 只出现在一篇论文中的词对相似度没有贡献
+            features, df = features[df >= 2], df[df >= 2]
+        if len(features) > max_features:
+            keep = np.sort(np.argsort(-df, kind="stable")[:max_features])
+            features, df = features[keep], df[keep]
+        idf = (np.log((1.0 + count) / (1.0 + df)) + 1.0).astype(np.float32)
+
+        model = cls(features, idf, np.zeros((len(features), 0), dtype=np.float32))
+        rows = [model.weights(terms) for terms in documents]
+        model.components = _randomized_svd(rows, len(features), dimensions)
+        return model
+
+    def save(self, path: Path) -> None:
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                features=self.features,
+                idf=self.idf,
+                components=self.components,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["VectorModel"]:
+        try:
+            with np.load(path) as data:
+                return cls(data["features"], data["idf"], data["components"])
+        except (FileNotFoundError, OSError, KeyError, ValueError):
+            return None
+
+
+def _times(rows: List[Tuple[np.ndarray, np.ndarray]], dense: np.ndarray) -> np.ndarray:
+    """``X @ dense`` for a sparse matrix ``X`` given as (columns, values) rows."""
+    out = np.zeros((len(rows), dense.shape[1]), dtype=np.float32)
+    for i, (columns, values) in enumerate(rows):
+        out[i] = values @ dense[columns]
+    return out
+
+
+def _transpose_times(
+    rows: List[Tuple[np.ndarray, np.ndarray]], width: int, dense: np.ndarray
+) -> np.ndarray:
+    """``X.T @ dense`` for a sparse matrix ``X`` given as (columns, values) rows."""
+    out = np.zeros((width, dense.shape[1]), dtype=np.float32)
+    for i, (columns, values) in enumerate(rows):
+        # 同一行内的列互不重复，可以直接累加
+        out[columns] += values[:, None] * dense[i]
+    return out
+
+
+def _randomized_svd(
+    rows: List[Tuple[np.ndarray, np.ndarray]],
+    width: int,
+    dimensions: int,
+    oversample: int = 10,
+    iterations: int = 2,
+) -> np.ndarray:
+    """Top right singular vectors (as columns) of a sparse matrix.
+
+    Follows Halko, Martinsson and Tropp: the range of ``X`` is sampled with
+    a Gaussian test matrix, sharpened with power iterations, and the SVD is
+    taken of the small projected matrix.
+    """
+    rank = min(dimensions, len(rows), width)
+    sample = min(rank + oversample, len(rows), width)
+    rng = np.random.default_rng(0)
+    omega = rng.standard_normal((width, sample)).astype(np.float32)
+    q, _ = np.linalg.qr(_times(rows, omega))
+    for _ in range(iterations):
+        z, _ = np.linalg.qr(_transpose_times(rows, width, q))
+        q, _ = np.linalg.qr(_times(rows, z))
+    b = _transpose_times(rows, width, q).T
+    _, _, vt = np.linalg.svd(b, full_matrices=False)
+    return np.ascontiguousarray(vt[:rank].T, dtype=np.float32)
+
+
+class VectorIndex:
+    """Memory-mapped float32 document vectors of stored papers.
+
+    Vectors live in one ``rows x dimensions`` file that is mapped rather than
+    loaded, and similarity search scans it in blocks, so memory use stays
+    flat as the library grows. New papers are projected with the current
+    model as they are converted. The model is refitted (and every vector
+    recomputed) whenever the library has doubled since the last fit, until
+    the fit has seen ``fit_sample`` papers; after that the model is fixed.
+    """
+
+    def __init__(
+        self, directory: Path, dimensions: int, max_features: int, fit_sample: int
+    ):
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.dimensions = dimensions
+        self.max_features = max_features
+        self.fit_sample = fit_sample
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(directory / "vectors.db"), check_same_thread=False
+        )
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS vector_papers (
+                    paper_id TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    title TEXT,
+                    row INTEGER UNIQUE,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL
+                )
+                """)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS vector_free_rows (row INTEGER PRIMARY KEY)"
+            )
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS vector_meta (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+                """)
+        self._model = VectorModel.load(self._model_path)
+        self._vectors: Optional[np.memmap] = None
+        if self._model is not None and self._vectors_path.exists():
+            self._vectors = self._map(self._model.dimensions)
+        else:
+            # 模型或向量文件缺失时，下次添加论文会重新拟合
+            self._model = None
+            with self._conn:
+                self._set_meta("fitted", 0)
+
+    @property
+    def _model_path(self) -> Path:
+        return self.directory / "model.npz"
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.directory / "vectors.f32"
+
+    def _meta(self, key: str, default: int = 0) -> int:
+        row = self._conn.execute(
+            "SELECT value FROM vector_meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key: str, value: int) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO vector_meta (key, value) VALUES (?, ?)",
+            (key, value),
+        )
+
+    def _map(self, dimensions: int) -> np.memmap:
+        rows = os.path.getsize(self._vectors_path) // (4 * dimensions)
+        return np.memmap(
+            self._vectors_path, dtype=np.float32, mode="r+", shape=(rows, dimensions)
+        )
+
+    def _allocate_row(self) -> int:
+        row = self._conn.execute("SELECT MIN(row) FROM vector_free_rows").fetchone()[0]
+        if row is not None:
+            self._conn.execute("DELETE FROM vector_free_rows WHERE row = ?", (row,))
+            return row
+        row = self._meta("rows")
+        self._set_meta("rows", row + 1)
+        if row >= len(self._vectors):
+            # 容量不足时按倍数扩展文件并重新映射
+            dimensions = self._vectors.shape[1]
+            self._vectors.flush()
+            self._vectors = None
+            with open(self._vectors_path, "r+b") as f:
+                f.truncate(max(1024, 2 * row) * 4 * dimensions)
+            self._vectors = self._map(dimensions)
+        return row
+
+    def add(
+        self,
+        paper_id: str,
+        md_path: Path,
+        title: Optional[str] = None,
+        refit: bool = True,
+    ) -> None:
+        """Compute (or recompute) the vector of a stored paper.
+
+        Unless ``refit`` is false, the model is refitted if the library has
+        grown enough since the last fit.
+        """
+        stat = md_path.stat()
+        terms = term_counts(md_path.read_text(encoding="utf-8"))
+        with self._lock, self._conn:
+            self._remove(paper_id)
+            row = None
+            if self._model is not None:
+                row = self._allocate_row()
+                self._vectors[row] = self._model.project(terms)
+            self._conn.execute(
+                "INSERT INTO vector_papers "
+                "(paper_id, path, title, row, mtime_ns, size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (paper_id, str(md_path), title, row, stat.st_mtime_ns, stat.st_size),
+            )
+        if refit:
+            self._refit_if_grown()
+
+    def _remove(self, paper_id: str) -> None:
+        row = self._conn.execute(
+            "SELECT row FROM vector_papers WHERE paper_id = ?", (paper_id,)
+        ).fetchone()
+        if row is None:
+            return
+        if row[0] is not None and self._vectors is not None:
+            self._vectors[row[0]] = 0.0
+            self._conn.execute("INSERT INTO vector_free_rows (row) VALUES (?)", row)
+        self._conn.execute("DELETE FROM vector_papers WHERE paper_id = ?", (paper_id,))
+
+    def remove(self, paper_id: str) -> None:
+        """Drop a paper's vector."""
+        with self._lock, self._conn:
+            self._remove(paper_id)
+
+    def sync(self, papers: List[Tuple[str, Path, Optional[str]]]) -> int:
+        """Add new or changed papers and drop ones no longer stored.
+
+        ``papers`` lists ``(paper_id, markdown path, title)`` for the whole
+        library. Returns the number of papers (re-)vectorized.
+        """
+        with self._lock:
+            known = {
+                paper_id: (mtime_ns, size)
+                for paper_id, mtime_ns, size in self._conn.execute(
+                    "SELECT paper_id, mtime_ns, size FROM vector_papers"
+                )
+            }
+        added = 0
+        for paper_id, md_path, title in papers:
+            try:
+                stat = md_path.stat()
+            except FileNotFoundError:
+                continue
+            if known.get(paper_id) != (stat.st_mtime_ns, stat.st_size):
+                self.add(paper_id, md_path, title, refit=False)
+                added += 1
+        stored = {paper_id for paper_id, _, _ in papers}
+        for paper_id in known.keys() - stored:
+            self.remove(paper_id)
+        if added:
+            logger.info(f"Vectorized {added} papers for similarity search")
+            self._refit_if_grown()
+        return added
+
+    def _refit_if_grown(self) -> None:
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM vector_papers"
+            ).fetchone()
+            fitted = self._meta("fitted")
+            if count < 2 or fitted >= self.fit_sample or count < 2 * fitted:
+                return
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        """Refit the model on (a sample of) the library and recompute all vectors."""
+        with self._lock:
+            papers = self._conn.execute(
+                "SELECT paper_id, path FROM vector_papers ORDER BY paper_id"
+            ).fetchall()
+            if not papers:
+                return
+            rng = np.random.default_rng(0)
+            sample = sorted(
+                rng.choice(len(papers), min(len(papers), self.fit_sample), False)
+            )
+            terms: Dict[str, Terms] = {}
+            for i in sample:
+                paper_id, path = papers[i]
+                terms[paper_id] = term_counts(Path(path).read_text(encoding="utf-8"))
+            model = VectorModel.fit(
+                list(terms.values()), self.dimensions, self.max_features
+            )
+
+            # 新向量写入临时文件，完成后再替换，失败时旧索引仍可用
+            tmp_path = self._vectors_path.with_suffix(".tmp")
+            vectors = np.memmap(
+                tmp_path,
+                dtype=np.float32,
+                mode="w+",
+                shape=(max(1024, len(papers)), model.dimensions),
+            )
+            for row, (paper_id, path) in enumerate(papers):
+                paper_terms = terms.pop(paper_id, None)
+                if paper_terms is None:
+                    paper_terms = term_counts(Path(path).read_text(encoding="utf-8"))
+                vectors[row] = model.project(paper_terms)
+            vectors.flush()
+            del vectors
+
+            with self._conn:
+                self._vectors = None
+                os.replace(tmp_path, self._vectors_path)
+                model.save(self._model_path)
+                self._model = model
+                self._vectors = self._map(model.dimensions)
+                self._conn.execute("UPDATE vector_papers SET row = NULL")
+                self._conn.executemany(
+                    "UPDATE vector_papers SET row = ? WHERE paper_id = ?",
+                    [(row, paper_id) for row, (paper_id, _) in enumerate(papers)],
+                )
+                self._conn.execute("DELETE FROM vector_free_rows")
+                self._set_meta("rows", len(papers))
+                self._set_meta("fitted", len(sample))
+            logger.info(
+                f"Fitted {model.dimensions}-dimensional paper vectors on "
+                f"{len(sample)} of {len(papers)} papers"
+            )
+
+    def similar(self, paper_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Find the papers whose vectors are closest (by cosine) to a paper's.
+
+        Raises ``KeyError`` if the paper has not been vectorized.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT row FROM vector_papers WHERE paper_id = ?", (paper_id,)
+            ).fetchone()
+            if row is None or row[0] is None or self._vectors is None:
+                raise KeyError(paper_id)
+            vectors = self._vectors
+            rows = self._meta("rows")
+            query = np.array(vectors[row[0]])
+
+            # 逐块计算余弦相似度，只保留每块的前limit+1个候选
+            candidates: List[Tuple[float, int]] = []
+            for start in range(0, rows, _SEARCH_BLOCK):
+                scores = vectors[start : min(rows, start + _SEARCH_BLOCK)] @ query
+                keep = min(limit + 1, len(scores))
+                top = np.argpartition(-scores, keep - 1)[:keep]
+                candidates.extend((float(scores[i]), start + int(i)) for i in top)
+            candidates.sort(reverse=True)
+
+            by_row = {
+                r: (pid, title)
+                for pid, title, r in self._conn.execute(
+                    "SELECT paper_id, title, row FROM vector_papers WHERE row IN "
+                    f"({', '.join('?' for _ in candidates)})",
+                    [r for _, r in candidates],
+                )
+            }
+        results = []
+        for score, r in candidates:
+            if r == row[0] or r not in by_row:
+                continue
+            other_id, title = by_row[r]
+            results.append({"id": other_id, "title": title, "score": score})
+            if len(results) >= limit:
+                break
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        """Report the number of vectorized papers and the model size."""
+        with self._lock:
+            (papers,) = self._conn.execute(
+                "SELECT COUNT(*) FROM vector_papers WHERE row IS NOT NULL"
+            ).fetchone()
+            return {
+                "papers": papers,
+                "dimensions": self._model.dimensions if self._model else 0,
+                "fitted": self._meta("fitted"),
+            }
+
+
+_indexes: Dict[Path, VectorIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_vector_index() -> VectorIndex:
+    """Get the paper vector index for the current storage path.
+
+    The first use in a process syncs the index with the paper catalog.
+    """
+    settings = get_settings()
+    directory = settings.INDEX_PATH / "vectors"
+    # 多个线程可能同时首次使用，重复构建会同时写入vectors.tmp
+    with _indexes_lock:
+        if directory not in _indexes:
+            index = VectorIndex(
+                directory,
+                settings.VECTOR_DIMENSIONS,
+                settings.VECTOR_MAX_FEATURES,
+                settings.VECTOR_FIT_SAMPLE,
+            )
+            index.sync(get_catalog().records())
+            _indexes[directory] = index
+    return _indexes[directory]
@@ -5,6 +5,16 @@ from .download import download_tool, handle_download
 from .list_papers import list_tool, handle_list_papers
 from .read_paper import read_tool, handle_read_paper
 from .list_tools import list_tools_tool, handle_list_tools
+from .search_library import search_library_tool, handle_search_library
+from .search_passages import search_passages_tool, handle_search_passages
+from .similar_papers import similar_papers_tool, handle_similar_papers
+from .find_duplicates import find_duplicates_tool, handle_find_duplicates
+from .citations import (
+    get_references_tool,
+    get_citing_papers_tool,
+    handle_get_references,
+    handle_get_citing_papers,
+)
 
 
 __all__ = [
@@ -13,9 +23,21 @@ __all__ = [
     "read_tool",
     "list_tool",
     "list_tools_tool",
+    "search_library_tool",
+    "search_passages_tool",
+    "similar_papers_tool",
+    "get_references_tool",
+    "get_citing_papers_tool",
+    "find_duplicates_tool",
     "handle_search",
     "handle_download",
     "handle_read_paper",
     "handle_list_papers",
     "handle_list_tools",
+    "handle_search_library",
+    "handle_search_passages",
+    "handle_similar_papers",
+    "handle_get_references",
+    "handle_get_citing_papers",
+    "handle_find_duplicates",
 ]
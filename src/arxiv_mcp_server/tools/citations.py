@@ -0,0 +1,126 @@
+"""Citation graph lookups over the local library for the arXiv MCP server."""
+
+import asyncio
+import json
+import logging
+from typing import Dict, Any, List, Optional
+import mcp.types as types
+from ..arxiv_client import base_id
+from ..storage import get_catalog, get_citation_graph, get_metadata_index
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+_paper_id_schema = {
+    "type": "object",
+    "properties": {
+        "paper_id": {
+            "type": "string",
+            "description": "The arXiv ID of the paper (or a DOI for get_citing_papers)",
+        },
+    },
+    "required": ["paper_id"],
+}
+
+get_references_tool = types.Tool(
+    name="get_references",
+    description=(
+        "List the arXiv papers and DOIs cited in the reference section of a "
+        "downloaded paper, marking which ones are already in the local "
+        "library. Answered from the local citation index without arXiv calls."
+    ),
+    inputSchema=_paper_id_schema,
+)
+
+get_citing_papers_tool = types.Tool(
+    name="get_citing_papers",
+    description=(
+        "List the downloaded papers in the local library that cite a given "
+        "arXiv paper or DOI. Answered from the local citation index without "
+        "arXiv calls; papers outside the library are not known."
+    ),
+    inputSchema=_paper_id_schema,
+)
+
+
+def _titles() -> Dict[str, Optional[str]]:
+    """Titles of stored papers by arXiv ID without version."""
+    return {base_id(paper_id): title for paper_id, _, title in get_catalog().records()}
+
+
+def _title(paper_id: str, stored: Dict[str, Optional[str]]) -> Optional[str]:
+    if paper_id in stored:
+        return stored[paper_id]
+    if paper_id.startswith("doi:"):
+        return None
+    # 曾经见过的论文可以从本地元数据目录取标题
+    metadata = get_metadata_index().get(paper_id)
+    return metadata.get("title") if metadata else None
+
+
+def _error(message: str) -> List[types.TextContent]:
+    return [
+        types.TextContent(
+            type="text", text=json.dumps({"status": "error", "message": message})
+        )
+    ]
+
+
+def _lookup_references(paper_id: str) -> Optional[Dict[str, Any]]:
+    graph = get_citation_graph()
+    if not graph.has(paper_id):
+        return None
+    stored = _titles()
+    references = graph.references(paper_id)
+    for reference in references:
+        reference["title"] = _title(reference["id"], stored)
+    return {
+        "paper_id": paper_id,
+        "total_results": len(references),
+        "references": references,
+    }
+
+
+def _lookup_citing(paper_id: str) -> Dict[str, Any]:
+    stored = _titles()
+    citing = [
+        {"id": citing_id, "title": stored.get(citing_id)}
+        for citing_id in get_citation_graph().citing(paper_id)
+    ]
+    return {"paper_id": paper_id, "total_results": len(citing), "papers": citing}
+
+
+async def handle_get_references(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Handle requests for the references of a stored paper."""
+    try:
+        paper_id = arguments["paper_id"]
+        # 首次使用会与目录同步并抽取参考文献，放到线程中执行
+        response = await asyncio.to_thread(_lookup_references, paper_id)
+        if response is None:
+            return _error(
+                f"Paper {paper_id} not found in storage. "
+                "You may need to download it first using download_paper."
+            )
+        return [
+            types.TextContent(
+                type="text", text=json.dumps(response, ensure_ascii=False)
+            )
+        ]
+    except Exception as e:
+        logger.error(f"Reference lookup error: {str(e)}")
+        return _error(f"Error: {str(e)}")
+
+
+async def handle_get_citing_papers(
+    arguments: Dict[str, Any],
+) -> List[types.TextContent]:
+    """Handle requests for the stored papers citing a paper."""
+    try:
+        response = await asyncio.to_thread(_lookup_citing, arguments["paper_id"])
+        return [
+            types.TextContent(
+                type="text", text=json.dumps(response, ensure_ascii=False)
+            )
+        ]
+    except Exception as e:
+        logger.error(f"Citing papers lookup error: {str(e)}")
+        return _error(f"Error: {str(e)}")
@@ -1,15 +1,26 @@
 """Download functionality for the arXiv MCP server."""
 
-import arxiv
 import json
 import asyncio
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
+import arxiv
 import mcp.types as types
+from .. import arxiv_client, conversion
 from ..config import get_settings
-import pymupdf4llm
+from ..jobs import QueueFullError, WorkQueue
+from ..storage import (
+    extract_citations,
+    get_catalog,
+    get_minhash_index,
+    index_paper,
+    get_metadata_index,
+    metadata_from_result,
+    result_from_metadata,
+    save_metadata,
+)
 import logging
 import re
 
@@ -25,11 +36,30 @@ class ConversionStatus:
     """Track the status of a PDF to Markdown conversion."""
 
     paper_id: str
-    status: str  # 'downloading', 'converting', 'success', 'error'
+    status: str  # 'queued', 'downloading', 'converting', 'success', 'error', 'duplicate'
     started_at: datetime
     completed_at: Optional[datetime] = None
     error: Optional[str] = None
     paper_title: Optional[str] = None  # 添加论文标题字段
+    stage: Optional[str] = None  # 排队中的阶段: 'download' 或 'convert'
+    priority: int = 1
+    duplicate_of: Optional[str] = None  # 近重复检测命中的已存储论文
+
+
+@dataclass
+class DownloadJob:
+    """A paper moving through the download and conversion queues."""
+
+    paper_id: str
+    paper: arxiv.Result
+    paper_title: Optional[str]
+    pdf_path: Path
+    priority: int = 1
+    dedup: bool = False
+
+
+# 下载优先级，数值越小越先处理
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
 
 
 def sanitize_filename(title: str) -> str:
@@ -54,26 +84,35 @@ def get_paper_path(
     # 如果提供了论文标题，则使用标题作为文件名，否则使用论文ID
     if paper_title:
         filename = sanitize_filename(paper_title)
-        return storage_path / f"{filename}{suffix}"
+        path = storage_path / f"{filename}{suffix}"
+        # 同名论文（如同一论文的另一个版本）已存在时在文件名后加上ID
+        owner = get_catalog().owner(path.with_suffix(".md"))
+        if owner is not None and owner != paper_id:
+            path = path.with_name(f"{filename}_{sanitize_filename(paper_id)}{suffix}")
+        return path
     else:
         return storage_path / f"{paper_id}{suffix}"
 
 
-def convert_pdf_to_markdown(
+async def convert_pdf_to_markdown(
     paper_id: str, 
     paper_title: Optional[str], 
     pdf_path: Path
 ) -> None:
-    """Convert PDF to Markdown in a separate thread."""
+    """Convert PDF to Markdown in a conversion worker process."""
     try:
         logger.info(f"Starting conversion for {paper_id}")
-        markdown = pymupdf4llm.to_markdown(pdf_path, show_progress=False)
-        
         # 使用论文标题作为文件名（如果可用）
-        md_path = get_paper_path(paper_id, paper_title, ".md")
+        md_path = await asyncio.to_thread(get_paper_path, paper_id, paper_title, ".md")
 
-        with open(md_path, "w", encoding="utf-8") as f:
-            f.write(markdown)
+        offsets = await conversion.convert_to_file(pdf_path, md_path)
+        # 登记到目录并更新阅读/检索索引
+        await asyncio.to_thread(index_paper, paper_id, md_path, paper_title, offsets)
+        try:
+            # 转换后阶段：抽取参考文献加入引用图，失败不影响转换结果
+            await asyncio.to_thread(extract_citations, paper_id, md_path)
+        except Exception as e:
+            logger.warning(f"Reference extraction failed for {paper_id}: {str(e)}")
 
         status = conversion_statuses.get(paper_id)
         if status:
@@ -96,6 +135,188 @@ def convert_pdf_to_markdown(
             pdf_path.unlink()
 
 
+async def _run_download(job: DownloadJob) -> None:
+    """Download worker: fetch the PDF, then hand it to the conversion queue."""
+    status = conversion_statuses.get(job.paper_id)
+    if status is None:
+        return
+    status.status = "downloading"
+    status.stage = None
+    try:
+        await arxiv_client.download_pdf(job.paper, job.pdf_path)
+    except Exception as e:
+        logger.error(f"Download failed for {job.paper_id}: {str(e)}")
+        status.status = "error"
+        status.completed_at = datetime.now()
+        status.error = str(e)
+        if job.pdf_path.exists():
+            job.pdf_path.unlink()
+        return
+
+    status.status = "queued"
+    status.stage = "convert"
+    # 转换队列已满时在此等待，从而限制已下载但未转换的PDF数量
+    await get_job_queues()[1].put(job.paper_id, job, job.priority)
+
+
+async def _run_conversion(job: DownloadJob) -> None:
+    """Conversion worker: turn a downloaded PDF into markdown."""
+    status = conversion_statuses.get(job.paper_id)
+    if status is not None:
+        status.status = "converting"
+        status.stage = None
+    if job.dedup and await _skip_duplicate(job, status):
+        return
+    await convert_pdf_to_markdown(job.paper_id, job.paper_title, job.pdf_path)
+
+
+def _near_duplicates(paper_id: str, text: str) -> List[Dict[str, Any]]:
+    """Stored papers whose MinHash signature is close to ``text``."""
+    index = get_minhash_index()
+    return index.query(
+        index.hasher.signature(text), get_settings().DEDUP_THRESHOLD, paper_id
+    )
+
+
+async def _skip_duplicate(job: DownloadJob, status: Optional[ConversionStatus]) -> bool:
+    """Drop a downloaded PDF that nearly duplicates a stored paper.
+
+    The PDF's plain text is compared with the MinHash signatures of the
+    library, which takes a fraction of the time of a full conversion.
+    """
+    try:
+        text = await conversion.extract_text(job.pdf_path)
+        # 首次使用索引会对整个论文库计算签名，与查询一起放到线程中执行
+        matches = await asyncio.to_thread(_near_duplicates, job.paper_id, text)
+    except Exception as e:
+        # 检测失败时照常转换
+        logger.warning(f"Duplicate check failed for {job.paper_id}: {str(e)}")
+        return False
+    if not matches:
+        return False
+    duplicate = matches[0]
+    logger.info(
+        f"Skipping conversion of {job.paper_id}: near-duplicate of "
+        f"{duplicate['id']} (similarity {duplicate['similarity']:.2f})"
+    )
+    if status is not None:
+        status.status = "duplicate"
+        status.duplicate_of = duplicate["id"]
+        status.completed_at = datetime.now()
+    if job.pdf_path.exists():
+        job.pdf_path.unlink()
+    return True
+
+
+_job_queues: Optional[Tuple[WorkQueue, WorkQueue]] = None
+
+
+def get_job_queues() -> Tuple[WorkQueue, WorkQueue]:
+    """Get the shared ``(download, convert)`` work queues."""
+    global _job_queues
+    if _job_queues is None:
+        _job_queues = (
+            WorkQueue(
+                "download",
+                _run_download,
+                workers=settings.DOWNLOAD_WORKERS,
+                maxsize=settings.DOWNLOAD_QUEUE_SIZE,
+            ),
+            WorkQueue(
+                "convert",
+                _run_conversion,
+                workers=settings.CONVERT_WORKERS,
+                maxsize=settings.CONVERT_QUEUE_SIZE,
+            ),
+        )
+    return _job_queues
+
+
+def reset_job_queues() -> None:
+    """Stop the queue workers and drop the queues (used by tests)."""
+    global _job_queues
+    if _job_queues is not None:
+        for queue in _job_queues:
+            queue.close()
+    _job_queues = None
+
+
+def _queue_position(status: ConversionStatus) -> Optional[int]:
+    """Position of a queued paper within the queue for its current stage."""
+    if status.status != "queued":
+        return None
+    download_queue, convert_queue = get_job_queues()
+    queue = convert_queue if status.stage == "convert" else download_queue
+    return queue.position(status.paper_id)
+
+
+def _queue_full(queue: WorkQueue) -> List[types.TextContent]:
+    """Build the response for a download rejected because the queue is full."""
+    return [
+        types.TextContent(
+            type="text",
+            text=json.dumps(
+                {
+                    "status": "queue_full",
+                    "message": (
+                        f"Download queue is full ({queue.maxsize} papers "
+                        "waiting); try again later"
+                    ),
+                    "queue": queue.stats(),
+                }
+            ),
+        )
+    ]
+
+
+def pending_pdf_path(paper_id: str) -> Optional[Path]:
+    """Path of a downloaded PDF still waiting for (or in) conversion."""
+    status = conversion_statuses.get(paper_id)
+    if status is None or status.status in (
+        "downloading",
+        "success",
+        "error",
+        "duplicate",
+    ):
+        return None
+    if status.status == "queued" and status.stage == "download":
+        return None
+    pdf_path = get_paper_path(paper_id, status.paper_title, ".pdf")
+    return pdf_path if pdf_path.exists() else None
+
+
+def find_paper(paper_id: str) -> Optional[Path]:
+    """Resolve a paper ID to its stored markdown file, if it is stored."""
+    return get_catalog().find(paper_id)
+
+
+def _catalogued_metadata(paper_id: str) -> Optional[Dict[str, Any]]:
+    """Metadata for a paper from the local catalog, if it has been seen."""
+    return get_metadata_index().find(paper_id)
+
+
+def _not_found(paper_id: str) -> List[types.TextContent]:
+    """Build the response for a paper that arXiv does not know about."""
+    # 清理可能已创建的状态和文件
+    if paper_id in conversion_statuses:
+        del conversion_statuses[paper_id]
+    # 清理可能已创建的PDF文件
+    pdf_path = get_paper_path(paper_id, None, ".pdf")
+    if pdf_path.exists():
+        pdf_path.unlink()
+    return [
+        types.TextContent(
+            type="text",
+            text=json.dumps(
+                {
+                    "status": "error",
+                    "message": f"Paper {paper_id} not found on arXiv",
+                }
+            ),
+        )
+    ]
+
+
 download_tool = types.Tool(
     name="download_paper",
     description="Download a paper and create a resource for it",
@@ -114,6 +335,22 @@ download_tool = types.Tool(
                 ),
                 "default": False,
             },
+            "priority": {
+                "type": "string",
+                "enum": list(PRIORITIES),
+                "description": (
+                    "Queue priority relative to other pending downloads"
+                ),
+                "default": "normal",
+            },
+            "dedup": {
+                "type": "boolean",
+                "description": (
+                    "If true, skip conversion when a near-identical paper "
+                    "(e.g. another version) is already stored"
+                ),
+                "default": False,
+            },
         },
         "required": ["paper_id"],
     },
@@ -126,15 +363,17 @@ async def handle_download(
     """Handle paper download and conversion requests."""
     paper_id = arguments["paper_id"]
     check_status = arguments.get("check_status", False)
+    priority = PRIORITIES.get(arguments.get("priority", "normal"), 1)
+    dedup = arguments.get("dedup", False)
     
     try:
         # If only checking status
         if check_status:
             status = conversion_statuses.get(paper_id)
             if not status:
-                # 尝试使用论文ID查找文件
-                md_path = get_paper_path(paper_id, None, ".md")
-                if md_path.exists():
+                # 通过目录索引按论文ID查找文件（包括以标题命名的文件）
+                md_path = await asyncio.to_thread(find_paper, paper_id)
+                if md_path is not None:
                     return [
                         types.TextContent(
                             type="text",
@@ -163,7 +402,9 @@ async def handle_download(
                 ]
 
             # 使用存储的论文标题获取文件路径
-            md_path = get_paper_path(paper_id, status.paper_title, ".md")
+            md_path = await asyncio.to_thread(
+                get_paper_path, paper_id, status.paper_title, ".md"
+            )
             resource_uri = (
                 f"file://{md_path}" if status.status == "success" else None
             )
@@ -181,15 +422,18 @@ async def handle_download(
                             ),
                             "error": status.error,
                             "message": f"Paper conversion {status.status}",
+                            "stage": status.stage,
+                            "queue_position": _queue_position(status),
+                            "duplicate_of": status.duplicate_of,
                             "resource_uri": resource_uri,
                         }
                     ),
                 )
             ]
 
-        # Check if paper is already converted (使用论文ID检查)
-        md_path = get_paper_path(paper_id, None, ".md")
-        if md_path.exists():
+        # Check if paper is already converted (通过目录索引按论文ID检查)
+        md_path = await asyncio.to_thread(find_paper, paper_id)
+        if md_path is not None:
             return [
                 types.TextContent(
                     type="text",
@@ -203,11 +447,13 @@ async def handle_download(
                 )
             ]
 
-        # Check if already in progress
-        if paper_id in conversion_statuses:
-            status = conversion_statuses[paper_id]
+        # Check if already in progress (失败或被判为重复的任务允许重新下载)
+        status = conversion_statuses.get(paper_id)
+        if status is not None and status.status not in ("error", "duplicate"):
             # 使用存储的论文标题获取文件路径
-            md_path = get_paper_path(paper_id, status.paper_title, ".md")
+            md_path = await asyncio.to_thread(
+                get_paper_path, paper_id, status.paper_title, ".md"
+            )
             resource_uri = (
                 f"file://{md_path}" if status.status == "success" else None
             )
@@ -219,57 +465,74 @@ async def handle_download(
                             "status": status.status,
                             "message": f"Paper conversion {status.status}",
                             "started_at": status.started_at.isoformat(),
+                            "queue_position": _queue_position(status),
                             "resource_uri": resource_uri,
                         }
                     ),
                 )
             ]
 
-        # Start new download and conversion
-        pdf_path = get_paper_path(paper_id, None, ".pdf")
-        client = arxiv.Client()
+        # 队列已满时直接拒绝，避免无谓的元数据请求
+        download_queue = get_job_queues()[0]
+        if download_queue.full():
+            return _queue_full(download_queue)
+
+        # Fetch metadata first (在初始化状态之前执行可能抛出异常的代码)
+        # 本地元数据目录（如搜索结果）已有该论文时不再访问arXiv
+        metadata = await asyncio.to_thread(_catalogued_metadata, paper_id)
+        if metadata is not None:
+            paper = result_from_metadata(metadata)
+        else:
+            paper = await arxiv_client.fetch_paper(paper_id)
+            if paper is None:
+                return _not_found(paper_id)
+
+        # A concurrent call for the same paper may have started while the
+        # (shared) metadata lookup was pending; report its progress instead
+        status = conversion_statuses.get(paper_id)
+        if status is not None and status.status not in ("error", "duplicate"):
+            return await handle_download({"paper_id": paper_id})
 
-        # Download PDF first (在初始化状态之前执行可能抛出异常的代码)
-        paper = next(client.results(arxiv.Search(id_list=[paper_id])))
-        
         # 获取论文标题并清理文件名
         paper_title = paper.title if paper.title else None
-        
+
         # Initialize status only after successful paper retrieval
-        conversion_statuses[paper_id] = ConversionStatus(
-            paper_id=paper_id, 
-            status="downloading", 
+        status = ConversionStatus(
+            paper_id=paper_id,
+            status="queued",
             started_at=datetime.now(),
-            paper_title=paper_title  # 存储论文标题
+            paper_title=paper_title,  # 存储论文标题
+            stage="download",
+            priority=priority,
         )
+        conversion_statuses[paper_id] = status
 
-        # 使用论文标题生成PDF路径
-        if paper_title:
-            pdf_path = get_paper_path(paper_id, paper_title, ".pdf")
-        paper.download_pdf(dirpath=pdf_path.parent, filename=pdf_path.name)
-
-        # Update status and start conversion
-        status = conversion_statuses[paper_id]
-        status.status = "converting"
+        # 使用论文标题生成MD和PDF路径
+        md_path = await asyncio.to_thread(get_paper_path, paper_id, paper_title, ".md")
+        pdf_path = await asyncio.to_thread(
+            get_paper_path, paper_id, paper_title, ".pdf"
+        )
 
-        # Start conversion in thread
-        convert_task = asyncio.to_thread(
-            convert_pdf_to_markdown, 
-            paper_id, 
-            paper_title, 
-            pdf_path
+        # 保存元数据，之后list_papers无需再次访问arXiv
+        await asyncio.to_thread(
+            save_metadata, md_path, metadata_from_result(paper, paper_id)
         )
-        asyncio.create_task(convert_task)
 
-        # 使用论文标题生成MD路径
-        md_path = get_paper_path(paper_id, paper_title, ".md")
+        job = DownloadJob(paper_id, paper, paper_title, pdf_path, priority, dedup)
+        try:
+            position = download_queue.submit(paper_id, job, priority)
+        except QueueFullError:
+            del conversion_statuses[paper_id]
+            return _queue_full(download_queue)
+
         return [
             types.TextContent(
                 type="text",
                 text=json.dumps(
                     {
-                        "status": "converting",
-                        "message": "Paper downloaded, conversion started",
+                        "status": "queued",
+                        "message": "Paper queued for download and conversion",
+                        "queue_position": position,
                         "started_at": status.started_at.isoformat(),
                         "resource_uri": f"file://{md_path}",
                     }
@@ -277,25 +540,6 @@ async def handle_download(
             )
         ]
 
-    except StopIteration:
-        # 清理可能已创建的状态和文件
-        if paper_id in conversion_statuses:
-            del conversion_statuses[paper_id]
-        # 清理可能已创建的PDF文件
-        pdf_path = get_paper_path(paper_id, None, ".pdf")
-        if pdf_path.exists():
-            pdf_path.unlink()
-        return [
-            types.TextContent(
-                type="text",
-                text=json.dumps(
-                    {
-                        "status": "error",
-                        "message": f"Paper {paper_id} not found on arXiv",
-                    }
-                ),
-            )
-        ]
     except Exception as e:
         # 清理可能已创建的状态和文件
         if paper_id in conversion_statuses:
@@ -0,0 +1,149 @@
+"""Near-duplicate and version detection over the local library."""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional
+import mcp.types as types
+from ..arxiv_client import base_id
+from ..config import get_settings
+from ..storage import get_catalog, get_minhash_index
+from ..storage.minhash import similarity
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+find_duplicates_tool = types.Tool(
+    name="find_duplicates",
+    description=(
+        "Find papers in the local library that are stored more than once: "
+        "several versions of the same arXiv paper, or near-identical "
+        "documents such as conference and journal versions, compared by "
+        "MinHash similarity of their text."
+    ),
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "paper_id": {
+                "type": "string",
+                "description": (
+                    "Only report duplicates of this downloaded paper; "
+                    "omit to scan the whole library"
+                ),
+            },
+            "threshold": {
+                "type": "number",
+                "description": (
+                    "Minimum estimated Jaccard similarity (0-1) to report a "
+                    "near-duplicate; defaults to the server's DEDUP_THRESHOLD"
+                ),
+            },
+        },
+        "required": [],
+    },
+)
+
+
+def _relation(first: str, second: str) -> str:
+    return "version" if base_id(first) == base_id(second) else "near_duplicate"
+
+
+def _find_duplicates(paper_id: Optional[str], threshold: float) -> Dict[str, Any]:
+    catalog = get_catalog()
+    records = catalog.records()
+    titles = {stored_id: title for stored_id, _, title in records}
+    index = get_minhash_index()
+
+    if paper_id is not None:
+        # 签名按存储时的ID记录，未带版本号的ID先解析为实际存储的版本
+        paper_id = catalog.stored_id(paper_id)
+        signature = index.signature(paper_id)
+        if signature is None:
+            raise KeyError(paper_id)
+        pairs = {
+            (paper_id, match["id"]): match["similarity"]
+            for match in index.query(signature, threshold, exclude=paper_id)
+        }
+    else:
+        pairs = {
+            tuple(pair["ids"]): pair["similarity"]
+            for pair in index.duplicates(threshold)
+        }
+
+    # 同一论文的不同版本即使内容改动较大也一并报告
+    versions: Dict[str, List[str]] = {}
+    for stored_id, _, _ in records:
+        versions.setdefault(base_id(stored_id), []).append(stored_id)
+    for ids in versions.values():
+        for i, first in enumerate(ids):
+            for second in ids[i + 1 :]:
+                if paper_id is not None and paper_id not in (first, second):
+                    continue
+                if (first, second) in pairs or (second, first) in pairs:
+                    continue
+                if paper_id == second:
+                    first, second = second, first
+                a, b = index.signature(first), index.signature(second)
+                pairs[(first, second)] = (
+                    similarity(a, b) if a is not None and b is not None else None
+                )
+
+    duplicates = [
+        {
+            "papers": [
+                {"id": first, "title": titles.get(first)},
+                {"id": second, "title": titles.get(second)},
+            ],
+            "relation": _relation(first, second),
+            "similarity": score,
+        }
+        for (first, second), score in pairs.items()
+    ]
+    duplicates.sort(key=lambda pair: -(pair["similarity"] or 0.0))
+    return {
+        "threshold": threshold,
+        "total_results": len(duplicates),
+        "duplicates": duplicates,
+    }
+
+
+async def handle_find_duplicates(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Handle duplicate detection over the local library."""
+    try:
+        paper_id = arguments.get("paper_id")
+        threshold = arguments.get("threshold")
+        if threshold is None:
+            threshold = get_settings().DEDUP_THRESHOLD
+        threshold = max(0.0, min(float(threshold), 1.0))
+
+        # 首次使用会与目录同步并计算签名，放到线程中执行
+        try:
+            result = await asyncio.to_thread(_find_duplicates, paper_id, threshold)
+        except KeyError:
+            return [
+                types.TextContent(
+                    type="text",
+                    text=json.dumps(
+                        {
+                            "status": "error",
+                            "message": f"Paper {paper_id} is not in the local "
+                            "library. Download it first.",
+                        }
+                    ),
+                )
+            ]
+
+        return [
+            types.TextContent(
+                type="text",
+                text=json.dumps(result, ensure_ascii=False),
+            )
+        ]
+
+    except Exception as e:
+        logger.error(f"Find duplicates error: {str(e)}")
+        return [
+            types.TextContent(
+                type="text",
+                text=json.dumps({"status": "error", "message": f"Error: {str(e)}"}),
+            )
+        ]
@@ -1,11 +1,12 @@
 """List functionality for the arXiv MCP server."""
 
+import asyncio
 import json
 from pathlib import Path
-import arxiv
 from typing import Dict, Any, List, Optional
 import mcp.types as types
 from ..config import get_settings
+from ..storage import get_catalog, resolve_metadata
 
 settings = get_settings()
 
@@ -14,7 +15,16 @@ list_tool = types.Tool(
     description="List all existing papers available as resources",
     inputSchema={
         "type": "object",
-        "properties": {},
+        "properties": {
+            "refresh": {
+                "type": "boolean",
+                "description": (
+                    "If true, rescan the storage directory and re-fetch "
+                    "metadata from arXiv instead of using the local copy"
+                ),
+                "default": False,
+            },
+        },
         "required": [],
     },
 )
@@ -22,7 +32,16 @@ list_tool = types.Tool(
 
 def list_papers() -> list[str]:
     """List all stored paper IDs."""
-    return [p.stem for p in Path(settings.STORAGE_PATH).glob("*.md")]
+    return [paper_id for paper_id, _ in get_catalog().entries()]
+
+
+def _stored_paths(refresh: bool) -> Dict[str, Path]:
+    """Map stored paper IDs to their markdown files."""
+    catalog = get_catalog()
+    if refresh:
+        # 刷新时也重新核对存储目录中的文件
+        catalog.reconcile()
+    return dict(catalog.entries())
 
 
 async def handle_list_papers(
@@ -30,23 +49,30 @@ async def handle_list_papers(
 ) -> List[types.TextContent]:
     """Handle requests to list all stored papers."""
     try:
-        papers = list_papers()
-
-        client = arxiv.Client()
+        refresh = bool((arguments or {}).get("refresh", False))
+        # 目录查询和核对会扫描存储目录，放到线程中执行
+        paths = await asyncio.to_thread(_stored_paths, refresh)
+        papers = await asyncio.to_thread(list_papers)
 
-        results = client.results(arxiv.Search(id_list=papers))
+        storage_path = Path(settings.STORAGE_PATH)
+        metadata = await resolve_metadata(
+            [(paper, paths.get(paper, storage_path / f"{paper}.md")) for paper in papers],
+            refresh=refresh,
+        )
 
         response_data = {
             "total_papers": len(papers),
             "papers": [
                 {
-                    "title": result.title,
-                    "summary": result.summary,
-                    "authors": [author.name for author in result.authors],
-                    "links": [link.href for link in result.links],
-                    "pdf_url": result.pdf_url,
+                    "id": entry["id"],
+                    "title": entry["title"],
+                    "summary": entry["summary"],
+                    "authors": entry["authors"],
+                    "links": entry["links"],
+                    "pdf_url": entry["pdf_url"],
                 }
-                for result in results
+                for entry in metadata
+                if entry is not None
             ],
         }
 
@@ -21,8 +21,22 @@ async def handle_list_tools(
 ) -> List[types.TextContent]:
     """Handle requests to list all available tools."""
     from . import search_tool, download_tool, list_tool, read_tool, list_tools_tool
+    from . import search_library_tool, search_passages_tool, similar_papers_tool
+    from . import get_references_tool, get_citing_papers_tool, find_duplicates_tool
     
-    tools = [search_tool, download_tool, list_tool, read_tool, list_tools_tool]
+    tools = [
+        search_tool,
+        download_tool,
+        list_tool,
+        read_tool,
+        search_library_tool,
+        search_passages_tool,
+        similar_papers_tool,
+        get_references_tool,
+        get_citing_papers_tool,
+        find_duplicates_tool,
+        list_tools_tool,
+    ]
     
     tool_list = "\n".join([
         f"{tool.name}: {tool.description.split('.')[0]}"
@@ -1,23 +1,93 @@
 """Read functionality for the arXiv MCP server."""
 
+import asyncio
 import json
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 import mcp.types as types
+from .. import conversion
 from ..config import get_settings
-
-settings = get_settings()
+from ..storage import (
+    find_section,
+    get_catalog,
+    get_content_cache,
+    load_page_offsets,
+    load_sections,
+    load_partial_page,
+    read_range,
+    save_partial_page,
+    search_file,
+)
+from .download import find_paper, pending_pdf_path
 
 read_tool = types.Tool(
     name="read_paper",
-    description="Read the full content of a stored paper in markdown format",
+    description=(
+        "Read the content of a stored paper in markdown format. Pass "
+        "start_page/end_page to read only some pages; these are available "
+        "while a downloaded paper is still being converted. Pass "
+        "offset/length to read a large paper in chunks, find to search "
+        "within it, toc=true for its table of contents, or section to read "
+        "one section."
+    ),
     inputSchema={
         "type": "object",
         "properties": {
             "paper_id": {
                 "type": "string",
                 "description": "The arXiv ID of the paper to read",
-            }
+            },
+            "start_page": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "First page to read (1-based)",
+            },
+            "end_page": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Last page to read, inclusive (defaults to start_page)",
+            },
+            "offset": {
+                "type": "integer",
+                "minimum": 0,
+                "description": (
+                    "Byte offset to read from; pass the previous response's "
+                    "next_offset to continue reading"
+                ),
+            },
+            "length": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Maximum number of bytes to return",
+            },
+            "find": {
+                "type": "string",
+                "description": (
+                    "Search the paper for this text and return the byte "
+                    "offset and surrounding snippet of each match"
+                ),
+            },
+            "max_matches": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Maximum number of matches returned by find",
+                "default": 20,
+            },
+            "toc": {
+                "type": "boolean",
+                "description": (
+                    "Return the paper's sections (title, level, byte range, "
+                    "approximate tokens) instead of its content"
+                ),
+                "default": False,
+            },
+            "section": {
+                "type": "string",
+                "description": (
+                    "Title or number of the section to read, e.g. "
+                    "'Introduction' or '4'"
+                ),
+            },
         },
         "required": ["paper_id"],
     },
@@ -26,55 +96,220 @@ read_tool = types.Tool(
 
 def list_papers() -> list[str]:
     """List all stored paper IDs."""
-    return [p.stem for p in Path(settings.STORAGE_PATH).glob("*.md")]
+    return [paper_id for paper_id, _ in get_catalog().entries()]
+
+
+def _error(message: str) -> List[types.TextContent]:
+    return [
+        types.TextContent(
+            type="text",
+            text=json.dumps({"status": "error", "message": message}),
+        )
+    ]
+
+
+def _page_range(start: int, end: Optional[int], count: int) -> Tuple[int, int]:
+    """Validate a 1-based inclusive page range, clamping its end to the paper."""
+    end = start if end is None else end
+    if start < 1 or end < start:
+        raise ValueError(f"Invalid page range {start}-{end}")
+    if start > count:
+        raise ValueError(f"Page {start} is out of range; the paper has {count} pages")
+    return start, min(end, count)
+
+
+def read_stored_pages(
+    md_path: Path, start: int, end: Optional[int]
+) -> Tuple[str, int, int, int]:
+    """Read a page range from a converted paper using its page offsets."""
+    offsets = load_page_offsets(md_path)
+    if offsets is None:
+        raise ValueError(
+            "Page ranges are not available for this paper; "
+            "read it without start_page/end_page"
+        )
+    count = len(offsets) - 1
+    start, end = _page_range(start, end, count)
+    content, _, _, _ = read_range(
+        md_path, offsets[start - 1], offsets[end] - offsets[start - 1]
+    )
+    return content, start, end, count
+
+
+def _read_section(
+    paper_id: str, md_path: Path, name: Optional[str]
+) -> List[types.TextContent]:
+    """Return a paper's table of contents, or one section read by offset."""
+    sections = load_sections(md_path)
+    if name is None:
+        result = {
+            "status": "success",
+            "paper_id": paper_id,
+            "total_size": md_path.stat().st_size,
+            "sections": sections,
+        }
+    else:
+        section = find_section(sections, name)
+        if section is None:
+            return _error(
+                f"Section '{name}' not found in paper {paper_id}; "
+                "use toc=true to list its sections"
+            )
+        content, _, _, _ = read_range(md_path, section["offset"], section["length"])
+        result = {"status": "success", "paper_id": paper_id, **section}
+        result["content"] = content
+    return [types.TextContent(type="text", text=json.dumps(result))]
+
+
+async def convert_pending_pages(
+    paper_id: str, pdf_path: Path, start: int, end: Optional[int]
+) -> Tuple[str, int, int, int]:
+    """Convert a page range of a paper whose full conversion is not done yet.
+
+    Converted pages are kept, so later reads of the same pages are served
+    without converting them again.
+    """
+    count = await conversion.count_pages(pdf_path)
+    start, end = _page_range(start, end, count)
+    pages = {page: load_partial_page(paper_id, page) for page in range(start, end + 1)}
+    missing = [page for page, markdown in pages.items() if markdown is None]
+    if missing:
+        converted = await conversion.convert_page_range(
+            pdf_path, [page - 1 for page in missing]
+        )
+        for page, markdown in zip(missing, converted):
+            save_partial_page(paper_id, page, markdown)
+            pages[page] = markdown
+    return "".join(pages.values()), start, end, count
+
+
+async def _read_pages(
+    paper_id: str, start: int, end: Optional[int]
+) -> List[types.TextContent]:
+    """Read a page range from the converted paper, or from its pending PDF."""
+    partial = False
+    paper_path = await asyncio.to_thread(find_paper, paper_id)
+    pdf_path = (
+        await asyncio.to_thread(pending_pdf_path, paper_id)
+        if paper_path is None
+        else None
+    )
+    if pdf_path is not None:
+        try:
+            content, start, end, count = await convert_pending_pages(
+                paper_id, pdf_path, start, end
+            )
+            partial = True
+        except FileNotFoundError:
+            # 完整转换恰好在此期间完成并删除了PDF
+            paper_path = await asyncio.to_thread(find_paper, paper_id)
+            if paper_path is None:
+                raise
+    if not partial:
+        if paper_path is None:
+            return _error(
+                f"Paper {paper_id} not found in storage. You may need to download it first using download_paper."
+            )
+        content, start, end, count = read_stored_pages(paper_path, start, end)
+
+    return [
+        types.TextContent(
+            type="text",
+            text=json.dumps(
+                {
+                    "status": "success",
+                    "paper_id": paper_id,
+                    "start_page": start,
+                    "end_page": end,
+                    "page_count": count,
+                    "partial": partial,
+                    "content": content,
+                }
+            ),
+        )
+    ]
 
 
 async def handle_read_paper(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Handle requests to read a paper's content."""
     try:
-        paper_ids = list_papers()
         paper_id = arguments["paper_id"]
+        start_page = arguments.get("start_page")
+        end_page = arguments.get("end_page")
+        if start_page is not None or end_page is not None:
+            return await _read_pages(paper_id, start_page or 1, end_page)
+        offset = arguments.get("offset")
+        length = arguments.get("length")
+
+        paper_path = await asyncio.to_thread(find_paper, paper_id)
         # Check if paper exists
-        if paper_id not in paper_ids:
+        if paper_path is None:
+            return _error(
+                f"Paper {paper_id} not found in storage. You may need to download it first using download_paper."
+            )
+
+        if arguments.get("find"):
+            query = arguments["find"]
+            matches, total = search_file(
+                paper_path, query, max_matches=arguments.get("max_matches", 20)
+            )
             return [
                 types.TextContent(
                     type="text",
                     text=json.dumps(
                         {
-                            "status": "error",
-                            "message": f"Paper {paper_id} not found in storage. You may need to download it first using download_paper.",
+                            "status": "success",
+                            "paper_id": paper_id,
+                            "query": query,
+                            "total_matches": total,
+                            "matches": matches,
                         }
                     ),
                 )
             ]
 
-        # Get paper content
-        content = Path(settings.STORAGE_PATH, f"{paper_id}.md").read_text(
-            encoding="utf-8"
-        )
+        if arguments.get("toc") or arguments.get("section") is not None:
+            return _read_section(paper_id, paper_path, arguments.get("section"))
 
-        return [
-            types.TextContent(
-                type="text",
-                text=json.dumps(
-                    {
-                        "status": "success",
-                        "paper_id": paper_id,
-                        "content": content,
-                    }
-                ),
-            )
-        ]
+        if offset is not None or length is not None:
+            if offset is None:
+                offset = 0
+            if length is None:
+                length = get_settings().READ_CHUNK_SIZE
+            if offset < 0:
+                return _error(f"offset must not be negative, got {offset}")
+            if length < 1:
+                return _error(f"length must be at least 1, got {length}")
+            content, start, end, total = read_range(paper_path, offset, length)
+            return [
+                types.TextContent(
+                    type="text",
+                    text=json.dumps(
+                        {
+                            "status": "success",
+                            "paper_id": paper_id,
+                            "offset": start,
+                            "next_offset": end if end < total else None,
+                            "total_size": total,
+                            "content": content,
+                        }
+                    ),
+                )
+            ]
+
+        # 从内存缓存获取已序列化的响应，文件变化时自动重新读取
+        payload = get_content_cache().get(
+            paper_path,
+            variant=f"read_paper:{paper_id}",
+            build=lambda content: json.dumps(
+                {
+                    "status": "success",
+                    "paper_id": paper_id,
+                    "content": content,
+                }
+            ),
+        )
+        return [types.TextContent(type="text", text=payload)]
 
     except Exception as e:
-        return [
-            types.TextContent(
-                type="text",
-                text=json.dumps(
-                    {
-                        "status": "error",
-                        "message": f"Error reading paper: {str(e)}",
-                    }
-                ),
-            )
-        ]
\ No newline at end of file
+        return _error(f"Error reading paper: {str(e)}")
@@ -1,13 +1,23 @@
 """Search functionality for the arXiv MCP server."""
 
 import arxiv
+import asyncio
+import functools
 import json
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Callable, Awaitable
 from datetime import datetime, timezone
 from dateutil import parser
 import mcp.types as types
-from ..config import Settings
+from .. import arxiv_client
+from ..config import Settings, get_settings
+from ..singleflight import SingleFlight
+from ..storage import (
+    SearchCache,
+    get_metadata_index,
+    get_search_cache,
+    metadata_from_result,
+)
 
 logger = logging.getLogger("arxiv-mcp-server")
 settings = Settings()
@@ -84,7 +94,11 @@ This ensures you get the most pertinent results regardless of publication date.
 TIPS FOR FOUNDATIONAL RESEARCH:
 - Use date_to: "2010-12-31" to find classic papers on BDI, SOAR, ACT-R
 - Combine with field searches: ti:"BDI" AND abs:"belief desire intention"  
-- Try author searches: au:"Rao" AND "BDI" for Anand Rao's foundational BDI work""",
+- Try author searches: au:"Rao" AND "BDI" for Anand Rao's foundational BDI work
+
+LOCAL SEARCH: With local_only (or when arXiv is slow or unreachable) the same
+query syntax is answered from the local catalog of papers seen before; such
+responses carry "source": "local".""",
     inputSchema={
         "type": "object",
         "properties": {
@@ -114,6 +128,10 @@ TIPS FOR FOUNDATIONAL RESEARCH:
                 "enum": ["relevance", "date"],
                 "description": "Sort results by 'relevance' (most relevant first, default) or 'date' (newest first). Use 'relevance' for focused searches, 'date' for recent developments.",
             },
+            "local_only": {
+                "type": "boolean",
+                "description": "Answer from the local metadata catalog (stored papers and earlier search results) without contacting arXiv (default: false).",
+            },
         },
         "required": ["query"],
     },
@@ -177,7 +195,8 @@ def _build_date_filter(date_from: str = None, date_to: str = None) -> str:
         else:
             end_date = datetime.now().strftime("%Y%m%d2359")
 
-        return f"submittedDate:[{start_date}+TO+{end_date}]"
+        # The client URL-encodes the query, so spaces (not "+") separate terms
+        return f"submittedDate:[{start_date} TO {end_date}]"
     except (ValueError, TypeError) as e:
         logger.error(f"Error parsing dates: {e}")
         raise ValueError(f"Invalid date format. Use YYYY-MM-DD format: {e}")
@@ -197,10 +216,193 @@ def _process_paper(paper: arxiv.Result) -> Dict[str, Any]:
     }
 
 
+def _local_paper(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape catalogued metadata like a processed search result."""
+    return {
+        "id": metadata["id"],
+        "title": metadata.get("title"),
+        "authors": metadata.get("authors") or [],
+        "abstract": metadata.get("summary"),
+        "categories": metadata.get("categories") or [],
+        "published": metadata.get("published"),
+        "url": metadata.get("pdf_url"),
+        "resource_uri": f"arxiv://{metadata['id']}",
+    }
+
+
+async def _search_local(
+    arguments: Dict[str, Any],
+    max_results: int,
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+) -> Dict[str, Any]:
+    """Evaluate the search against the local metadata catalog."""
+    index = await asyncio.to_thread(get_metadata_index)
+    papers = await asyncio.to_thread(
+        index.search,
+        arguments["query"],
+        arguments.get("categories"),
+        date_from,
+        date_to,
+        arguments.get("sort_by", "relevance"),
+        max_results,
+    )
+    logger.info(f"Local search completed: {len(papers)} results returned")
+    return {
+        "total_results": len(papers),
+        "source": "local",
+        "papers": [_local_paper(metadata) for metadata in papers],
+    }
+
+
+def _cache_params(
+    arguments: Dict[str, Any],
+    max_results: int,
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+) -> Dict[str, Any]:
+    """Normalize the search arguments that determine the response."""
+    return {
+        "query": " ".join(arguments["query"].split()),
+        "categories": sorted(set(arguments.get("categories") or [])),
+        "sort_by": arguments.get("sort_by", "relevance"),
+        "date_from": date_from.isoformat() if date_from else None,
+        "date_to": date_to.isoformat() if date_to else None,
+        "max_results": max_results,
+    }
+
+
+async def _run_search(
+    search: arxiv.Search,
+    max_results: int,
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+) -> str:
+    """Query arXiv page by page and return the serialized response.
+
+    Pages are fetched until ``max_results`` papers pass the client-side date
+    check, arXiv runs out of results, or ``SEARCH_MAX_PAGES`` is exhausted.
+    """
+    page_size = arxiv_client.get_arxiv_service().page_size
+    max_pages = get_settings().SEARCH_MAX_PAGES
+    results = []
+    seen = []
+    pages_fetched = 0
+
+    while len(results) < max_results and pages_fetched < max_pages:
+        page = await arxiv_client.search_page(search, pages_fetched * page_size)
+        pages_fetched += 1
+        seen.extend(page)
+
+        for paper in page:
+            # Apply client-side date filtering
+            paper_date = paper.published
+            if not paper_date.tzinfo:
+                paper_date = paper_date.replace(tzinfo=timezone.utc)
+
+            if date_from and paper_date < date_from:
+                continue
+            if date_to and paper_date > date_to:
+                continue
+
+            results.append(_process_paper(paper))
+            if len(results) >= max_results:
+                break
+
+        if len(page) < page_size:
+            break
+
+    logger.info(
+        f"Search completed: {len(results)} results returned "
+        f"from {pages_fetched} page(s)"
+    )
+    # 日期过滤掉的论文也一并收录，元数据同样完整
+    await _harvest(seen)
+    response_data = {
+        "total_results": len(results),
+        "pages_fetched": pages_fetched,
+        "papers": results,
+    }
+    return json.dumps(response_data, indent=2)
+
+
+async def _harvest(papers: List[arxiv.Result]) -> None:
+    """Record the metadata of every paper a search returned in the catalog.
+
+    Harvested metadata answers local searches and spares ``list_papers``
+    and ``download_paper`` a later metadata request. Failures are only
+    logged; the search result is unaffected.
+    """
+    if not papers:
+        return
+    try:
+        index = await asyncio.to_thread(get_metadata_index)
+        await asyncio.to_thread(
+            index.upsert_many, [metadata_from_result(paper) for paper in papers]
+        )
+    except Exception as e:
+        logger.warning(f"Could not catalog search results: {str(e)}")
+
+
+# Identical concurrent searches share one upstream fetch, keyed by cache key
+_search_flight = SingleFlight("search")
+
+# Background refreshes of stale cache entries, keyed by cache key
+_refreshing: Dict[str, asyncio.Task] = {}
+
+
+async def _run_and_store(
+    cache: SearchCache, cache_key: str, run: Callable[[], Awaitable[str]]
+) -> str:
+    """Run a search and store its response in the cache."""
+    payload = await run()
+    await asyncio.to_thread(cache.put, cache_key, payload)
+    return payload
+
+
+async def _search_remote(cache_key: str, run: Callable[[], Awaitable[str]]) -> str:
+    """Answer a search from the cache or arXiv, sharing identical fetches."""
+    cache = await asyncio.to_thread(get_search_cache)
+    if cache is None:
+        return await _search_flight.do(cache_key, run)
+
+    # 命中时还会更新accessed_at，读写SQLite都放到线程中执行
+    cached = await asyncio.to_thread(cache.get, cache_key)
+    if cached is not None:
+        payload, stale = cached
+        logger.debug(f"Search cache {'stale hit' if stale else 'hit'}")
+        if stale:
+            _schedule_refresh(cache, cache_key, run)
+        return payload
+
+    return await _search_flight.do(
+        cache_key, functools.partial(_run_and_store, cache, cache_key, run)
+    )
+
+
+def _schedule_refresh(
+    cache: SearchCache, cache_key: str, run: Callable[[], Awaitable[str]]
+) -> None:
+    """Refresh a stale cache entry in the background, once per key."""
+    if cache_key in _refreshing:
+        return
+
+    async def refresh() -> None:
+        try:
+            await _search_flight.do(
+                cache_key, functools.partial(_run_and_store, cache, cache_key, run)
+            )
+        except Exception as e:
+            logger.warning(f"Background search refresh failed: {e}")
+        finally:
+            _refreshing.pop(cache_key, None)
+
+    _refreshing[cache_key] = asyncio.create_task(refresh())
+
+
 async def handle_search(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Handle paper search requests with improved arXiv API integration."""
     try:
-        client = arxiv.Client()
         max_results = min(int(arguments.get("max_results", 10)), settings.MAX_RESULTS)
         base_query = arguments["query"]
 
@@ -231,51 +433,9 @@ async def handle_search(arguments: Dict[str, Any]) -> List[types.TextContent]:
             query_parts.append(f"({category_filter})")
             logger.debug(f"Added category filter: {category_filter}")
 
-        # Add date filtering using arXiv API syntax
-        # Temporarily disable server-side date filtering due to API issues
-        # Will filter client-side for now
+        # Parse date filters if provided
         date_from_arg = arguments.get("date_from")
         date_to_arg = arguments.get("date_to")
-        if date_from_arg or date_to_arg:
-            logger.debug(f"Date filtering requested: {date_from_arg} to {date_to_arg}")
-            # We'll handle this client-side after getting results
-
-        # Combine query parts
-        if not query_parts:
-            return [
-                types.TextContent(
-                    type="text", text="Error: No search criteria provided"
-                )
-            ]
-
-        # Combine query parts - arXiv uses space for AND by default
-        final_query = " ".join(query_parts)
-        logger.debug(f"Final arXiv query: {final_query}")
-
-        # Increase max_results slightly to account for any edge cases
-        # but cap it to avoid overwhelming the API
-        api_max_results = min(max_results + 5, settings.MAX_RESULTS)
-
-        # Determine sort method
-        sort_by_arg = arguments.get("sort_by", "relevance")
-        if sort_by_arg == "date":
-            sort_criterion = arxiv.SortCriterion.SubmittedDate
-            logger.debug("Using date sorting (newest first)")
-        else:
-            sort_criterion = arxiv.SortCriterion.Relevance
-            logger.debug("Using relevance sorting (most relevant first)")
-
-        search = arxiv.Search(
-            query=final_query,
-            max_results=api_max_results,
-            sort_by=sort_criterion,
-        )
-
-        # Process results with client-side date filtering
-        results = []
-        result_count = 0
-
-        # Parse date filters if provided
         date_from_parsed = None
         date_to_parsed = None
         if date_from_arg:
@@ -292,7 +452,10 @@ async def handle_search(arguments: Dict[str, Any]) -> List[types.TextContent]:
 
         if date_to_arg:
             try:
-                date_to_parsed = parser.parse(date_to_arg).replace(tzinfo=timezone.utc)
+                # date_to is inclusive of the whole day, matching the API filter
+                date_to_parsed = parser.parse(date_to_arg).replace(
+                    hour=23, minute=59, second=59, tzinfo=timezone.utc
+                )
             except (ValueError, TypeError) as e:
                 return [
                     types.TextContent(
@@ -300,35 +463,83 @@ async def handle_search(arguments: Dict[str, Any]) -> List[types.TextContent]:
                     )
                 ]
 
-        for paper in client.results(search):
-            if result_count >= max_results:
-                break
+        if arguments.get("local_only") or get_settings().SEARCH_OFFLINE:
+            response = await _search_local(
+                arguments, max_results, date_from_parsed, date_to_parsed
+            )
+            return [types.TextContent(type="text", text=json.dumps(response, indent=2))]
 
-            # Apply client-side date filtering
-            paper_date = paper.published
-            if not paper_date.tzinfo:
-                paper_date = paper_date.replace(tzinfo=timezone.utc)
+        # Combine query parts
+        if not query_parts:
+            return [
+                types.TextContent(
+                    type="text", text="Error: No search criteria provided"
+                )
+            ]
 
-            if date_from_parsed and paper_date < date_from_parsed:
-                continue
-            if date_to_parsed and paper_date > date_to_parsed:
-                continue
+        # Combine query parts - arXiv uses space for AND by default
+        final_query = " ".join(query_parts)
 
-            results.append(_process_paper(paper))
-            result_count += 1
+        # Push the date range into the API query; results are still checked
+        # client-side in _run_search as a safety net
+        if date_filter := _build_date_filter(date_from_arg, date_to_arg):
+            final_query = f"{final_query} AND {date_filter}"
+            logger.debug(f"Added date filter: {date_filter}")
+        logger.debug(f"Final arXiv query: {final_query}")
+
+        # Determine sort method
+        sort_by_arg = arguments.get("sort_by", "relevance")
+        if sort_by_arg == "date":
+            sort_criterion = arxiv.SortCriterion.SubmittedDate
+            logger.debug("Using date sorting (newest first)")
+        else:
+            sort_criterion = arxiv.SortCriterion.Relevance
+            logger.debug("Using relevance sorting (most relevant first)")
 
-        logger.info(f"Search completed: {len(results)} results returned")
-        response_data = {"total_results": len(results), "papers": results}
+        search = arxiv.Search(query=final_query, sort_by=sort_criterion)
 
-        return [
-            types.TextContent(type="text", text=json.dumps(response_data, indent=2))
-        ]
+        run = functools.partial(
+            _run_search, search, max_results, date_from_parsed, date_to_parsed
+        )
+
+        cache_key = SearchCache.make_key(
+            _cache_params(arguments, max_results, date_from_parsed, date_to_parsed)
+        )
+        timeout = get_settings().SEARCH_REMOTE_TIMEOUT
+        try:
+            # 超时只放弃等待，共享的远程请求仍会完成并写入缓存
+            payload = await asyncio.wait_for(_search_remote(cache_key, run), timeout)
+        except (asyncio.TimeoutError, arxiv.ArxivError, OSError) as e:
+            reason = (
+                f"arXiv did not respond within {timeout:g}s"
+                if isinstance(e, asyncio.TimeoutError)
+                else f"arXiv unavailable: {e}"
+            )
+            try:
+                response = await _search_local(
+                    arguments, max_results, date_from_parsed, date_to_parsed
+                )
+            except ValueError:
+                raise e
+            if not response["papers"]:
+                raise e
+            logger.warning(f"Falling back to local search: {reason}")
+            response["fallback_reason"] = reason
+            payload = json.dumps(response, indent=2)
+        return [types.TextContent(type="text", text=payload)]
 
     except arxiv.ArxivError as e:
         logger.error(f"ArXiv API error: {e}")
         return [
             types.TextContent(type="text", text=f"Error: ArXiv API error - {str(e)}")
         ]
+    except asyncio.TimeoutError:
+        logger.error("ArXiv search timed out")
+        return [
+            types.TextContent(
+                type="text", text="Error: ArXiv search timed out; try local_only"
+            )
+        ]
     except Exception as e:
         logger.error(f"Unexpected search error: {e}")
         return [types.TextContent(type="text", text=f"Error: {str(e)}")]
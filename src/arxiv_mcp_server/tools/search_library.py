@@ -0,0 +1,74 @@
+"""Full-text search over downloaded papers for the arXiv MCP server."""
+
+import asyncio
+import json
+import logging
+from typing import Dict, Any, List
+import mcp.types as types
+from ..storage import get_catalog, get_library_index
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+search_library_tool = types.Tool(
+    name="search_library",
+    description=(
+        "Search the full text of papers already downloaded to the local "
+        "library, ranked by relevance (BM25). Use double quotes for "
+        "phrases; OR and NOT are supported."
+    ),
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": 'Search terms, e.g. "graph neural network" pooling',
+            },
+            "max_results": {
+                "type": "integer",
+                "description": "Maximum number of papers to return",
+                "default": 10,
+            },
+            "refresh": {
+                "type": "boolean",
+                "description": (
+                    "If true, re-index papers whose files changed before searching"
+                ),
+                "default": False,
+            },
+        },
+        "required": ["query"],
+    },
+)
+
+
+async def handle_search_library(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Handle full-text searches over the local library."""
+    try:
+        query = arguments["query"]
+        max_results = min(int(arguments.get("max_results", 10)), 100)
+
+        # 首次使用会与目录同步并建立索引，放到线程中执行
+        index = await asyncio.to_thread(get_library_index)
+        if arguments.get("refresh"):
+            records = await asyncio.to_thread(get_catalog().records)
+            await asyncio.to_thread(index.sync, records)
+        results = await asyncio.to_thread(index.search, query, max_results)
+
+        return [
+            types.TextContent(
+                type="text",
+                text=json.dumps(
+                    {"total_results": len(results), "papers": results},
+                    ensure_ascii=False,
+                ),
+            )
+        ]
+
+    except Exception as e:
+        logger.error(f"Library search error: {str(e)}")
+        return [
+            types.TextContent(
+                type="text",
+                text=json.dumps({"status": "error", "message": f"Error: {str(e)}"}),
+            )
+        ]
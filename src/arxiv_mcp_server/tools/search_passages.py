@@ -0,0 +1,79 @@
+"""Passage-level search over downloaded papers for the arXiv MCP server."""
+
+import asyncio
+import json
+import logging
+from typing import Dict, Any, List
+import mcp.types as types
+from ..storage import get_catalog, get_passage_index
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+# 单次返回的段落数上限，保证响应大小可预期
+MAX_PASSAGES = 20
+
+search_passages_tool = types.Tool(
+    name="search_passages",
+    description=(
+        "Find the passages most relevant to a query across papers in the "
+        "local library, ranked by relevance (BM25). Each passage comes with "
+        "its paper ID and byte offset/length; pass them to read_paper as "
+        "offset/length (widened as needed) to read the surrounding context."
+    ),
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": 'Search terms, e.g. "contrastive loss" temperature',
+            },
+            "max_results": {
+                "type": "integer",
+                "description": f"Maximum number of passages to return (max {MAX_PASSAGES})",
+                "default": 5,
+            },
+            "paper_ids": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Only search passages of these papers",
+            },
+        },
+        "required": ["query"],
+    },
+)
+
+
+async def handle_search_passages(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Handle passage searches over the local library."""
+    try:
+        query = arguments["query"]
+        max_results = max(1, min(int(arguments.get("max_results", 5)), MAX_PASSAGES))
+
+        # 首次使用会与目录同步并切分段落，放到线程中执行
+        index = await asyncio.to_thread(get_passage_index)
+        paper_ids = arguments.get("paper_ids")
+        if paper_ids is not None:
+            # 段落按存储时的ID索引，未带版本号的ID先解析为实际存储的版本
+            paper_ids = await asyncio.to_thread(
+                lambda: [get_catalog().stored_id(paper_id) for paper_id in paper_ids]
+            )
+        results = await asyncio.to_thread(index.search, query, max_results, paper_ids)
+
+        return [
+            types.TextContent(
+                type="text",
+                text=json.dumps(
+                    {"total_results": len(results), "passages": results},
+                    ensure_ascii=False,
+                ),
+            )
+        ]
+
+    except Exception as e:
+        logger.error(f"Passage search error: {str(e)}")
+        return [
+            types.TextContent(
+                type="text",
+                text=json.dumps({"status": "error", "message": f"Error: {str(e)}"}),
+            )
+        ]
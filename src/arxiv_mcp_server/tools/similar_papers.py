@@ -0,0 +1,85 @@
+"""Similar-paper lookup over the local library for the arXiv MCP server."""
+
+import asyncio
+import json
+import logging
+from typing import Dict, Any, List
+import mcp.types as types
+from ..storage import get_catalog, get_vector_index
+
+logger = logging.getLogger("arxiv-mcp-server")
+
+
+similar_papers_tool = types.Tool(
+    name="similar_papers",
+    description=(
+        "Find papers in the local library that are most similar in content "
+        "to a downloaded paper, ranked by cosine similarity of their "
+        "document vectors. Only papers already downloaded are compared."
+    ),
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "paper_id": {
+                "type": "string",
+                "description": "The arXiv ID of a downloaded paper",
+            },
+            "max_results": {
+                "type": "integer",
+                "description": "Maximum number of similar papers to return",
+                "default": 10,
+            },
+        },
+        "required": ["paper_id"],
+    },
+)
+
+
+async def handle_similar_papers(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Handle similar-paper lookups over the local library."""
+    try:
+        paper_id = arguments["paper_id"]
+        max_results = max(1, min(int(arguments.get("max_results", 10)), 100))
+
+        # 首次使用会与目录同步并计算向量，放到线程中执行
+        index = await asyncio.to_thread(get_vector_index)
+        stored_id = await asyncio.to_thread(lambda: get_catalog().stored_id(paper_id))
+        try:
+            results = await asyncio.to_thread(index.similar, stored_id, max_results)
+        except KeyError:
+            return [
+                types.TextContent(
+                    type="text",
+                    text=json.dumps(
+                        {
+                            "status": "error",
+                            "message": f"Paper {paper_id} is not in the similarity "
+                            "index. Download it first; at least two papers are "
+                            "needed to compare.",
+                        }
+                    ),
+                )
+            ]
+
+        return [
+            types.TextContent(
+                type="text",
+                text=json.dumps(
+                    {
+                        "paper_id": paper_id,
+                        "total_results": len(results),
+                        "papers": results,
+                    },
+                    ensure_ascii=False,
+                ),
+            )
+        ]
+
+    except Exception as e:
+        logger.error(f"Similar papers error: {str(e)}")
+        return [
+            types.TextContent(
+                type="text",
+                text=json.dumps({"status": "error", "message": f"Error: {str(e)}"}),
+            )
+        ]
@@ -6,6 +6,10 @@ from datetime import datetime, timezone
 from unittest.mock import MagicMock, AsyncMock
 import arxiv
 from pathlib import Path
+from arxiv_mcp_server.arxiv_client import reset_arxiv_service
+from arxiv_mcp_server.config import get_settings
+from arxiv_mcp_server.conversion import shutdown_process_pool
+from arxiv_mcp_server.tools.download import conversion_statuses, reset_job_queues
 
 
 class MockAuthor:
@@ -18,6 +22,37 @@ class MockLink:
         self.href = href
 
 
+@pytest.fixture(autouse=True)
+def isolated_storage(request, tmp_path, monkeypatch):
+    """Keep papers, caches and indexes written by a test in a temporary directory."""
+    if request.node.get_closest_marker("default_storage") is None:
+        monkeypatch.setenv("ARXIV_STORAGE_PATH", str(tmp_path))
+
+
+@pytest.fixture(autouse=True)
+def arxiv_service(monkeypatch):
+    """Give each test a fresh shared arXiv service without politeness delays."""
+    monkeypatch.setattr(get_settings(), "ARXIV_REQUEST_INTERVAL", 0.0)
+    # 持久化缓存默认关闭，避免测试之间互相影响
+    monkeypatch.setattr(get_settings(), "SEARCH_CACHE_ENABLED", False)
+    reset_arxiv_service()
+    yield
+    reset_arxiv_service()
+
+
+@pytest.fixture(autouse=True)
+def job_queues(monkeypatch):
+    """Start each test with empty download/convert queues and no statuses."""
+    # 默认在线程中转换，需要进程池的测试自行开启
+    monkeypatch.setattr(get_settings(), "CONVERT_PROCESSES", 0)
+    reset_job_queues()
+    conversion_statuses.clear()
+    yield
+    reset_job_queues()
+    conversion_statuses.clear()
+    shutdown_process_pool()
+
+
 @pytest.fixture
 def mock_paper():
     """Create a properly structured mock paper with all required attributes."""
@@ -51,6 +86,13 @@ def temp_storage_path():
         yield Path(tmpdir)
 
 
+@pytest.fixture
+def storage_path(tmp_path, monkeypatch):
+    """Point the server's storage path at a per-test temporary directory."""
+    monkeypatch.setenv("ARXIV_STORAGE_PATH", str(tmp_path))
+    return tmp_path
+
+
 @pytest.fixture
 def mock_pdf_content():
     """Create mock PDF content for testing."""
@@ -0,0 +1,77 @@
+"""Tests for the persistent paper catalog."""
+
+from arxiv_mcp_server.storage import PaperCatalog, save_metadata
+
+
+def _catalog(storage_path):
+    index = storage_path / ".index"
+    index.mkdir(exist_ok=True)
+    return PaperCatalog(index / "catalog.db", storage_path)
+
+
+def test_title_named_file_found_by_id(storage_path):
+    """A paper stored under its title resolves by arXiv ID, with or without version."""
+    md_path = storage_path / "Some_Title.md"
+    md_path.write_text("# Some Title", encoding="utf-8")
+    catalog = _catalog(storage_path)
+    catalog.add("2103.12345v2", md_path, "Some Title")
+
+    assert catalog.find("2103.12345v2") == md_path
+    assert catalog.find("2103.12345") == md_path
+    assert catalog.find("Some_Title") == md_path
+    assert catalog.find("9999.99999") is None
+
+
+def test_versions_resolve_separately(storage_path):
+    """A versioned ID never resolves to another version; bare IDs get the newest."""
+    catalog = _catalog(storage_path)
+    for version in (1, 9, 10):
+        md_path = storage_path / f"2101.00001v{version}.md"
+        md_path.write_text("# Paper", encoding="utf-8")
+        catalog.add(f"2101.00001v{version}", md_path)
+
+    assert catalog.find("2101.00001v2") is None
+    assert catalog.find("2101.00001v9").name == "2101.00001v9.md"
+    assert catalog.find("2101.00001").name == "2101.00001v10.md"
+
+
+def test_stored_id_resolves_to_stored_version(storage_path):
+    """Bare IDs map to the newest stored version; unknown IDs are unchanged."""
+    catalog = _catalog(storage_path)
+    for version in (1, 2):
+        md_path = storage_path / f"Title_v{version}.md"
+        md_path.write_text("# Paper", encoding="utf-8")
+        catalog.add(f"2101.00001v{version}", md_path)
+
+    assert catalog.stored_id("2101.00001") == "2101.00001v2"
+    assert catalog.stored_id("2101.00001v1") == "2101.00001v1"
+    assert catalog.stored_id("9999.99999") == "9999.99999"
+
+
+def test_reconcile_imports_existing_library(storage_path):
+    """Files stored before the catalog existed are registered from sidecars."""
+    titled = storage_path / "Some_Title.md"
+    titled.write_text("# Some Title", encoding="utf-8")
+    save_metadata(titled, {"id": "2103.12345", "title": "Some Title"})
+    (storage_path / "2201.00001.md").write_text("# Other", encoding="utf-8")
+
+    catalog = _catalog(storage_path)
+    catalog.reconcile()
+
+    assert dict(catalog.entries()) == {
+        "2103.12345": titled,
+        "2201.00001": storage_path / "2201.00001.md",
+    }
+
+    titled.unlink()
+    catalog.reconcile()
+    assert catalog.find("2103.12345") is None
+    assert [paper_id for paper_id, _ in catalog.entries()] == ["2201.00001"]
+
+
+def test_catalog_persists(storage_path):
+    """Entries survive reopening the catalog."""
+    md_path = storage_path / "Some_Title.md"
+    md_path.write_text("# Some Title", encoding="utf-8")
+    _catalog(storage_path).add("2103.12345", md_path)
+    assert _catalog(storage_path).find("2103.12345") == md_path
@@ -0,0 +1,57 @@
+"""Tests for reference extraction and the citation graph."""
+
+from arxiv_mcp_server.storage import CitationGraph
+from arxiv_mcp_server.storage.citations import extract_references, references_text
+
+
+def test_extract_arxiv_ids_and_dois():
+    """IDs lose their version, arXiv DOIs become IDs, duplicates are dropped."""
+    text = (
+        "[1] A. Foo. arXiv preprint arXiv:2103.12345v2, 2021.\n"
+        "[2] B. Bar. KDD. doi:10.1145/3292500.3330701.\n"
+        "[3] https://arxiv.org/abs/hep-th/9901001v1\n"
+        "[4] https://doi.org/10.48550/arXiv.1706.03762.\n"
+        "[5] arXiv:2103.12345\n"
+    )
+    assert extract_references(text) == [
+        "2103.12345",
+        "doi:10.1145/3292500.3330701",
+        "hep-th/9901001",
+        "1706.03762",
+    ]
+
+
+def test_references_text_starts_at_last_heading(tmp_path):
+    """Citations in the body before the reference section are ignored."""
+    md_path = tmp_path / "paper.md"
+    md_path.write_text(
+        "# Intro\nAs in arXiv:1111.11111.\n\n## References\n\n[1] arXiv:2222.22222\n",
+        encoding="utf-8",
+    )
+    assert extract_references(references_text(md_path)) == ["2222.22222"]
+
+
+def test_graph_references_and_citing(tmp_path):
+    """Edges point both ways and re-extraction replaces a paper's edges."""
+    graph = CitationGraph(tmp_path / "citations.db")
+    a = tmp_path / "a.md"
+    a.write_text("## References\narXiv:2000.00002 arXiv:2000.00003\n")
+    b = tmp_path / "b.md"
+    b.write_text("## References\narXiv:2000.00003 doi:10.1000/XYZ\n")
+    graph.add("2000.00001v1", a)
+    graph.add("2000.00002", b)
+
+    assert graph.references("2000.00001") == [
+        {"id": "2000.00002", "type": "arxiv", "in_library": True},
+        {"id": "2000.00003", "type": "arxiv", "in_library": False},
+    ]
+    assert graph.citing("2000.00003") == ["2000.00001", "2000.00002"]
+    assert graph.citing("10.1000/xyz") == ["2000.00002"]
+    assert graph.citing("2000.00001") == []
+    assert graph.stats() == {"papers": 2, "nodes": 4, "edges": 4}
+
+    b.write_text("## References\nnone\n")
+    assert graph.sync([("2000.00001v1", a, None), ("2000.00002", b, None)]) == 1
+    assert graph.citing("2000.00003") == ["2000.00001"]
+    graph.sync([("2000.00002", b, None)])
+    assert not graph.has("2000.00001")
@@ -0,0 +1,69 @@
+"""Tests for the in-memory paper content cache."""
+
+import os
+from arxiv_mcp_server.storage import ContentCache
+
+
+def test_repeated_reads_hit_cache(tmp_path):
+    """A second read of an unchanged file is served from memory."""
+    path = tmp_path / "paper.md"
+    path.write_text("# Paper", encoding="utf-8")
+    cache = ContentCache(max_bytes=1024)
+
+    assert cache.get(path) == "# Paper"
+    assert cache.get(path) == "# Paper"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_changed_file_is_reread(tmp_path):
+    """Entries are invalidated when the file's mtime or size changes."""
+    path = tmp_path / "paper.md"
+    path.write_text("old", encoding="utf-8")
+    cache = ContentCache(max_bytes=1024)
+    cache.get(path)
+
+    path.write_text("new", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert cache.get(path) == "new"
+
+
+def test_variants_are_built_once_without_caching_content(tmp_path):
+    """Derived values are built once; only the variant itself is cached."""
+    path = tmp_path / "paper.md"
+    path.write_text("body", encoding="utf-8")
+    cache = ContentCache(max_bytes=1024)
+    builds = []
+
+    def build(content):
+        builds.append(content)
+        return content.upper()
+
+    assert cache.get(path, "upper", build) == "BODY"
+    assert cache.get(path, "upper", build) == "BODY"
+    assert builds == ["body"]
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"], stats["misses"]) == (1, 4, 1)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    """The cache stays within its size bound, evicting the oldest entries."""
+    paths = []
+    for name in "abc":
+        path = tmp_path / f"{name}.md"
+        path.write_text(name * 40, encoding="utf-8")
+        paths.append(path)
+    cache = ContentCache(max_bytes=100)
+
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])
+    cache.get(paths[2])
+
+    assert cache.stats()["bytes"] == 80
+    cache.get(paths[0])
+    assert cache.stats()["hits"] == 2
+    cache.get(paths[1])
+    assert cache.stats()["misses"] == 4
@@ -0,0 +1,19 @@
+"""Tests for registering converted papers with the local indexes."""
+
+from arxiv_mcp_server.storage import get_catalog, get_library_index, index_paper
+
+
+def test_failing_index_does_not_block_the_others(storage_path, monkeypatch):
+    """A broken optional index is skipped; the paper is still catalogued."""
+
+    def broken():
+        raise RuntimeError("vector store unavailable")
+
+    monkeypatch.setattr("arxiv_mcp_server.storage.indexing.get_vector_index", broken)
+    md_path = storage_path / "Some_Title.md"
+    md_path.write_text("# Sparse attention\n\nLong documents.", encoding="utf-8")
+
+    index_paper("2101.00001v1", md_path, "Some Title", [0])
+
+    assert get_catalog().find("2101.00001v1") == md_path
+    assert get_library_index().stats()["papers"] == 1
@@ -0,0 +1,59 @@
+"""Tests for the full-text index over stored papers."""
+
+import os
+from arxiv_mcp_server.storage import LibraryIndex
+from arxiv_mcp_server.storage.library_index import to_fts_query
+
+
+def _paper(tmp_path, name, text):
+    path = tmp_path / f"{name}.md"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_query_translation_quotes_terms():
+    """User queries cannot inject FTS5 syntax."""
+    assert to_fts_query('graph "neural network" OR gnn-x') == (
+        '"graph" "neural network" OR "gnn-x"'
+    )
+    assert to_fts_query("OR NOT") == ""
+    assert to_fts_query('a"b') == '"a""b"'
+
+
+def test_bm25_ranking_phrases_and_snippets(tmp_path):
+    """Papers are ranked by relevance, with phrase queries and snippets."""
+    index = LibraryIndex(tmp_path / "library.db")
+    index.add(
+        "1", _paper(tmp_path, "a", "Graph neural networks. " * 5), "Graph Networks"
+    )
+    index.add("2", _paper(tmp_path, "b", "A neural model of graph data."), "Other")
+    index.add("3", _paper(tmp_path, "c", "Convolution for images."), "Vision")
+    for i in range(4, 8):
+        index.add(str(i), _paper(tmp_path, f"d{i}", "Unrelated text."), "Filler")
+
+    results = index.search("graph neural")
+    assert [r["id"] for r in results] == ["1", "2"]
+    assert results[0]["score"] > results[1]["score"]
+    assert "**Graph**" in results[0]["snippet"]
+
+    assert [r["id"] for r in index.search('"graph neural"')] == ["1"]
+    assert {r["id"] for r in index.search("images OR data")} == {"2", "3"}
+
+
+def test_sync_reindexes_changed_and_drops_removed(tmp_path):
+    """sync only touches papers whose files changed or disappeared."""
+    index = LibraryIndex(tmp_path / "library.db")
+    a = _paper(tmp_path, "a", "transformers")
+    b = _paper(tmp_path, "b", "diffusion")
+    assert index.sync([("1", a, None), ("2", b, None)]) == 2
+    assert index.sync([("1", a, None), ("2", b, None)]) == 0
+
+    a.write_text("state space models", encoding="utf-8")
+    stat = a.stat()
+    os.utime(a, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert index.sync([("1", a, None)]) == 1
+
+    assert index.search("transformers") == []
+    assert [r["id"] for r in index.search("state space")] == ["1"]
+    assert index.search("diffusion") == []
+    assert index.stats() == {"papers": 1}
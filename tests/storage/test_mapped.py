@@ -0,0 +1,37 @@
+"""Tests for memory-mapped reads and searches of stored papers."""
+
+from arxiv_mcp_server.storage import read_range, search_file
+
+
+def test_read_range_aligns_to_characters(tmp_path):
+    """Ranges never split a multi-byte character."""
+    path = tmp_path / "paper.md"
+    path.write_text("ab深度学习", encoding="utf-8")
+
+    assert read_range(path, 0, 4) == ("ab", 0, 2, 14)
+    assert read_range(path, 3, 6) == ("度学", 5, 11, 14)
+    assert read_range(path, 100, 10) == ("", 14, 14, 14)
+
+
+def test_empty_file_reads_and_searches(tmp_path):
+    """Empty files, which cannot be mapped, are handled."""
+    path = tmp_path / "empty.md"
+    path.write_text("", encoding="utf-8")
+
+    assert read_range(path, 0, 10) == ("", 0, 0, 0)
+    assert search_file(path, "x") == ([], 0)
+
+
+def test_search_file_reports_offsets_and_snippets(tmp_path):
+    """Matches ignore case and come with surrounding context."""
+    path = tmp_path / "paper.md"
+    text = "Intro. " + "filler " * 50 + "We use a Transformer encoder. " + "x " * 10
+    path.write_text(text + "transformer again", encoding="utf-8")
+
+    matches, total = search_file(path, "TRANSFORMER", max_matches=1, context=20)
+
+    assert total == 2
+    assert len(matches) == 1
+    assert matches[0]["offset"] == text.index("Transformer")
+    assert "We use a Transformer encoder" in matches[0]["snippet"]
+    assert "Intro" not in matches[0]["snippet"]
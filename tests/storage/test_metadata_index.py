@@ -0,0 +1,140 @@
+"""Tests for the local metadata catalog."""
+
+from datetime import datetime, timezone
+
+import pytest
+from arxiv_mcp_server.query_parser import QuerySyntaxError
+from arxiv_mcp_server.storage import MetadataIndex
+
+
+def _metadata(paper_id, title, authors, summary, categories, published):
+    return {
+        "id": paper_id,
+        "title": title,
+        "authors": authors,
+        "summary": summary,
+        "categories": categories,
+        "published": published,
+        "pdf_url": f"https://arxiv.org/pdf/{paper_id}",
+    }
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = MetadataIndex(tmp_path / "metadata.db")
+    index.upsert_many(
+        [
+            _metadata(
+                "2101.00001v1",
+                "Graph Neural Networks",
+                ["Geoffrey Hinton"],
+                "We study message passing.",
+                ["cs.LG"],
+                "2021-01-01T00:00:00+00:00",
+            ),
+            _metadata(
+                "2201.00002v1",
+                "Quantum Error Correction",
+                ["Alice Smith"],
+                "Surface codes and graph states.",
+                ["quant-ph"],
+                "2022-01-01T00:00:00+00:00",
+            ),
+            _metadata(
+                "2301.00003v2",
+                "A Survey of Graph Learning",
+                ["Bob Jones", "Alice Smith"],
+                "We review neural methods.",
+                ["cs.LG", "cs.AI"],
+                "2023-01-01T00:00:00+00:00",
+            ),
+        ]
+    )
+    return index
+
+
+def _ids(results):
+    return [m["id"] for m in results]
+
+
+def test_fielded_queries(index):
+    """ti:, au:, abs: and cat: only match their own field."""
+    assert set(_ids(index.search("ti:graph"))) == {"2101.00001v1", "2301.00003v2"}
+    assert _ids(index.search("abs:graph")) == ["2201.00002v1"]
+    assert set(_ids(index.search('au:"Alice Smith"'))) == {
+        "2201.00002v1",
+        "2301.00003v2",
+    }
+    assert _ids(index.search("au:Hinton_G")) == ["2101.00001v1"]
+    assert _ids(index.search("graph ANDNOT ti:survey AND cat:cs.LG")) == [
+        "2101.00001v1"
+    ]
+
+
+def test_title_matches_rank_first(index):
+    """Relevance ranking weights titles above abstracts."""
+    assert _ids(index.search("graph"))[-1] == "2201.00002v1"
+
+
+def test_category_and_date_filters(index):
+    """Category lists and date windows narrow the results."""
+    assert _ids(index.search("graph", categories=["cs.AI"])) == ["2301.00003v2"]
+    results = index.search(
+        "graph",
+        date_from=datetime(2021, 6, 1, tzinfo=timezone.utc),
+        date_to=datetime(2022, 12, 31, tzinfo=timezone.utc),
+    )
+    assert _ids(results) == ["2201.00002v1"]
+    assert _ids(index.search("graph", sort_by="date", limit=2)) == [
+        "2301.00003v2",
+        "2201.00002v1",
+    ]
+
+
+def test_upsert_keeps_newest_version(index):
+    """Older versions never replace a newer catalogued one."""
+    index.upsert(
+        _metadata("2301.00003v1", "Old Title", [], "", [], "2023-01-01T00:00:00+00:00")
+    )
+    assert index.get("2301.00003")["title"] == "A Survey of Graph Learning"
+    index.upsert(
+        _metadata("2301.00003v3", "New Title", [], "", [], "2023-01-01T00:00:00+00:00")
+    )
+    assert index.get("2301.00003v2")["id"] == "2301.00003v3"
+    assert _ids(index.search("ti:survey")) == []
+    assert index.count() == 3
+
+
+def test_invalid_query(index):
+    """Unsupported syntax is reported as a query error."""
+    with pytest.raises(QuerySyntaxError):
+        index.search("xx:graph")
+
+
+def test_find_respects_requested_version(index):
+    """Unversioned IDs take any version; versioned IDs need that version."""
+    assert index.find("2301.00003")["id"] == "2301.00003v2"
+    assert index.find("2301.00003v2")["id"] == "2301.00003v2"
+    assert index.find("2301.00003v1") is None
+
+
+def test_result_from_metadata_round_trip():
+    """Catalogued metadata rebuilds a result with the same metadata."""
+    from arxiv_mcp_server.storage import metadata_from_result, result_from_metadata
+
+    metadata = {
+        "id": "2101.00001v1",
+        "title": "Graph Neural Networks",
+        "authors": ["Geoffrey Hinton"],
+        "summary": "We study message passing.",
+        "categories": ["cs.LG"],
+        "published": "2021-01-01T00:00:00+00:00",
+        "updated": None,
+        "links": [
+            "https://arxiv.org/abs/2101.00001v1",
+            "https://arxiv.org/pdf/2101.00001v1",
+        ],
+        "pdf_url": "https://arxiv.org/pdf/2101.00001v1",
+    }
+    result = result_from_metadata(metadata)
+    assert metadata_from_result(result, "2101.00001v1") == metadata
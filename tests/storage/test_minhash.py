@@ -0,0 +1,71 @@
+"""Tests for MinHash signatures and the LSH duplicate index."""
+
+import random
+
+import pytest
+
+from arxiv_mcp_server.storage import MinHashIndex
+from arxiv_mcp_server.storage.minhash import MinHasher, shingles, similarity
+
+
+def _words(count, seed):
+    rng = random.Random(seed)
+    return [f"w{rng.randint(0, 10000)}" for _ in range(count)]
+
+
+def test_shingles_ignore_formatting():
+    """Markdown and plain text of the same words give the same shingles."""
+    plain = "Sparse attention for long documents scales linearly"
+    markdown = "## Sparse *attention* for long\n\ndocuments scales, linearly."
+    assert (shingles(plain) == shingles(markdown)).all()
+    assert len(shingles("")) == 0
+
+
+def test_similarity_estimates_overlap():
+    """Near-identical texts score high, unrelated texts near zero."""
+    hasher = MinHasher(128)
+    words = _words(3000, 1)
+    edited = words[:2850] + _words(150, 2)
+    original = hasher.signature(" ".join(words))
+    assert similarity(original, hasher.signature(" ".join(edited))) > 0.8
+    assert similarity(original, hasher.signature(" ".join(_words(3000, 3)))) < 0.1
+
+
+def test_index_query_and_duplicates(tmp_path):
+    """Banded lookups find near-duplicates and skip unrelated papers."""
+    index = MinHashIndex(tmp_path / "minhash.db", 128, 16)
+    words = _words(3000, 1)
+    texts = {
+        "2101.00001v1": words,
+        "2101.00001v2": words[:2900] + _words(100, 2),
+        "2101.00002": _words(3000, 3),
+    }
+    for paper_id, text in texts.items():
+        md_path = tmp_path / f"{paper_id}.md"
+        md_path.write_text(" ".join(text), encoding="utf-8")
+        index.add(paper_id, md_path)
+
+    matches = index.query(index.signature("2101.00001v1"), 0.8, "2101.00001v1")
+    assert [m["id"] for m in matches] == ["2101.00001v2"]
+    pairs = index.duplicates(0.8)
+    assert [pair["ids"] for pair in pairs] == [["2101.00001v1", "2101.00001v2"]]
+
+    index.remove("2101.00001v2")
+    assert index.duplicates(0.8) == []
+    assert index.stats() == {"papers": 2}
+
+
+def test_sync_signs_and_drops(tmp_path):
+    """Sync signs new papers and forgets ones no longer stored."""
+    index = MinHashIndex(tmp_path / "minhash.db", 64, 8)
+    md_path = tmp_path / "a.md"
+    md_path.write_text("some words in a paper", encoding="utf-8")
+    assert index.sync([("a", md_path, None)]) == 1
+    assert index.sync([("a", md_path, None)]) == 0
+    index.sync([])
+    assert index.signature("a") is None
+
+
+def test_bands_must_divide_permutations(tmp_path):
+    with pytest.raises(ValueError):
+        MinHashIndex(tmp_path / "minhash.db", 100, 16)
@@ -0,0 +1,78 @@
+"""Tests for the passage index over stored papers."""
+
+from arxiv_mcp_server.storage import PassageIndex
+from arxiv_mcp_server.storage.passages import chunk_spans
+
+
+def test_chunks_overlap_and_cover_the_text():
+    """Chunks stay within the size, overlap, break at words and cover everything."""
+    data = " ".join(f"word{i}" for i in range(500)).encode("utf-8")
+    spans = chunk_spans(data, 200, 50)
+
+    assert spans[0][0] == 0 and spans[-1][1] == len(data)
+    for (start, end), (next_start, _) in zip(spans, spans[1:]):
+        assert end - start <= 200
+        assert start < next_start < end
+        assert end - next_start <= 50
+        assert data[next_start - 1 : next_start] == b" "
+        assert data[end - 1 : end] == b" "
+
+
+def test_chunks_respect_utf8_boundaries():
+    """Text without breaks is still cut between characters."""
+    data = ("é" * 300).encode("utf-8")
+    spans = chunk_spans(data, 101, 10)
+    for start, end in spans:
+        assert end - start <= 101
+        data[start:end].decode("utf-8")
+    assert spans[-1][1] == len(data)
+
+
+def test_passage_search_returns_offsets(tmp_path):
+    """Results point back at their byte range in the markdown file."""
+    md_path = tmp_path / "paper.md"
+    text = (
+        "Filler sentence. " * 100
+        + "Block sparse attention is fast. "
+        + ("More filler. " * 100)
+    )
+    md_path.write_text(text, encoding="utf-8")
+    other = tmp_path / "other.md"
+    other.write_text("Dense attention only. " * 20, encoding="utf-8")
+
+    index = PassageIndex(tmp_path / "passages.db", 400, 100)
+    assert index.add("2103.12345", md_path, "Sparse") > 3
+    index.add("2103.54321", other, "Dense")
+
+    results = index.search("block sparse", limit=3)
+    assert results and {r["id"] for r in results} == {"2103.12345"}
+    best = results[0]
+    data = md_path.read_bytes()
+    assert data[best["offset"] : best["offset"] + best["length"]].decode() == (
+        best["text"]
+    )
+    assert "Block sparse attention" in best["text"]
+
+    assert {r["id"] for r in index.search("attention", limit=10)} == {
+        "2103.12345",
+        "2103.54321",
+    }
+    assert {r["id"] for r in index.search("attention", paper_ids=["2103.54321"])} == {
+        "2103.54321"
+    }
+
+
+def test_reindex_and_sync_replace_passages(tmp_path):
+    """Re-adding a paper replaces its passages; sync drops removed papers."""
+    md_path = tmp_path / "paper.md"
+    md_path.write_text("Original words here.", encoding="utf-8")
+    index = PassageIndex(tmp_path / "passages.db", 400, 100)
+    index.add("1", md_path, None)
+
+    md_path.write_text("Replacement content now.", encoding="utf-8")
+    assert index.sync([("1", md_path, None)]) == 1
+    assert index.search("original") == []
+    assert index.search("replacement")[0]["id"] == "1"
+
+    index.sync([])
+    assert index.stats() == {"papers": 0, "passages": 0}
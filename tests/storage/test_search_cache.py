@@ -0,0 +1,65 @@
+"""Tests for the persistent search result cache."""
+
+import time
+from unittest.mock import patch
+from arxiv_mcp_server.storage import SearchCache
+
+
+def _cache(tmp_path, **overrides):
+    options = dict(ttl=60, stale_ttl=600, max_entries=10, max_bytes=10_000)
+    options.update(overrides)
+    return SearchCache(tmp_path / "search_cache.db", **options)
+
+
+def test_key_is_order_independent():
+    """Keys depend on parameter values, not dict ordering."""
+    assert SearchCache.make_key({"a": 1, "b": 2}) == SearchCache.make_key(
+        {"b": 2, "a": 1}
+    )
+
+
+def test_fresh_stale_and_expired(tmp_path):
+    """Entries move from fresh to stale to expired as they age."""
+    cache = _cache(tmp_path)
+    cache.put("k", "payload")
+    assert cache.get("k") == ("payload", False)
+
+    with patch("time.time", return_value=time.time() + 120):
+        assert cache.get("k") == ("payload", True)
+    with patch("time.time", return_value=time.time() + 1200):
+        assert cache.get("k") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["stale_hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_persists_across_instances(tmp_path):
+    """Cached responses survive a restart."""
+    _cache(tmp_path).put("k", "payload")
+    assert _cache(tmp_path).get("k") == ("payload", False)
+
+
+def test_lru_eviction_by_entries(tmp_path):
+    """The least recently used entry is evicted first."""
+    cache = _cache(tmp_path, max_entries=2)
+    cache.put("a", "1")
+    time.sleep(0.01)
+    cache.put("b", "2")
+    time.sleep(0.01)
+    cache.get("a")
+    time.sleep(0.01)
+    cache.put("c", "3")
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_eviction_by_bytes(tmp_path):
+    """Total payload size stays under the byte bound."""
+    cache = _cache(tmp_path, max_bytes=250)
+    for i in range(5):
+        cache.put(str(i), "x" * 100)
+        time.sleep(0.01)
+    assert cache.stats()["bytes"] <= 250
+    assert cache.get("4") is not None
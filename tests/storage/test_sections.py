@@ -0,0 +1,68 @@
+"""Tests for the section index of stored papers."""
+
+from arxiv_mcp_server.storage import find_section, load_sections
+from arxiv_mcp_server.storage.sections import build_section_index
+
+PAPER = """# **Deep Nets**
+
+Abstract text.
+
+## 1 Introduction
+
+Intro text.
+
+## 2 Method
+
+```
+# not a heading
+```
+
+### 2.1 Architecture
+
+Details.
+
+## 3 Conclusion
+
+Done.
+"""
+
+
+def test_sections_span_their_subsections(tmp_path):
+    """Each section ends at the next heading of the same or higher level."""
+    md_path = tmp_path / "paper.md"
+    md_path.write_text(PAPER, encoding="utf-8")
+    data = PAPER.encode("utf-8")
+
+    sections = build_section_index(md_path)
+
+    assert [(s["title"], s["level"]) for s in sections] == [
+        ("Deep Nets", 1),
+        ("1 Introduction", 2),
+        ("2 Method", 2),
+        ("2.1 Architecture", 3),
+        ("3 Conclusion", 2),
+    ]
+    method = sections[2]
+    text = data[method["offset"] : method["offset"] + method["length"]].decode()
+    assert text.startswith("## 2 Method") and "Details." in text
+    assert "Conclusion" not in text
+    assert sections[0]["length"] == len(data)
+
+
+def test_index_is_rebuilt_when_paper_changes(storage_path):
+    """A stored index is reused until the markdown file changes size."""
+    md_path = storage_path / "paper.md"
+    md_path.write_text("# A\n", encoding="utf-8")
+    assert [s["title"] for s in load_sections(md_path)] == ["A"]
+
+    md_path.write_text("# A\n\n# B\n", encoding="utf-8")
+    assert [s["title"] for s in load_sections(md_path)] == ["A", "B"]
+
+
+def test_find_section_prefers_exact_then_prefix_matches():
+    """Lookup by number or name resolves to the intended heading."""
+    sections = [{"title": t} for t in ["Method", "2 Method Details", "4 Experiments"]]
+    assert find_section(sections, "method")["title"] == "Method"
+    assert find_section(sections, "4")["title"] == "4 Experiments"
+    assert find_section(sections, "details")["title"] == "2 Method Details"
+    assert find_section(sections, "Appendix") is None
@@ -0,0 +1,76 @@
+"""Tests for the paper vector index."""
+
+import random
+
+import numpy as np
+from arxiv_mcp_server.storage import VectorIndex
+from arxiv_mcp_server.storage.vectors import VectorModel, term_counts
+
+TOPICS = {
+    "graph": "graph node edge message passing neural network vertex".split(),
+    "quantum": "quantum qubit entanglement error correction surface code".split(),
+    "vision": "image pixel convolution segmentation detection camera".split(),
+}
+COMMON = "the method results paper propose show experiments".split()
+
+
+def _library(tmp_path, per_topic=4):
+    rng = random.Random(1)
+    papers = []
+    for topic, words in TOPICS.items():
+        for i in range(per_topic):
+            path = tmp_path / f"{topic}{i}.md"
+            path.write_text(" ".join(rng.choices(words * 3 + COMMON, k=300)))
+            papers.append((f"{topic}{i}", path, topic))
+    return papers
+
+
+def test_term_counts_merge_words():
+    """Words are lower-cased and counted; short tokens are ignored."""
+    features, counts = term_counts("Graph graph GRAPH of nodes")
+    assert len(features) == 2
+    assert sorted(counts) == [1.0, 3.0]
+    assert np.all(np.diff(features) > 0)
+
+
+def test_model_projects_unit_vectors(tmp_path):
+    """Fitted models give unit vectors of the requested dimensionality."""
+    documents = [term_counts(path.read_text()) for _, path, _ in _library(tmp_path)]
+    model = VectorModel.fit(documents, 4, 1000)
+    vector = model.project(documents[0])
+    assert vector.shape == (4,)
+    assert np.isclose(np.linalg.norm(vector), 1.0, atol=1e-5)
+
+    model.save(tmp_path / "model.npz")
+    loaded = VectorModel.load(tmp_path / "model.npz")
+    assert np.allclose(loaded.project(documents[0]), vector)
+
+
+def test_similar_papers_share_a_topic(tmp_path):
+    """Nearest neighbours come from the same topic, never the paper itself."""
+    index = VectorIndex(tmp_path / "vectors", 8, 1000, 100)
+    for paper_id, path, title in _library(tmp_path):
+        index.add(paper_id, path, title)
+
+    results = index.similar("graph0", 3)
+    assert [r["title"] for r in results] == ["graph"] * 3
+    assert "graph0" not in {r["id"] for r in results}
+    assert results[0]["score"] >= results[-1]["score"]
+    assert index.stats()["papers"] == 12
+
+
+def test_index_reopens_and_folds_in_new_papers(tmp_path):
+    """A reopened index keeps its vectors; papers added later are projected."""
+    papers = _library(tmp_path)
+    index = VectorIndex(tmp_path / "vectors", 8, 1000, 6)
+    index.sync(papers[:-1])
+    fitted = index.stats()["fitted"]
+    assert fitted == 6
+
+    reopened = VectorIndex(tmp_path / "vectors", 8, 1000, 6)
+    reopened.add(*papers[-1])
+    assert reopened.stats()["fitted"] == fitted
+    assert reopened.similar("vision3", 2)[0]["title"] == "vision"
+
+    reopened.remove("vision3")
+    assert "vision3" not in {r["id"] for r in reopened.similar("vision0", 11)}
@@ -0,0 +1,181 @@
+"""Tests for the asynchronous arXiv access layer."""
+
+import asyncio
+import time
+import urllib.error
+import pytest
+from unittest.mock import MagicMock, patch
+import arxiv
+from arxiv_mcp_server import arxiv_client
+
+
+@pytest.mark.asyncio
+async def test_search_does_not_block_event_loop(mock_paper):
+    """A slow upstream call leaves the loop free to run other tasks."""
+
+    def slow_results(search, offset=0):
+        time.sleep(0.3)
+        return iter([mock_paper])
+
+    client = MagicMock(spec=arxiv.Client)
+    client.results.side_effect = slow_results
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    with patch("arxiv.Client", return_value=client):
+        ticker_task = asyncio.create_task(ticker())
+        results = await arxiv_client.search(arxiv.Search(query="test"))
+        ticker_task.cancel()
+
+    assert results == [mock_paper]
+    assert ticks > 5
+
+
+@pytest.mark.asyncio
+async def test_fetch_paper_not_found():
+    """An empty id_list lookup resolves to None instead of raising."""
+    client = MagicMock(spec=arxiv.Client)
+    client.results.side_effect = StopIteration()
+
+    with patch("arxiv.Client", return_value=client):
+        assert await arxiv_client.fetch_paper("invalid.12345") is None
+
+
+@pytest.mark.asyncio
+async def test_client_is_shared_across_calls(mock_client):
+    """All calls reuse one long-lived arxiv.Client."""
+    with patch("arxiv.Client", return_value=mock_client) as client_cls:
+        await arxiv_client.search(arxiv.Search(query="a"))
+        await arxiv_client.fetch_paper("2103.12345")
+    assert client_cls.call_count == 1
+    assert mock_client.results.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_requests_in_order():
+    """Requests beyond the burst wait for the interval and are served FIFO."""
+    limiter = arxiv_client.RateLimiter(interval=0.05, burst=1)
+    order = []
+
+    async def worker(i):
+        await limiter.acquire()
+        order.append((i, time.monotonic()))
+
+    await asyncio.gather(*(worker(i) for i in range(4)))
+
+    assert [i for i, _ in order] == [0, 1, 2, 3]
+    gaps = [b - a for (_, a), (_, b) in zip(order, order[1:])]
+    assert all(gap >= 0.04 for gap in gaps)
+    stats = limiter.stats()
+    assert stats["requests"] == 4
+    assert stats["queue_depth"] == 0
+    assert stats["max_wait_seconds"] >= 0.12
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_are_batched(monkeypatch):
+    """Lookups issued together become ceil(N / BATCH_SIZE) id_list queries."""
+    from arxiv_mcp_server.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "BATCH_SIZE", 20)
+
+    def results(search, offset=0):
+        papers = []
+        for paper_id in search.id_list:
+            paper = MagicMock(spec=arxiv.Result)
+            paper.get_short_id.return_value = f"{paper_id}v1"
+            papers.append(paper)
+        return iter(papers)
+
+    client = MagicMock(spec=arxiv.Client)
+    client.results.side_effect = results
+    paper_ids = [f"2401.{i:05d}" for i in range(45)]
+
+    with patch("arxiv.Client", return_value=client):
+        papers = await asyncio.gather(
+            *(arxiv_client.fetch_paper(paper_id) for paper_id in paper_ids)
+        )
+
+    assert client.results.call_count == 3
+    assert [p.get_short_id() for p in papers] == [f"{i}v1" for i in paper_ids]
+    batch_sizes = [len(c.args[0].id_list) for c in client.results.call_args_list]
+    assert sorted(batch_sizes) == [5, 20, 20]
+
+
+@pytest.mark.asyncio
+async def test_throttled_requests_are_retried_through_the_limiter(mock_paper):
+    """A 503 is retried by the service, each attempt taking a limiter slot."""
+    client = MagicMock(spec=arxiv.Client)
+    client.results.side_effect = [
+        arxiv.HTTPError("http://export.arxiv.org/api/query", 0, 503),
+        iter([mock_paper]),
+    ]
+
+    with patch("arxiv.Client", return_value=client) as client_cls:
+        results = await arxiv_client.search(arxiv.Search(query="test"))
+
+    assert results == [mock_paper]
+    assert client_cls.call_args.kwargs["num_retries"] == 0
+    assert arxiv_client.get_arxiv_service().limiter.requests == 2
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    """A 400 response fails immediately instead of being retried."""
+    client = MagicMock(spec=arxiv.Client)
+    client.results.side_effect = arxiv.HTTPError("http://example.com", 0, 400)
+
+    with patch("arxiv.Client", return_value=client):
+        with pytest.raises(arxiv.HTTPError):
+            await arxiv_client.search(arxiv.Search(query="test"))
+
+    assert client.results.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_pdf_download_is_not_retried(mock_paper, tmp_path):
+    """A 404 from the PDF download fails immediately instead of being retried."""
+    mock_paper.download_pdf.side_effect = urllib.error.HTTPError(
+        "https://arxiv.org/pdf/2103.12345", 404, "Not Found", {}, None
+    )
+
+    with pytest.raises(urllib.error.HTTPError):
+        await arxiv_client.download_pdf(mock_paper, tmp_path / "2103.12345.pdf")
+
+    assert mock_paper.download_pdf.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_bad_id_only_fails_its_own_lookup(monkeypatch):
+    """A batch rejected because of one ID is split so other callers succeed."""
+    from arxiv_mcp_server.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "BATCH_SIZE", 20)
+
+    def results(search, offset=0):
+        if "bad-id" in search.id_list:
+            raise arxiv.HTTPError("http://export.arxiv.org/api/query", 0, 400)
+        papers = []
+        for paper_id in search.id_list:
+            paper = MagicMock(spec=arxiv.Result)
+            paper.get_short_id.return_value = f"{paper_id}v1"
+            papers.append(paper)
+        return iter(papers)
+
+    client = MagicMock(spec=arxiv.Client)
+    client.results.side_effect = results
+    paper_ids = [f"2401.{i:05d}" for i in range(5)] + ["bad-id"]
+
+    with patch("arxiv.Client", return_value=client):
+        papers = await asyncio.gather(
+            *(arxiv_client.fetch_paper(paper_id) for paper_id in paper_ids),
+            return_exceptions=True,
+        )
+
+    assert [p.get_short_id() for p in papers[:5]] == [f"{i}v1" for i in paper_ids[:5]]
+    assert isinstance(papers[5], arxiv.HTTPError)
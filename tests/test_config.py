@@ -2,10 +2,14 @@
 
 import os
 import sys
+import pytest
 from pathlib import Path
 from arxiv_mcp_server.config import Settings, reset_settings
 from unittest.mock import patch
 
+# 这些测试检查存储路径的解析，不能使用测试隔离设置的ARXIV_STORAGE_PATH
+pytestmark = pytest.mark.default_storage
+
 
 @patch.object(Path, "mkdir")
 @patch.object(Path, "resolve")
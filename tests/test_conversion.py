@@ -0,0 +1,113 @@
+"""Tests for PDF to markdown conversion in worker processes."""
+
+import pymupdf
+import pymupdf4llm
+import pytest
+from arxiv_mcp_server import conversion
+from arxiv_mcp_server.config import get_settings
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    """Write a small one-page PDF."""
+    path = tmp_path / "sample.pdf"
+    doc = pymupdf.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), "Attention is all you need")
+    doc.save(path)
+    doc.close()
+    return path
+
+
+@pytest.fixture
+def thesis_pdf(tmp_path):
+    """Write a five-page PDF with a heading on every page."""
+    path = tmp_path / "thesis.pdf"
+    doc = pymupdf.open()
+    for i in range(5):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Chapter {i}", fontsize=20)
+        page.insert_text((72, 120), f"Body of chapter {i}", fontsize=10)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+@pytest.mark.asyncio
+async def test_converts_in_process_pool(monkeypatch, sample_pdf, tmp_path):
+    """Conversions run in a recycled process pool when enabled."""
+    monkeypatch.setattr(get_settings(), "CONVERT_PROCESSES", 1)
+    monkeypatch.setattr(get_settings(), "CONVERT_MAX_TASKS_PER_CHILD", 1)
+
+    first, second = tmp_path / "first.md", tmp_path / "second.md"
+    await conversion.convert_to_file(sample_pdf, first)
+    await conversion.convert_to_file(sample_pdf, second)
+
+    assert "Attention is all you need" in first.read_text()
+    assert second.read_text() == first.read_text()
+    pool = conversion.get_process_pool()
+    assert pool._max_tasks_per_child == 1
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_threads(sample_pdf, tmp_path):
+    """With no conversion processes configured, threads are used."""
+    assert conversion.get_process_pool() is None
+    md_path = tmp_path / "sample.md"
+    await conversion.convert_to_file(sample_pdf, md_path)
+    assert "Attention is all you need" in md_path.read_text()
+
+
+def test_split_pages_covers_document_in_order():
+    """Page ranges are contiguous, balanced and cover every page once."""
+    ranges = conversion.split_pages(10, 3)
+    assert ranges == [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]
+    assert conversion.split_pages(2, 4) == [[0], [1]]
+
+
+@pytest.mark.asyncio
+async def test_large_pdf_is_converted_in_parts(monkeypatch, thesis_pdf, tmp_path):
+    """Split conversion stitches the same markdown as a serial conversion."""
+    serial = pymupdf4llm.to_markdown(str(thesis_pdf), show_progress=False)
+
+    monkeypatch.setattr(get_settings(), "CONVERT_PROCESSES", 2)
+    monkeypatch.setattr(get_settings(), "CONVERT_SPLIT_PAGES", 3)
+    calls = []
+    original = conversion.split_pages
+    monkeypatch.setattr(
+        conversion,
+        "split_pages",
+        lambda count, parts: calls.append(count) or original(count, parts),
+    )
+
+    md_path = tmp_path / "thesis.md"
+    await conversion.convert_to_file(thesis_pdf, md_path)
+
+    assert md_path.read_text(encoding="utf-8") == serial
+    assert calls == [5]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["thesis.md", "thesis.pdf"]
+
+
+@pytest.mark.asyncio
+async def test_page_offsets_locate_each_page(thesis_pdf, tmp_path):
+    """The returned offsets delimit each page's markdown in the file."""
+    md_path = tmp_path / "thesis.md"
+    offsets = await conversion.convert_to_file(thesis_pdf, md_path)
+
+    data = md_path.read_bytes()
+    assert len(offsets) == 6
+    assert offsets[-1] == len(data)
+    page = data[offsets[2] : offsets[3]].decode("utf-8")
+    assert "Chapter 2" in page and "Chapter 3" not in page
+
+
+@pytest.mark.asyncio
+async def test_failed_conversion_leaves_no_partial_file(tmp_path):
+    """A conversion error removes the temporary output."""
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"not a pdf")
+    md_path = tmp_path / "broken.md"
+
+    with pytest.raises(Exception):
+        await conversion.convert_to_file(broken, md_path)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["broken.pdf"]
@@ -0,0 +1,90 @@
+"""Tests for the bounded download/convert work queues."""
+
+import asyncio
+import json
+import pytest
+from arxiv_mcp_server.jobs import QueueFullError, WorkQueue
+from arxiv_mcp_server.tools import download
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_jobs_run_first():
+    """Lower priority values are served first, ties in submission order."""
+    order = []
+    gate = asyncio.Event()
+
+    async def handler(item):
+        await gate.wait()
+        order.append(item)
+
+    queue = WorkQueue("test", handler, workers=1)
+    queue.submit("blocker", "blocker")
+    await asyncio.sleep(0)  # 让工作者取走第一个任务
+    queue.submit("a", "a", priority=2)
+    queue.submit("b", "b", priority=1)
+    queue.submit("c", "c", priority=0)
+    queue.submit("d", "d", priority=1)
+    assert queue.position("c") == 1
+    assert queue.position("a") == 4
+
+    gate.set()
+    while queue.stats()["waiting"] or queue.active:
+        await asyncio.sleep(0.01)
+    assert order == ["blocker", "c", "b", "d", "a"]
+    queue.close()
+
+
+@pytest.mark.asyncio
+async def test_submit_rejects_when_full():
+    """A full queue rejects new jobs instead of growing."""
+    gate = asyncio.Event()
+
+    async def handler(item):
+        await gate.wait()
+
+    queue = WorkQueue("test", handler, workers=1, maxsize=2)
+    queue.submit(0, 0)
+    await asyncio.sleep(0)
+    queue.submit(1, 1)
+    queue.submit(2, 2)
+    assert queue.full()
+    with pytest.raises(QueueFullError):
+        queue.submit(3, 3)
+    assert queue.stats() == {"waiting": 2, "active": 1, "workers": 1, "capacity": 2}
+    gate.set()
+    queue.close()
+
+
+@pytest.mark.asyncio
+async def test_download_reports_queue_full(mocker, mock_paper):
+    """download_paper answers with queue_full instead of queueing unboundedly."""
+    mocker.patch.object(download.settings, "DOWNLOAD_QUEUE_SIZE", 1)
+    mocker.patch.object(download.settings, "DOWNLOAD_WORKERS", 1)
+    mocker.patch("arxiv_mcp_server.arxiv_client.fetch_paper", return_value=mock_paper)
+    gate = asyncio.Event()
+
+    async def slow_download(paper, pdf_path):
+        await gate.wait()
+
+    mocker.patch(
+        "arxiv_mcp_server.arxiv_client.download_pdf", side_effect=slow_download
+    )
+
+    first = json.loads((await download.handle_download({"paper_id": "1"}))[0].text)
+    await asyncio.sleep(0)  # 第一个任务进入下载
+    second = json.loads((await download.handle_download({"paper_id": "2"}))[0].text)
+    third = json.loads((await download.handle_download({"paper_id": "3"}))[0].text)
+
+    assert first["status"] == "queued"
+    assert second == {**second, "status": "queued", "queue_position": 1}
+    assert third["status"] == "queue_full"
+    assert "3" not in download.conversion_statuses
+
+    status = json.loads(
+        (await download.handle_download({"paper_id": "2", "check_status": True}))[
+            0
+        ].text
+    )
+    assert status["stage"] == "download"
+    assert status["queue_position"] == 1
+    gate.set()
@@ -144,32 +144,33 @@ async def test_list_papers_interface():
 
 # 测试阅读论文接口
 @pytest.mark.asyncio
-async def test_read_paper_interface():
+async def test_read_paper_interface(tmp_path):
     """测试阅读论文接口"""
     from arxiv_mcp_server.tools.read_paper import handle_read_paper
     
     paper_id = "2103.12345"
     test_content = "# Test Paper\nThis is test content with $formula$"
+    paper_path = tmp_path / f"{paper_id}.md"
+    paper_path.write_text(test_content, encoding="utf-8")
     
     # 验证能正确解析论文内容
-    with patch("arxiv_mcp_server.tools.read_paper.list_papers", return_value=[paper_id]):
-        with patch("pathlib.Path.read_text", return_value=test_content):
-            result = await handle_read_paper({"paper_id": paper_id})
-            assert len(result) == 1
-            # 检查返回的是TextContent对象
-            assert isinstance(result[0], types.TextContent)
+    with patch("arxiv_mcp_server.tools.read_paper.find_paper", return_value=paper_path):
+        result = await handle_read_paper({"paper_id": paper_id})
+        assert len(result) == 1
+        # 检查返回的是TextContent对象
+        assert isinstance(result[0], types.TextContent)
+        content = json.loads(result[0].text)
+        assert content["status"] == "success"
+        assert content["paper_id"] == paper_id
+        assert "content" in content
+        assert "$formula$" in content["content"]
+        
+        # 验证无效论文ID的处理
+        with patch("arxiv_mcp_server.tools.read_paper.find_paper", return_value=None):
+            result = await handle_read_paper({"paper_id": "invalid.12345"})
             content = json.loads(result[0].text)
-            assert content["status"] == "success"
-            assert content["paper_id"] == paper_id
-            assert "content" in content
-            assert "$formula$" in content["content"]
-            
-            # 验证无效论文ID的处理
-            with patch("arxiv_mcp_server.tools.read_paper.list_papers", return_value=[]):
-                result = await handle_read_paper({"paper_id": "invalid.12345"})
-                content = json.loads(result[0].text)
-                assert content["status"] == "error"
-                assert "not found" in content["message"]
+            assert content["status"] == "error"
+            assert "not found" in content["message"]
 
 # 测试提示管理接口
 @pytest.mark.asyncio
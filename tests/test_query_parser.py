@@ -0,0 +1,35 @@
+"""Tests for compiling arXiv query syntax for local search."""
+
+import pytest
+from arxiv_mcp_server.query_parser import QuerySyntaxError, compile_query
+
+
+def test_fields_phrases_and_operators():
+    """Field prefixes map to index columns and ANDNOT becomes NOT."""
+    assert compile_query('ti:"graph networks" AND au:Smith') == (
+        'ti : "graph networks" AND au : "Smith"'
+    )
+    assert compile_query("abs:quantum ANDNOT cat:cs.AI") == (
+        'abs : "quantum" NOT cat : "cs.AI"'
+    )
+    assert compile_query('all:"deep learning" OR transformer*') == (
+        '"deep learning" OR "transformer" *'
+    )
+
+
+def test_field_groups_and_author_initials():
+    """Parenthesised groups keep their field and au:Surname_I matches initials."""
+    assert compile_query("ti:(graph OR tree)") == 'ti : ( "graph" OR "tree" )'
+    assert compile_query("au:Hinton_G") == 'au : ("Hinton" AND "G" *)'
+
+
+def test_terms_cannot_inject_fts_syntax():
+    """Punctuation inside terms is quoted rather than interpreted."""
+    assert compile_query("NEAR(a b) c-d:e^2") == '"NEAR" ( "a" "b" ) "c-d:e^2"'
+
+
+@pytest.mark.parametrize("query", ["", "   ", "xx:term", 'ti:""', 'open "quote'])
+def test_invalid_queries(query):
+    """Empty queries and unknown fields are rejected."""
+    with pytest.raises(QuerySyntaxError):
+        compile_query(query)
@@ -0,0 +1,104 @@
+"""Tests for concurrent request dispatch in the stdio main loop."""
+
+import asyncio
+import anyio
+import pytest
+import mcp.types as types
+from unittest.mock import patch
+from mcp.shared.message import SessionMessage
+from mcp.types import JSONRPCMessage, JSONRPCNotification, JSONRPCRequest
+from arxiv_mcp_server.server import serve
+
+
+def _request(request_id, method, params=None):
+    return SessionMessage(
+        JSONRPCMessage(
+            JSONRPCRequest(jsonrpc="2.0", id=request_id, method=method, params=params)
+        )
+    )
+
+
+def _cancel(request_id):
+    return SessionMessage(
+        JSONRPCMessage(
+            JSONRPCNotification(
+                jsonrpc="2.0",
+                method="notifications/cancelled",
+                params={"requestId": request_id, "reason": "test"},
+            )
+        )
+    )
+
+
+async def _fake_call_tool(name, arguments):
+    if name == "slow":
+        await asyncio.sleep(arguments.get("delay", 0.2))
+    return [types.TextContent(type="text", text=name)]
+
+
+@pytest.mark.asyncio
+async def test_responses_written_as_requests_complete():
+    """A fast request is answered before a slow one received earlier."""
+    client_send, server_read = anyio.create_memory_object_stream(10)
+    server_write, client_read = anyio.create_memory_object_stream(10)
+
+    with patch("arxiv_mcp_server.server.call_tool", side_effect=_fake_call_tool):
+        await client_send.send(_request(1, "slow"))
+        await client_send.send(_request(2, "fast"))
+        await client_send.aclose()
+        await serve(server_read, server_write)
+
+    first = await client_read.receive()
+    second = await client_read.receive()
+    assert first.message.root.id == 2
+    assert second.message.root.id == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_gets_no_response():
+    """notifications/cancelled aborts the matching in-flight request."""
+    client_send, server_read = anyio.create_memory_object_stream(10)
+    server_write, client_read = anyio.create_memory_object_stream(10)
+
+    with patch("arxiv_mcp_server.server.call_tool", side_effect=_fake_call_tool):
+        await client_send.send(_request(1, "slow", {"delay": 5}))
+        await client_send.send(_cancel(1))
+        await client_send.send(_request(2, "fast"))
+        await client_send.aclose()
+        with anyio.fail_after(2):
+            await serve(server_read, server_write)
+
+    responses = []
+    while True:
+        try:
+            responses.append(client_read.receive_nowait())
+        except anyio.WouldBlock:
+            break
+    assert [r.message.root.id for r in responses] == [2]
+
+
+@pytest.mark.asyncio
+async def test_reused_id_stays_cancellable():
+    """A finished request does not unregister a newer request with its ID."""
+    client_send, server_read = anyio.create_memory_object_stream(10)
+    server_write, client_read = anyio.create_memory_object_stream(10)
+
+    with patch("arxiv_mcp_server.server.call_tool", side_effect=_fake_call_tool):
+        server = asyncio.create_task(serve(server_read, server_write))
+        await client_send.send(_request(1, "slow", {"delay": 0.1}))
+        await client_send.send(_request(1, "slow", {"delay": 0.5}))
+        await asyncio.sleep(0.3)
+        await client_send.send(_cancel(1))
+        await client_send.aclose()
+        with anyio.fail_after(2):
+            await server
+        # 未被取消的请求会在此期间写回第二个响应
+        await asyncio.sleep(0.5)
+
+    responses = []
+    while True:
+        try:
+            responses.append(client_read.receive_nowait())
+        except anyio.WouldBlock:
+            break
+    assert [r.message.root.id for r in responses] == [1]
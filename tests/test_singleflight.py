@@ -0,0 +1,58 @@
+"""Tests for single-flight coalescing of identical requests."""
+
+import asyncio
+import pytest
+from arxiv_mcp_server.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    """Callers with the same key get the result of a single run."""
+    flight = SingleFlight("test")
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "result"
+
+    results = await asyncio.gather(*(flight.do("k", fetch) for _ in range(5)))
+
+    assert results == ["result"] * 5
+    assert calls == 1
+    assert flight.stats() == {"in_flight": 0, "shared": 4}
+
+
+@pytest.mark.asyncio
+async def test_exception_reaches_every_waiter():
+    """A failed upstream call fails all of its waiters."""
+    flight = SingleFlight("test")
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        flight.do("k", fail), flight.do("k", fail), return_exceptions=True
+    )
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_abort_shared_call():
+    """Cancelling one waiter leaves the others with a result."""
+    flight = SingleFlight("test")
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "result"
+
+    first = asyncio.create_task(flight.do("k", fetch))
+    second = asyncio.create_task(flight.do("k", fetch))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == "result"
+    with pytest.raises(asyncio.CancelledError):
+        await first
@@ -0,0 +1,45 @@
+"""Tests for the citation graph tools."""
+
+import json
+import pytest
+from arxiv_mcp_server.storage import get_catalog, get_metadata_index
+from arxiv_mcp_server.tools import handle_get_citing_papers, handle_get_references
+
+
+@pytest.mark.asyncio
+async def test_references_and_citing_papers(storage_path):
+    """Stored papers are linked through their reference sections."""
+    citing = storage_path / "Citing.md"
+    citing.write_text(
+        "# Citing\n\n## References\n\n[1] arXiv:2000.00002\n[2] arXiv:2000.00003\n",
+        encoding="utf-8",
+    )
+    cited = storage_path / "Cited.md"
+    cited.write_text("# Cited\n\nNo references.", encoding="utf-8")
+    get_catalog().add("2000.00001", citing, "Citing")
+    get_catalog().add("2000.00002", cited, "Cited")
+    get_metadata_index().upsert({"id": "2000.00003v1", "title": "Seen Before"})
+
+    result = await handle_get_references({"paper_id": "2000.00001"})
+    content = json.loads(result[0].text)
+    assert content["references"] == [
+        {"id": "2000.00002", "type": "arxiv", "in_library": True, "title": "Cited"},
+        {
+            "id": "2000.00003",
+            "type": "arxiv",
+            "in_library": False,
+            "title": "Seen Before",
+        },
+    ]
+
+    result = await handle_get_citing_papers({"paper_id": "2000.00002v1"})
+    content = json.loads(result[0].text)
+    assert content["papers"] == [{"id": "2000.00001", "title": "Citing"}]
+
+
+@pytest.mark.asyncio
+async def test_references_of_unknown_paper(storage_path):
+    """Papers that are not stored are reported as errors."""
+    result = await handle_get_references({"paper_id": "2000.99999"})
+    content = json.loads(result[0].text)
+    assert content["status"] == "error"
@@ -103,4 +103,168 @@ async def test_check_unknown_status():
     
     response = await handle_download({"paper_id": paper_id, "check_status": True})
     status = json.loads(response[0].text)
-    assert status["status"] == "unknown"
\ No newline at end of file
+    assert status["status"] == "unknown"
+
+@pytest.mark.asyncio
+async def test_dedup_skips_conversion_of_near_duplicate(mocker, storage_path):
+    """A PDF nearly identical to a stored paper is dropped before conversion."""
+    from arxiv_mcp_server.storage import get_catalog
+    from arxiv_mcp_server.tools.download import (
+        ConversionStatus,
+        DownloadJob,
+        _run_conversion,
+    )
+
+    body = " ".join(f"word{i}" for i in range(2000))
+    stored = storage_path / "2101.00001v1.md"
+    stored.write_text(body, encoding="utf-8")
+    get_catalog().add("2101.00001v1", stored, None)
+
+    pdf_path = storage_path / "2101.00001v2.pdf"
+    pdf_path.write_bytes(b"%PDF")
+    mocker.patch(
+        "arxiv_mcp_server.conversion.extract_text",
+        mocker.AsyncMock(return_value=body + " minor fix"),
+    )
+    convert = mocker.patch("arxiv_mcp_server.tools.download.convert_pdf_to_markdown")
+    conversion_statuses["2101.00001v2"] = ConversionStatus(
+        "2101.00001v2", "queued", datetime.now()
+    )
+
+    await _run_conversion(DownloadJob("2101.00001v2", None, None, pdf_path, dedup=True))
+
+    status = conversion_statuses.pop("2101.00001v2")
+    assert status.status == "duplicate"
+    assert status.duplicate_of == "2101.00001v1"
+    assert not pdf_path.exists()
+    convert.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_dedup_on_cold_index_does_not_block_event_loop(mocker, storage_path):
+    """Building the MinHash index for a dedup check runs off the event loop."""
+    import asyncio
+    import time
+    from arxiv_mcp_server.storage import get_catalog
+    from arxiv_mcp_server.storage.minhash import MinHashIndex
+    from arxiv_mcp_server.tools.download import (
+        ConversionStatus,
+        DownloadJob,
+        _run_conversion,
+    )
+
+    body = " ".join(f"word{i}" for i in range(2000))
+    stored = storage_path / "2101.00001v1.md"
+    stored.write_text(body, encoding="utf-8")
+    get_catalog().add("2101.00001v1", stored, None)
+
+    # 模拟首次使用时对大型论文库计算签名
+    sync = MinHashIndex.sync
+
+    def slow_sync(self, papers):
+        time.sleep(0.3)
+        return sync(self, papers)
+
+    mocker.patch.object(MinHashIndex, "sync", slow_sync)
+    pdf_path = storage_path / "2101.00001v2.pdf"
+    pdf_path.write_bytes(b"%PDF")
+    mocker.patch(
+        "arxiv_mcp_server.conversion.extract_text",
+        mocker.AsyncMock(return_value=body + " minor fix"),
+    )
+    mocker.patch("arxiv_mcp_server.tools.download.convert_pdf_to_markdown")
+    conversion_statuses["2101.00001v2"] = ConversionStatus(
+        "2101.00001v2", "queued", datetime.now()
+    )
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker_task = asyncio.create_task(ticker())
+    await _run_conversion(DownloadJob("2101.00001v2", None, None, pdf_path, dedup=True))
+    ticker_task.cancel()
+
+    assert conversion_statuses.pop("2101.00001v2").status == "duplicate"
+    assert ticks > 5
+
+
+@pytest.mark.asyncio
+async def test_download_uses_catalogued_metadata(mocker, storage_path):
+    """Papers already in the metadata catalog are queued without a lookup."""
+    from arxiv_mcp_server.storage import get_metadata_index
+    from arxiv_mcp_server.tools.download import get_job_queues
+
+    get_metadata_index().upsert(
+        {
+            "id": "2103.54321v2",
+            "title": "Catalogued Paper",
+            "authors": ["Ada Lovelace"],
+            "summary": "Seen in a search",
+            "links": ["https://arxiv.org/abs/2103.54321v2"],
+            "pdf_url": "https://arxiv.org/pdf/2103.54321v2",
+        }
+    )
+    fetch = mocker.patch("arxiv_mcp_server.arxiv_client.fetch_paper")
+    submit = mocker.patch.object(get_job_queues()[0], "submit", return_value=1)
+
+    response = await handle_download({"paper_id": "2103.54321"})
+
+    assert json.loads(response[0].text)["status"] == "queued"
+    fetch.assert_not_called()
+    job = submit.call_args.args[1]
+    assert job.paper.pdf_url == "https://arxiv.org/pdf/2103.54321v2"
+    assert job.paper_title == "Catalogued Paper"
+
+
+@pytest.mark.asyncio
+async def test_download_new_version_is_deduplicated(mocker, storage_path):
+    """Requesting v2 with v1 stored downloads it and flags it as a duplicate."""
+    import asyncio
+    from arxiv_mcp_server.storage import get_catalog, result_from_metadata
+
+    body = " ".join(f"word{i}" for i in range(2000))
+    v1_path = get_paper_path("2101.00001v1", "Same Title")
+    v1_path.write_text(body, encoding="utf-8")
+    get_catalog().add("2101.00001v1", v1_path, "Same Title")
+
+    paper = result_from_metadata(
+        {"id": "2101.00001v2", "title": "Same Title", "authors": []}
+    )
+    mocker.patch(
+        "arxiv_mcp_server.arxiv_client.fetch_paper",
+        mocker.AsyncMock(return_value=paper),
+    )
+    pdf_paths = []
+
+    async def download_pdf(paper, pdf_path):
+        pdf_paths.append(pdf_path)
+        pdf_path.write_bytes(b"%PDF")
+        return pdf_path
+
+    mocker.patch("arxiv_mcp_server.arxiv_client.download_pdf", download_pdf)
+    mocker.patch(
+        "arxiv_mcp_server.conversion.extract_text",
+        mocker.AsyncMock(return_value=body + " minor fix"),
+    )
+
+    response = await handle_download({"paper_id": "2101.00001v2", "dedup": True})
+    assert json.loads(response[0].text)["status"] == "queued"
+
+    for _ in range(100):
+        response = await handle_download(
+            {"paper_id": "2101.00001v2", "check_status": True}
+        )
+        status = json.loads(response[0].text)
+        if status["status"] not in ("queued", "downloading", "converting"):
+            break
+        await asyncio.sleep(0.02)
+
+    assert status["status"] == "duplicate"
+    assert status["duplicate_of"] == "2101.00001v1"
+    assert pdf_paths[0].name == "Same_Title_2101.00001v2.pdf"
+    assert not pdf_paths[0].exists()
+    assert v1_path.read_text(encoding="utf-8") == body
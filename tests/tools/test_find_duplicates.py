@@ -0,0 +1,66 @@
+"""Tests for near-duplicate and version detection over the local library."""
+
+import json
+import pytest
+from arxiv_mcp_server.storage import get_catalog
+from arxiv_mcp_server.tools import handle_find_duplicates
+from arxiv_mcp_server.tools.download import get_paper_path
+
+
+def _store(storage_path, paper_id, text, title=None):
+    md_path = storage_path / f"{paper_id}.md"
+    md_path.write_text(text, encoding="utf-8")
+    get_catalog().add(paper_id, md_path, title)
+
+
+@pytest.mark.asyncio
+async def test_find_duplicates_reports_versions_and_near_duplicates(storage_path):
+    """Pairs are labelled by whether they share an arXiv ID."""
+    body = " ".join(f"word{i}" for i in range(2000))
+    _store(storage_path, "2101.00001v1", body, "Paper")
+    _store(storage_path, "2101.00001v2", "completely rewritten second version")
+    _store(storage_path, "2202.00002", body + " journal version", "Paper (journal)")
+    _store(storage_path, "2303.00003", "an unrelated paper about qubits")
+
+    result = await handle_find_duplicates({})
+    content = json.loads(result[0].text)
+    pairs = {
+        tuple(p["id"] for p in pair["papers"]): pair for pair in content["duplicates"]
+    }
+    assert pairs[("2101.00001v1", "2202.00002")]["relation"] == "near_duplicate"
+    assert pairs[("2101.00001v1", "2202.00002")]["similarity"] > 0.8
+    assert pairs[("2101.00001v1", "2101.00001v2")]["relation"] == "version"
+    assert content["total_results"] == 2
+
+    result = await handle_find_duplicates({"paper_id": "2202.00002"})
+    content = json.loads(result[0].text)
+    assert [[p["id"] for p in pair["papers"]] for pair in content["duplicates"]] == [
+        ["2202.00002", "2101.00001v1"]
+    ]
+
+    # 未带版本号的ID解析为已存储的最新版本
+    result = await handle_find_duplicates({"paper_id": "2101.00001"})
+    content = json.loads(result[0].text)
+    assert [[p["id"] for p in pair["papers"]] for pair in content["duplicates"]] == [
+        ["2101.00001v2", "2101.00001v1"]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_find_duplicates_unknown_paper(storage_path):
+    """Papers that are not stored are reported as errors."""
+    result = await handle_find_duplicates({"paper_id": "2101.99999"})
+    content = json.loads(result[0].text)
+    assert content["status"] == "error"
+    assert "not in the local library" in content["message"]
+
+
+def test_paper_path_disambiguates_same_title(storage_path):
+    """A second paper with a stored paper's title gets its ID in the filename."""
+    md_path = get_paper_path("2101.00001v1", "Same Title")
+    md_path.write_text("v1", encoding="utf-8")
+    get_catalog().add("2101.00001v1", md_path, "Same Title")
+
+    assert get_paper_path("2101.00001v1", "Same Title") == md_path
+    other = get_paper_path("2101.00001v2", "Same Title", ".pdf")
+    assert other.name == "Same_Title_2101.00001v2.pdf"
@@ -0,0 +1,67 @@
+"""Tests for listing stored papers."""
+
+import json
+import pytest
+from unittest.mock import patch
+from arxiv_mcp_server.tools import handle_list_papers
+from arxiv_mcp_server.storage import metadata_from_result, save_metadata
+
+
+@pytest.mark.asyncio
+async def test_list_papers_served_from_sidecars(mock_paper, mock_client, storage_path):
+    """Papers with a metadata sidecar are listed without contacting arXiv."""
+    md_path = storage_path / "Test_Paper.md"
+    md_path.write_text("# Test Paper", encoding="utf-8")
+    save_metadata(md_path, metadata_from_result(mock_paper, "2103.12345"))
+
+    with patch("arxiv.Client", return_value=mock_client):
+        result = await handle_list_papers({})
+
+    content = json.loads(result[0].text)
+    assert content["total_papers"] == 1
+    assert content["papers"][0]["id"] == "2103.12345"
+    assert content["papers"][0]["title"] == "Test Paper"
+    mock_client.results.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_missing_sidecar_is_backfilled_once(mock_client, storage_path):
+    """Legacy papers are fetched once, then served locally; refresh re-fetches."""
+    (storage_path / "2103.12345.md").write_text("# Test Paper", encoding="utf-8")
+
+    with patch("arxiv.Client", return_value=mock_client):
+        await handle_list_papers({})
+        result = await handle_list_papers({})
+        assert mock_client.results.call_count == 1
+
+        await handle_list_papers({"refresh": True})
+        assert mock_client.results.call_count == 2
+
+    content = json.loads(result[0].text)
+    assert content["papers"][0]["authors"] == ["John Doe", "Jane Smith"]
+
+
+@pytest.mark.asyncio
+async def test_missing_sidecar_filled_from_catalog(mock_client, storage_path):
+    """Papers seen in earlier searches are listed without contacting arXiv."""
+    from arxiv_mcp_server.storage import get_metadata_index
+
+    (storage_path / "2103.54321.md").write_text("# Paper", encoding="utf-8")
+    get_metadata_index().upsert(
+        {
+            "id": "2103.54321v1",
+            "title": "Harvested Paper",
+            "authors": ["Ada Lovelace"],
+            "summary": "Seen in a search",
+            "links": ["https://arxiv.org/abs/2103.54321v1"],
+            "pdf_url": "https://arxiv.org/pdf/2103.54321v1",
+        }
+    )
+
+    with patch("arxiv.Client", return_value=mock_client):
+        result = await handle_list_papers({})
+
+    mock_client.results.assert_not_called()
+    content = json.loads(result[0].text)
+    assert content["papers"][0]["id"] == "2103.54321"
+    assert content["papers"][0]["title"] == "Harvested Paper"
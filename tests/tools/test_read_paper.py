@@ -0,0 +1,180 @@
+"""Tests for reading stored papers."""
+
+import json
+import pymupdf
+import pytest
+from datetime import datetime
+from arxiv_mcp_server import conversion
+from arxiv_mcp_server.tools import handle_read_paper
+from arxiv_mcp_server.tools.download import (
+    ConversionStatus,
+    conversion_statuses,
+    get_paper_path,
+)
+from arxiv_mcp_server.storage import get_catalog, save_page_offsets
+
+
+@pytest.mark.asyncio
+async def test_read_title_named_paper_by_id(storage_path):
+    """A paper saved under its sanitized title is readable by arXiv ID."""
+    md_path = storage_path / "Test_Paper.md"
+    md_path.write_text("# Test Paper\nBody", encoding="utf-8")
+    get_catalog().add("2103.12345", md_path, "Test Paper")
+
+    result = await handle_read_paper({"paper_id": "2103.12345"})
+
+    content = json.loads(result[0].text)
+    assert content["status"] == "success"
+    assert content["content"] == "# Test Paper\nBody"
+
+
+def _write_pdf(path, pages):
+    doc = pymupdf.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Chapter {i + 1}", fontsize=20)
+    doc.save(path)
+    doc.close()
+
+
+@pytest.mark.asyncio
+async def test_read_page_range_of_converted_paper(storage_path):
+    """Page ranges are read from the stored markdown via its page offsets."""
+    pdf_path = storage_path / "paper.pdf"
+    _write_pdf(pdf_path, 4)
+    md_path = storage_path / "2103.12345.md"
+    save_page_offsets(md_path, await conversion.convert_to_file(pdf_path, md_path))
+    get_catalog().add("2103.12345", md_path)
+
+    result = await handle_read_paper(
+        {"paper_id": "2103.12345", "start_page": 2, "end_page": 9}
+    )
+
+    content = json.loads(result[0].text)
+    assert content["status"] == "success"
+    assert (content["start_page"], content["end_page"]) == (2, 4)
+    assert content["page_count"] == 4
+    assert not content["partial"]
+    assert "Chapter 1" not in content["content"]
+    assert "Chapter 2" in content["content"] and "Chapter 4" in content["content"]
+
+
+@pytest.mark.asyncio
+async def test_read_pages_before_conversion_finishes(storage_path, mocker):
+    """Requested pages are converted from the pending PDF and kept."""
+    conversion_statuses["2103.12345"] = ConversionStatus(
+        paper_id="2103.12345",
+        status="converting",
+        started_at=datetime.now(),
+        paper_title="Test Paper",
+    )
+    _write_pdf(get_paper_path("2103.12345", "Test Paper", ".pdf"), 5)
+    spy = mocker.spy(conversion, "convert_page_range")
+
+    for _ in range(2):
+        result = await handle_read_paper({"paper_id": "2103.12345", "start_page": 3})
+        content = json.loads(result[0].text)
+        assert content["partial"]
+        assert content["page_count"] == 5
+        assert "Chapter 3" in content["content"]
+        assert "Chapter 4" not in content["content"]
+    assert spy.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_chunked_reads_follow_cursor(storage_path):
+    """Chunks stay on character boundaries and reassemble the whole paper."""
+    text = "# Überblick\n" + "Résumé — 深度学习 " * 50
+    md_path = storage_path / "2103.12345.md"
+    md_path.write_text(text, encoding="utf-8")
+    get_catalog().add("2103.12345", md_path)
+
+    chunks, offset = [], 0
+    while offset is not None:
+        result = await handle_read_paper(
+            {"paper_id": "2103.12345", "offset": offset, "length": 7}
+        )
+        content = json.loads(result[0].text)
+        assert content["total_size"] == len(text.encode("utf-8"))
+        assert len(content["content"].encode("utf-8")) <= 7
+        chunks.append(content["content"])
+        offset = content["next_offset"]
+
+    assert "".join(chunks) == text
+
+
+@pytest.mark.asyncio
+async def test_chunk_starting_inside_character_is_aligned(storage_path):
+    """An offset inside a multi-byte character skips to the next character."""
+    md_path = storage_path / "2103.12345.md"
+    md_path.write_text("深度", encoding="utf-8")
+    get_catalog().add("2103.12345", md_path)
+
+    result = await handle_read_paper({"paper_id": "2103.12345", "offset": 1})
+
+    content = json.loads(result[0].text)
+    assert content["content"] == "度"
+    assert content["offset"] == 3
+    assert content["next_offset"] is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "arguments", [{"offset": -5}, {"length": 0}, {"offset": 0, "length": -1}]
+)
+async def test_invalid_offset_or_length_is_rejected(storage_path, arguments):
+    """Negative offsets and non-positive lengths are errors, not defaults."""
+    md_path = storage_path / "2103.12345.md"
+    md_path.write_text("# Paper", encoding="utf-8")
+    get_catalog().add("2103.12345", md_path)
+
+    result = await handle_read_paper({"paper_id": "2103.12345", **arguments})
+
+    assert json.loads(result[0].text)["status"] == "error"
+
+
+@pytest.mark.asyncio
+async def test_read_toc_and_section(storage_path):
+    """The table of contents lists sections, which can be read by name."""
+    md_path = storage_path / "2103.12345.md"
+    md_path.write_text(
+        "# Title\n\n## 1 Introduction\nIntro.\n\n## 2 Results\nNumbers.\n",
+        encoding="utf-8",
+    )
+    get_catalog().add("2103.12345", md_path)
+
+    toc = json.loads(
+        (await handle_read_paper({"paper_id": "2103.12345", "toc": True}))[0].text
+    )
+    assert [s["title"] for s in toc["sections"]] == [
+        "Title",
+        "1 Introduction",
+        "2 Results",
+    ]
+    assert "content" not in toc
+
+    result = await handle_read_paper({"paper_id": "2103.12345", "section": "2"})
+    section = json.loads(result[0].text)
+    assert section["title"] == "2 Results"
+    assert section["content"] == "## 2 Results\nNumbers.\n"
+
+    missing = await handle_read_paper({"paper_id": "2103.12345", "section": "9"})
+    assert json.loads(missing[0].text)["status"] == "error"
+
+
+@pytest.mark.asyncio
+async def test_find_within_paper(storage_path):
+    """find returns each match with its offset for a follow-up ranged read."""
+    md_path = storage_path / "2103.12345.md"
+    md_path.write_text("# Title\nWe evaluate on ImageNet.\n", encoding="utf-8")
+    get_catalog().add("2103.12345", md_path)
+
+    result = await handle_read_paper({"paper_id": "2103.12345", "find": "imagenet"})
+
+    content = json.loads(result[0].text)
+    assert content["total_matches"] == 1
+    offset = content["matches"][0]["offset"]
+    chunk = await handle_read_paper(
+        {"paper_id": "2103.12345", "offset": offset, "length": 8}
+    )
+    assert json.loads(chunk[0].text)["content"] == "ImageNet"
@@ -187,3 +187,144 @@ async def test_search_no_query_optimization(mock_client):
     bool_query = "machine learning AND deep learning"
     optimized = _optimize_query(bool_query)
     assert optimized == bool_query
+
+
+@pytest.mark.asyncio
+async def test_search_cache_hit_skips_upstream(mock_client, storage_path, monkeypatch):
+    """A repeated query is answered from the persistent cache."""
+    from arxiv_mcp_server.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "SEARCH_CACHE_ENABLED", True)
+    with patch("arxiv.Client", return_value=mock_client):
+        first = await handle_search({"query": "test  query", "max_results": 1})
+        second = await handle_search({"query": "test query", "max_results": 1})
+
+    assert first[0].text == second[0].text
+    assert mock_client.results.call_count == 1
+    assert (storage_path / ".index" / "search_cache.db").exists()
+
+
+@pytest.mark.asyncio
+async def test_search_pages_until_date_window_filled(mock_paper, monkeypatch):
+    """Client-side date filtering keeps paging until max_results is met."""
+    from copy import copy
+    from datetime import datetime, timezone
+    import arxiv
+    from arxiv_mcp_server.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "ARXIV_PAGE_SIZE", 2)
+
+    def paper(year):
+        p = copy(mock_paper)
+        p.published = datetime(year, 6, 1, tzinfo=timezone.utc)
+        return p
+
+    pages = {
+        0: [paper(2010), paper(2011)],
+        2: [paper(2023), paper(2012)],
+        4: [paper(2023)],
+    }
+    client = MagicMock(spec=arxiv.Client)
+    client.results.side_effect = lambda search, offset=0: iter(pages[offset])
+
+    with patch("arxiv.Client", return_value=client):
+        result = await handle_search(
+            {"query": "test", "date_from": "2020-01-01", "max_results": 2}
+        )
+
+    content = json.loads(result[0].text)
+    assert content["total_results"] == 2
+    assert content["pages_fetched"] == 3
+    query = client.results.call_args_list[0].args[0].query
+    assert "submittedDate:[202001010000 TO " in query
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_searches_share_upstream_call(mock_paper):
+    """Simultaneous identical queries trigger one arXiv request."""
+    import asyncio
+    import time
+    import arxiv
+
+    def slow_results(search, offset=0):
+        time.sleep(0.1)
+        return iter([mock_paper])
+
+    client = MagicMock(spec=arxiv.Client)
+    client.results.side_effect = slow_results
+
+    with patch("arxiv.Client", return_value=client):
+        results = await asyncio.gather(
+            *(
+                handle_search({"query": "same query", "max_results": 1})
+                for _ in range(3)
+            )
+        )
+
+    assert len({r[0].text for r in results}) == 1
+    assert client.results.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_local_only_search_uses_catalog(mock_client):
+    """local_only answers from the metadata catalog without calling arXiv."""
+    from arxiv_mcp_server.storage import get_metadata_index
+
+    get_metadata_index().upsert(
+        {
+            "id": "2103.54321v1",
+            "title": "Local Graph Paper",
+            "authors": ["Ada Lovelace"],
+            "summary": "Offline abstract",
+            "categories": ["cs.AI"],
+            "published": "2023-01-01T00:00:00+00:00",
+            "pdf_url": "https://arxiv.org/pdf/2103.54321v1",
+        }
+    )
+    with patch("arxiv.Client", return_value=mock_client):
+        result = await handle_search(
+            {"query": "ti:graph AND au:Lovelace", "local_only": True}
+        )
+
+    mock_client.results.assert_not_called()
+    content = json.loads(result[0].text)
+    assert content["source"] == "local"
+    paper = content["papers"][0]
+    assert paper["id"] == "2103.54321v1"
+    assert paper["abstract"] == "Offline abstract"
+    assert paper["resource_uri"] == "arxiv://2103.54321v1"
+
+
+@pytest.mark.asyncio
+async def test_search_falls_back_to_catalog_when_arxiv_fails(mock_client):
+    """Remote failures are answered from the catalog when it has matches."""
+    import arxiv
+    from arxiv_mcp_server.storage import get_metadata_index
+
+    get_metadata_index().upsert(
+        {"id": "2103.54321v1", "title": "Cached test paper", "authors": []}
+    )
+    mock_client.results.side_effect = arxiv.ArxivError(
+        "http://example.com", retry=3, message="API Error"
+    )
+    with patch("arxiv.Client", return_value=mock_client):
+        result = await handle_search({"query": "test", "max_results": 1})
+
+    content = json.loads(result[0].text)
+    assert content["source"] == "local"
+    assert "API Error" in content["fallback_reason"]
+    assert content["papers"][0]["id"] == "2103.54321v1"
+
+
+@pytest.mark.asyncio
+async def test_search_results_are_catalogued(mock_client):
+    """Every paper a remote search returns is recorded in the metadata catalog."""
+    from arxiv_mcp_server.storage import get_metadata_index
+
+    with patch("arxiv.Client", return_value=mock_client):
+        await handle_search({"query": "test query", "max_results": 1})
+
+    metadata = get_metadata_index().get("2103.12345")
+    assert metadata["title"] == "Test Paper"
+    assert metadata["authors"] == ["John Doe", "Jane Smith"]
+    assert metadata["categories"] == ["cs.AI", "cs.LG"]
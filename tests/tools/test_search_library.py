@@ -0,0 +1,25 @@
+"""Tests for full-text search over the local library."""
+
+import json
+import pytest
+from arxiv_mcp_server.storage import get_catalog
+from arxiv_mcp_server.tools import handle_search_library
+
+
+@pytest.mark.asyncio
+async def test_search_library_indexes_stored_papers(storage_path):
+    """Papers already in storage are indexed on first use and searchable."""
+    md_path = storage_path / "Sparse_Attention.md"
+    md_path.write_text(
+        "# Sparse Attention\nWe propose block sparse attention.", encoding="utf-8"
+    )
+    get_catalog().add("2103.12345", md_path, "Sparse Attention")
+
+    result = await handle_search_library({"query": "block sparse"})
+
+    content = json.loads(result[0].text)
+    assert content["total_results"] == 1
+    paper = content["papers"][0]
+    assert paper["id"] == "2103.12345"
+    assert paper["title"] == "Sparse Attention"
+    assert "**block**" in paper["snippet"]
@@ -0,0 +1,56 @@
+"""Tests for passage search over the local library."""
+
+import json
+import pytest
+from arxiv_mcp_server.storage import get_catalog
+from arxiv_mcp_server.tools import handle_read_paper, handle_search_passages
+
+
+@pytest.mark.asyncio
+async def test_search_passages_offsets_feed_read_paper(storage_path):
+    """Passages found for stored papers can be re-read with read_paper."""
+    md_path = storage_path / "Sparse_Attention.md"
+    md_path.write_text(
+        "# Sparse Attention\n\n"
+        + "Background. " * 300
+        + "We propose block sparse attention.",
+        encoding="utf-8",
+    )
+    get_catalog().add("2103.12345", md_path, "Sparse Attention")
+
+    result = await handle_search_passages({"query": "block sparse", "max_results": 1})
+
+    content = json.loads(result[0].text)
+    assert content["total_results"] == 1
+    passage = content["passages"][0]
+    assert passage["id"] == "2103.12345"
+    assert passage["title"] == "Sparse Attention"
+    assert "block sparse attention" in passage["text"]
+
+    read = await handle_read_paper(
+        {
+            "paper_id": "2103.12345",
+            "offset": passage["offset"],
+            "length": passage["length"],
+        }
+    )
+    assert json.loads(read[0].text)["content"] == passage["text"]
+
+
+@pytest.mark.asyncio
+async def test_search_passages_filter_accepts_unversioned_ids(storage_path):
+    """A bare ID in ``paper_ids`` matches the version the paper is stored under."""
+    for paper_id, text in (
+        ("2103.12345v2", "We propose block sparse attention."),
+        ("2104.00001v1", "Block sparse kernels for GPUs."),
+    ):
+        md_path = storage_path / f"{paper_id}.md"
+        md_path.write_text(text, encoding="utf-8")
+        get_catalog().add(paper_id, md_path, None)
+
+    result = await handle_search_passages(
+        {"query": "block sparse", "paper_ids": ["2103.12345"]}
+    )
+
+    content = json.loads(result[0].text)
+    assert [passage["id"] for passage in content["passages"]] == ["2103.12345v2"]
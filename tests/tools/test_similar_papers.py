@@ -0,0 +1,53 @@
+"""Tests for similar-paper lookups over the local library."""
+
+import json
+import pytest
+from arxiv_mcp_server.storage import get_catalog
+from arxiv_mcp_server.tools import handle_similar_papers
+
+
+@pytest.mark.asyncio
+async def test_similar_papers_ranks_stored_papers(storage_path):
+    """Stored papers are vectorized on first use and compared by content."""
+    texts = {
+        "2101.00001": "sparse attention transformer tokens " * 20,
+        "2101.00002": "sparse attention transformer blocks " * 20,
+        "2101.00003": "quantum qubit entanglement codes " * 20,
+    }
+    for paper_id, text in texts.items():
+        md_path = storage_path / f"{paper_id}.md"
+        md_path.write_text(text, encoding="utf-8")
+        get_catalog().add(paper_id, md_path, None)
+
+    result = await handle_similar_papers({"paper_id": "2101.00001"})
+
+    content = json.loads(result[0].text)
+    assert content["paper_id"] == "2101.00001"
+    assert [p["id"] for p in content["papers"]][0] == "2101.00002"
+
+
+@pytest.mark.asyncio
+async def test_similar_papers_unknown_paper(storage_path):
+    """Papers that are not stored are reported as errors."""
+    result = await handle_similar_papers({"paper_id": "2101.99999"})
+    content = json.loads(result[0].text)
+    assert content["status"] == "error"
+    assert "not in the similarity index" in content["message"]
+
+
+@pytest.mark.asyncio
+async def test_similar_papers_accepts_unversioned_id(storage_path):
+    """An ID without version finds the paper stored under a versioned ID."""
+    texts = {
+        "2101.00001v1": "sparse attention transformer tokens " * 20,
+        "2101.00002v1": "sparse attention transformer blocks " * 20,
+    }
+    for paper_id, text in texts.items():
+        md_path = storage_path / f"{paper_id}.md"
+        md_path.write_text(text, encoding="utf-8")
+        get_catalog().add(paper_id, md_path, None)
+
+    result = await handle_similar_papers({"paper_id": "2101.00001"})
+
+    content = json.loads(result[0].text)
+    assert [p["id"] for p in content["papers"]] == ["2101.00002v1"]